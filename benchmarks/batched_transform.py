@@ -0,0 +1,40 @@
+#!/usr/bin/python3
+#
+# Benchmark transforming the points of many small paths by their own CTMs,
+# one matrix at a time and all at once
+#
+# Run from the directory containing this library, e.g.:
+#  $ python3 -m svg.benchmarks.batched_transform
+#
+
+import time
+import numpy as np
+
+from ..math.transform import SVGMatrix, applyMatricesToPoints
+
+
+def benchmarkBatchedTransform(numPaths=[1000, 10000, 100000], pointsPerPath=8, seed=0):
+    rng = np.random.default_rng(seed)
+    print("{:>10s} {:>10s} {:>12s} {:>12s} {:>10s}".format("paths", "points", "loop [s]", "batched [s]", "speedup"))
+    for n in numPaths:
+        matrices = rng.normal(size=(n, 6))
+        counts = rng.integers(1, 2 * pointsPerPath, size=n)
+        offsets = np.zeros(n + 1, dtype=np.intp)
+        np.cumsum(counts, out=offsets[1:])
+        points = rng.normal(size=(offsets[-1], 2))
+
+        t = time.perf_counter()
+        svgMatrices = [SVGMatrix(*m) for m in matrices.tolist()]
+        loop = np.vstack([m.applyToPoints(points[offsets[k]:offsets[k+1]]) for (k, m) in enumerate(svgMatrices)])
+        tLoop = time.perf_counter() - t
+
+        t = time.perf_counter()
+        batched = applyMatricesToPoints(matrices, points, offsets)
+        tBatched = time.perf_counter() - t
+
+        assert(np.allclose(loop, batched))
+        print("{:10d} {:10d} {:12.3f} {:12.3f} {:10.1f}".format(n, len(points), tLoop, tBatched, tLoop / tBatched))
+
+
+if __name__ == "__main__":
+    benchmarkBatchedTransform()
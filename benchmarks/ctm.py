@@ -0,0 +1,96 @@
+#!/usr/bin/python3
+#
+# Benchmark calculating the current transformation matrices (CTM)
+# of all elements of a large document with nested transformed groups,
+# compared to composing 3x3 NumPy matrices as SVGMatrix did before
+#
+# Run from the directory containing this library, e.g.:
+#  $ python3 -m svg.benchmarks.ctm
+#
+
+import gc
+import time
+import numpy as np
+
+from ..io.svgreader import SVGReader
+from .synthetic import generateDocument
+
+
+#
+# SVGMatrix as it was before, wrapping a 3x3 NumPy matrix
+#
+class LegacySVGMatrix:
+    def __init__(self, a=1, b=0, c=0, d=1, e=0, f=0, npMatrix=None, debug=False):
+        self.debug = debug
+        if npMatrix is None:
+            self.matrix = np.array([[a, c, e], [b, d, f], [0, 0, 1]])
+        else:
+            self.matrix = npMatrix
+
+    def getMatrix(self):
+        return self.matrix
+
+    def applyToMatrix(self, matrix, debug=False):
+        if type(matrix) is LegacySVGMatrix:
+            matrix = matrix.getMatrix()
+        matrixTransformed = np.matmul(matrix, self.matrix)
+        return LegacySVGMatrix(npMatrix=matrixTransformed, debug=self.debug)
+
+
+#
+# Compose the CTMs of all elements in document order,
+# each from its parent's CTM like SVGElement.calculateCTM()
+#
+def calculateCTMs(elements, matrices):
+    ctms = {}
+    for e in elements:
+        m = matrices[id(e)]
+        parent = e.parentElement
+        if id(parent) in ctms:
+            m = m.applyToMatrix(ctms[id(parent)])
+        ctms[id(e)] = m
+    return ctms
+
+
+def benchmarkCTM(sizes=[10000, 100000]):
+    print("{:>10s} {:>12s} {:>12s} {:>10s} {:>14s} {:>10s}".format("elements", "NumPy [s]", "slots [s]", "speedup", "getCTM() [s]", "pass [s]"))
+    for n in sizes:
+        svg = SVGReader(fromString=generateDocument(n))
+        elements = svg.getElementList()
+        # Parse all transformations beforehand
+        matrices = dict([(id(e), e.getSVGMatrix()) for e in elements])
+        legacyMatrices = dict([(k, LegacySVGMatrix(*m.getComponents())) for (k, m) in matrices.items()])
+
+        # Like timeit, measure without garbage collection
+        gc.collect()
+        gc.disable()
+        t = time.perf_counter()
+        legacy = calculateCTMs(elements, legacyMatrices)
+        tLegacy = time.perf_counter() - t
+
+        t = time.perf_counter()
+        calculateCTMs(elements, matrices)
+        tSlots = time.perf_counter() - t
+
+        # Including the overhead of the elements' methods
+        for e in elements:
+            e.ctm = None
+        t = time.perf_counter()
+        ctms = [e.getCTM() for e in elements]
+        tElements = time.perf_counter() - t
+
+        # A single pass over the document, see SVGElement.calculateCTMs()
+        t = time.perf_counter()
+        (passElements, rows) = svg.calculateCTMs()
+        tPass = time.perf_counter() - t
+        gc.enable()
+        assert(np.allclose(rows[1:], [ctm.getComponents() for ctm in ctms]))
+
+        for (e, ctm) in zip(elements[::97], ctms[::97]):
+            assert(np.allclose(ctm.getMatrix(), legacy[id(e)].getMatrix()))
+
+        print("{:10d} {:12.3f} {:12.3f} {:10.1f} {:14.3f} {:10.3f}".format(len(elements), tLegacy, tSlots, tLegacy / tSlots, tElements, tPass))
+
+
+if __name__ == "__main__":
+    benchmarkCTM()
@@ -0,0 +1,31 @@
+#!/usr/bin/python3
+#
+# Benchmark flattening the transformations of documents of increasing size,
+# which shall take time linear in the number of elements and coordinates
+#
+# Run from the directory containing this library, e.g.:
+#  $ python3 -m svg.benchmarks.flatten
+#
+
+import time
+
+from ..io.svgreader import SVGReader
+from .synthetic import generateDocument
+
+
+def benchmarkFlatten(sizes=[10000, 30000, 100000]):
+    print("{:>10s} {:>12s} {:>12s} {:>16s}".format("elements", "points", "flatten [s]", "per point [us]"))
+    for n in sizes:
+        svg = SVGReader(fromString=generateDocument(n))
+        paths = svg.find("path")
+        numPoints = sum([len(path.getPoints()) for path in paths]) + 4 * len(svg.find("rect"))
+
+        t = time.perf_counter()
+        svg.flattenTransforms()
+        tFlatten = time.perf_counter() - t
+
+        print("{:10d} {:12d} {:12.3f} {:16.3f}".format(n, numPoints, tFlatten, tFlatten / numPoints * 1e6))
+
+
+if __name__ == "__main__":
+    benchmarkFlatten()
@@ -0,0 +1,107 @@
+#!/usr/bin/python3
+#
+# Benchmark the memory used by the elements of a large document
+# with slotted elements, compared to elements with a __dict__ as before
+#
+# Run from the directory containing this library, e.g.:
+#  $ python3 -m svg.benchmarks.memory
+#
+
+import gc
+import time
+import tracemalloc
+import xml.sax
+
+from ..io.svgreader import SVGReader
+from ..dom.rect import SVGRect
+from .synthetic import generateDocument
+
+
+#
+# Elements as they were before, storing their attributes in a __dict__
+# with a dictionary of attributes and a list of children of their own
+#
+class LegacyElement:
+    def __init__(self, root=None, parent=None, tag="xml", attributes={}, debug=False):
+        self.debug = debug
+        self.documentRoot = root
+        self.parentElement = parent
+        self.tag = tag
+        self.attributes = dict(attributes)
+        self.children = []
+        self.parsedTransform = None
+        self.ctm = None
+        self.ctmOwner = None
+        self.ctmIndex = None
+
+
+class LegacyRect(LegacyElement):
+    def __init__(self, root=None, parent=None, tag="rect", attributes={}, debug=False):
+        LegacyElement.__init__(self, root, parent, tag, attributes, debug)
+        SVGRect.parseGeometry(self)
+        self.bottomLeftRelative = (self.x, self.y)
+        self.topRightRelative = (self.x + self.width, self.y + self.height)
+        (self.minX, self.minY) = self.bottomLeftRelative
+        (self.maxX, self.maxY) = self.topRightRelative
+
+
+#
+# Builds a tree of legacy elements like SVGReader did
+#
+class LegacyReader(xml.sax.ContentHandler):
+    def __init__(self):
+        self.root = LegacyElement(tag="root")
+        self.currentParents = [self.root]
+
+    def startElement(self, tag, attributes):
+        parent = self.currentParents[-1]
+        tag = tag.lower()
+        e = (LegacyRect if tag == "rect" else LegacyElement)(self.root, parent, tag, attributes)
+        parent.children.append(e)
+        if tag in SVGReader.tagsWithChildren:
+            self.currentParents.append(e)
+
+    def endElement(self, tag):
+        if tag.lower() in SVGReader.tagsWithChildren:
+            self.currentParents.pop()
+
+
+#
+# Return the document built by the given function,
+# the memory it occupies in bytes and the time it took
+#
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    t = time.perf_counter()
+    document = build()
+    t = time.perf_counter() - t
+    gc.collect()
+    (size, peak) = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (document, size, t)
+
+
+def benchmarkMemory(sizes=[100000, 1000000]):
+    print("{:>10s} {:>16s} {:>16s} {:>10s} {:>12s} {:>12s}".format(
+        "elements", "before [B/elem]", "slots [B/elem]", "ratio", "before [s]", "slots [s]"))
+    for n in sizes:
+        s = generateDocument(n)
+
+        def buildLegacy():
+            reader = LegacyReader()
+            xml.sax.parseString(s.encode(), reader)
+            return reader.root
+        (document, sizeLegacy, tLegacy) = measure(buildLegacy)
+        del document
+
+        (document, size, t) = measure(lambda: SVGReader(fromString=s))
+        numElements = len(document.getElementList())
+        del document
+
+        print("{:10d} {:16.1f} {:16.1f} {:10.2f} {:12.3f} {:12.3f}".format(numElements,
+            sizeLegacy / numElements, size / numElements, sizeLegacy / size, tLegacy, t))
+
+
+if __name__ == "__main__":
+    benchmarkMemory()
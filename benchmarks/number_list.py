@@ -0,0 +1,61 @@
+#!/usr/bin/python3
+#
+# Benchmark lexing long lists of numbers, e.g. the points of polygons,
+# with the shared lexer and the regular expression previously used for transformations
+#
+# Run from the directory containing this library, e.g.:
+#  $ python3 -m svg.benchmarks.number_list
+#
+
+import re
+import time
+import numpy as np
+
+from ..math.number import parseNumbers
+
+
+# The alternation previously used by math/transform.py
+rLegacyFloat = re.compile("("
+    + "[+-]*[0-9]+[.][0-9]+[eE]{1}[+-]*[0-9]+[.][0-9]+|"
+    + "[+-]*[0-9]+[.][0-9]+[eE]{1}[+-]*[0-9]+|"
+    + "[+-]*[0-9]+[eE]{1}[+-]*[0-9]+|"
+    + "[+-]*[0-9]+[.][0-9]+|"
+    + "[+-]*[0-9]+)")
+
+
+def parseLegacy(s):
+    return np.array([float(x) for x in rLegacyFloat.findall(s)])
+
+
+#
+# Generate a points attribute, either with separators or packed as far as possible
+#
+def generatePoints(numNumbers, packed=False, seed=0):
+    values = np.random.default_rng(seed).uniform(-1000.0, 1000.0, numNumbers).round(3)
+    if packed:
+        return "".join(["{:+g}".format(x) for x in values])
+    return " ".join(["{:g},{:g}".format(x, y) for (x, y) in values.reshape((-1, 2))])
+
+
+def benchmarkNumberList(sizes=[10000, 100000, 1000000]):
+    print("{:>10s} {:>8s} {:>10s} {:>14s} {:>14s}".format("numbers", "packed", "MB", "legacy [MB/s]", "lexer [MB/s]"))
+    for n in sizes:
+        for packed in [False, True]:
+            s = generatePoints(n, packed)
+
+            t = time.perf_counter()
+            legacy = parseLegacy(s)
+            tLegacy = time.perf_counter() - t
+
+            t = time.perf_counter()
+            numbers = parseNumbers(s)
+            tLexer = time.perf_counter() - t
+            assert(len(numbers) == n)
+            assert(np.array_equal(legacy, numbers))
+
+            print("{:10d} {:>8s} {:10.2f} {:14.2f} {:14.2f}".format(n, str(packed), len(s) / 1e6,
+                len(s) / tLegacy / 1e6, len(s) / tLexer / 1e6))
+
+
+if __name__ == "__main__":
+    benchmarkNumberList()
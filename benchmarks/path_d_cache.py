@@ -0,0 +1,50 @@
+#!/usr/bin/python3
+#
+# Benchmark parsing many paths with repeated definitions,
+# with and without the cache of parsed path definitions
+#
+# Run from the directory containing this library, e.g.:
+#  $ python3 -m svg.benchmarks.path_d_cache
+#
+
+import time
+
+from ..dom.path_d import SVGPathDefinition
+from ..dom.path_d_cache import SVGPathDefinitionCache
+from .synthetic import generatePathDefinition
+
+
+#
+# Return the number of bytes occupied by the distinct arrays of the given definitions
+#
+def memoryUsage(definitions):
+    arrays = {}
+    for d in definitions:
+        for a in [d.opcodes, d.offsets, d.args, d.vertices]:
+            arrays[id(a)] = a.nbytes
+    return sum(arrays.values())
+
+
+def benchmarkCache(numPaths=20000, numDistinct=[10, 100, 1000], commandsPerPath=20):
+    print("{:>10s} {:>10s} {:>12s} {:>12s} {:>12s} {:>12s}".format(
+        "paths", "distinct", "parse [s]", "cached [s]", "parse [MB]", "cached [MB]"))
+    for k in numDistinct:
+        strings = [generatePathDefinition(commandsPerPath, seed=i) for i in range(k)]
+        document = [strings[i % k] for i in range(numPaths)]
+
+        t = time.perf_counter()
+        parsed = [SVGPathDefinition(d=d) for d in document]
+        tParse = time.perf_counter() - t
+
+        cache = SVGPathDefinitionCache()
+        t = time.perf_counter()
+        cached = [cache.get(d) for d in document]
+        tCached = time.perf_counter() - t
+        assert(cache.getStatistics()["misses"] == k)
+
+        print("{:10d} {:10d} {:12.3f} {:12.3f} {:12.2f} {:12.2f}".format(numPaths, k, tParse, tCached,
+            memoryUsage(parsed) / 1e6, memoryUsage(cached) / 1e6))
+
+
+if __name__ == "__main__":
+    benchmarkCache()
@@ -0,0 +1,48 @@
+#!/usr/bin/python3
+#
+# Benchmark the throughput of parsing large path definitions
+#
+# Run from the directory containing this library, e.g.:
+#  $ python3 -m svg.benchmarks.path_d_parse
+#
+
+import time
+
+from ..dom.path_d import SVGPathDefinition, scanPathCommand
+from .synthetic import generatePathDefinition
+
+
+#
+# Only tokenize the string
+#
+def scan(d):
+    n = 0
+    c = None
+    offset = 0
+    while True:
+        scanned = scanPathCommand(d, offset, c)
+        if scanned is None:
+            return n
+        (c, args, offset) = scanned
+        n += 1
+
+
+def benchmarkParsing(sizes=[1000, 10000, 100000]):
+    print("{:>10s} {:>10s} {:>14s} {:>14s}".format("commands", "bytes", "scan [MB/s]", "parse [MB/s]"))
+    for n in sizes:
+        d = generatePathDefinition(n)
+
+        t = time.perf_counter()
+        assert(scan(d) == n)
+        tScan = time.perf_counter() - t
+
+        t = time.perf_counter()
+        p = SVGPathDefinition(d=d)
+        tParse = time.perf_counter() - t
+        assert(len(p) == n)
+
+        print("{:10d} {:10d} {:14.2f} {:14.2f}".format(n, len(d), len(d) / tScan / 1e6, len(d) / tParse / 1e6))
+
+
+if __name__ == "__main__":
+    benchmarkParsing()
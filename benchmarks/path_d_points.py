@@ -0,0 +1,72 @@
+#!/usr/bin/python3
+#
+# Benchmark the calculation of a path definition's points
+#
+# Run from the directory containing this library, e.g.:
+#  $ python3 -m svg.benchmarks.path_d_points
+#
+
+import time
+import numpy as np
+
+from ..dom import path_d
+from ..dom.path_d import SVGPathDefinition, calculateEndpoints
+from .synthetic import generatePathDefinition
+
+
+#
+# The former implementation, growing the array command by command
+#
+def updatePointsAppending(d):
+    cursor = np.array([0.0, 0.0])
+    points = np.array([cursor])
+    for cmd in d.getCommands():
+        cursor = cmd.getEndpoint()
+        points = np.append(points, [cursor], axis=0)
+    return points
+
+
+def measure(f, *args):
+    t = time.perf_counter()
+    f(*args)
+    return time.perf_counter() - t
+
+
+def benchmarkPoints(sizes=[10000, 100000, 1000000], appendingUpTo=10000):
+    print("{:>10s} {:>14s} {:>14s} {:>14s} {:>14s}".format("commands", "appending [s]", "full [s]", "suffix [s]", "append [s]"))
+    for n in sizes:
+        d = SVGPathDefinition(d=generatePathDefinition(n), compact=True)
+        tAppending = measure(updatePointsAppending, d) if n <= appendingUpTo else float("nan")
+        tFull = measure(d.updatePoints)
+        tSuffix = measure(d.setCommand, n-10, ["l", 1.0, 2.0])
+        tAppend = measure(d.appendCommands, "l 1 2 3 4 5 6 z")
+        print("{:10d} {:14.4f} {:14.4f} {:14.4f} {:14.4f}".format(n, tAppending, tFull, tSuffix, tAppend))
+
+
+#
+# Typical documents consist of many short paths,
+# whose endpoints are calculated command by command below a threshold
+#
+def benchmarkShortPaths(sizes=[4, 16, 64, 256], numPaths=1000):
+    print("{:>10s} {:>16s} {:>16s} {:>16s} {:>16s}".format("commands", "parse [us/path]", "update [us/path]",
+        "scalar [us/path]", "vector [us/path]"))
+    threshold = path_d.svgPathDScalarEndpointsBelow
+    for n in sizes:
+        strings = [generatePathDefinition(n, seed=i) for i in range(numPaths)]
+        tParse = measure(lambda: [SVGPathDefinition(d=s) for s in strings])
+        definitions = [SVGPathDefinition(d=s) for s in strings]
+        tUpdate = measure(lambda: [d.updatePoints() for d in definitions])
+        try:
+            path_d.svgPathDScalarEndpointsBelow = n + 1
+            tScalar = measure(lambda: [calculateEndpoints(d.opcodes, d.offsets, d.args) for d in definitions])
+            path_d.svgPathDScalarEndpointsBelow = 0
+            tVector = measure(lambda: [calculateEndpoints(d.opcodes, d.offsets, d.args) for d in definitions])
+        finally:
+            path_d.svgPathDScalarEndpointsBelow = threshold
+        print("{:10d} {:16.1f} {:16.1f} {:16.1f} {:16.1f}".format(n, tParse / numPaths * 1e6,
+            tUpdate / numPaths * 1e6, tScalar / numPaths * 1e6, tVector / numPaths * 1e6))
+
+
+if __name__ == "__main__":
+    benchmarkShortPaths()
+    benchmarkPoints()
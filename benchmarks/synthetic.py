@@ -0,0 +1,73 @@
+#!/usr/bin/python3
+#
+# Generators for synthetic SVG content used by the benchmarks
+#
+
+import numpy as np
+
+
+#
+# Generate a path definition string with the given number of commands
+# resembling CAD exports: closed polygons with occasional curves and arcs,
+# using absolute and relative, explicit and implicit commands
+#
+def generatePathDefinition(numCommands, commandsPerSubpath=50, seed=0):
+    rng = np.random.default_rng(seed)
+    values = rng.uniform(-100.0, 100.0, size=(numCommands, 6)).round(3)
+    kinds = rng.integers(0, 10, size=numCommands)
+    commands = []
+    for i in range(numCommands):
+        v = values[i]
+        if i % commandsPerSubpath == 0:
+            commands.append("M {:g},{:g}".format(v[0], v[1]))
+        elif i % commandsPerSubpath == commandsPerSubpath-1:
+            commands.append("z")
+        elif kinds[i] < 4:
+            commands.append("L {:g},{:g}".format(v[0], v[1]))
+        elif kinds[i] < 6:
+            # Implicit repetition requires a preceding moveto or lineto
+            implicit = commands[-1][0] in "ML"
+            commands.append(("{:g} {:g}" if implicit else "l{:g} {:g}").format(v[0], v[1]))
+        elif kinds[i] == 6:
+            commands.append("h{:g}".format(v[0]))
+        elif kinds[i] == 7:
+            commands.append("c{:g},{:g} {:g},{:g} {:g},{:g}".format(*v))
+        elif kinds[i] == 8:
+            commands.append("Q{:g} {:g} {:g} {:g}".format(*v[:4]))
+        else:
+            commands.append("a{:g} {:g} 0 0 1 {:g} {:g}".format(abs(v[0]), abs(v[1]), v[2], v[3]))
+    return " ".join(commands)
+
+
+#
+# Generate an SVG document with the given number of elements:
+# groups nested up to the given depth, each transformed by translations,
+# rotations and matrices, containing small paths and rectangles
+#
+def generateDocument(numElements, depth=20, seed=0):
+    rng = np.random.default_rng(seed)
+    values = rng.uniform(-10.0, 10.0, size=(numElements, 6)).round(3)
+    kinds = rng.integers(0, 4, size=numElements)
+    transforms = [
+        "translate({:g}, {:g})",
+        "rotate({:g})",
+        "matrix({:g} {:g} {:g} {:g} {:g} {:g})",
+        "translate({:g} {:g}) scale({:g}) skewX({:g})"
+        ]
+    s = ["<svg>"]
+    level = 0
+    for i in range(numElements):
+        v = values[i]
+        if (level > 0) and ((level >= depth) or (v[5] < -5.0)):
+            s.append("</g>")
+            level -= 1
+        if v[4] < 0.0:
+            s.append("<g transform=\"{:s}\">".format(transforms[kinds[i]].format(*v)))
+            level += 1
+        elif v[4] < 5.0:
+            s.append("<path d=\"M {:g} {:g} l 1 0 0 1 z\"/>".format(v[0], v[1]))
+        else:
+            s.append("<rect x=\"{:g}\" y=\"{:g}\" width=\"1\" height=\"1\" transform=\"rotate({:g})\"/>".format(*v[:3]))
+    s += ["</g>"] * level
+    s.append("</svg>")
+    return "".join(s)
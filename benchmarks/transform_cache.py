@@ -0,0 +1,45 @@
+#!/usr/bin/python3
+#
+# Benchmark parsing the transformations of many elements with repeated transform attributes,
+# with and without the cache of parsed transformation lists
+#
+# With more distinct strings than entries the cache thrashes,
+# so that most misses bypass it (see SVGTransformListCache).
+#
+# Run from the directory containing this library, e.g.:
+#  $ python3 -m svg.benchmarks.transform_cache
+#
+
+import time
+
+from ..math.transform import SVGTransformList
+from ..math.transform_cache import SVGTransformListCache
+
+
+def benchmarkCache(numElements=100000, numDistinct=[10, 1000, 10000, 100000], maxEntries=4096, repeat=3):
+    print("{:>10s} {:>10s} {:>12s} {:>12s} {:>10s} {:>10s} {:>10s}".format(
+        "elements", "distinct", "parse [s]", "cached [s]", "hits", "evictions", "bypasses"))
+    for k in numDistinct:
+        strings = ["translate({:d}, {:d}) rotate({:d})".format(i, -i, i % 360) for i in range(k)]
+        document = [strings[i % k] for i in range(numElements)]
+
+        # The best of several runs, each with an empty cache
+        (tParse, tCached) = (float("inf"), float("inf"))
+        for r in range(repeat):
+            t = time.perf_counter()
+            for s in document:
+                SVGTransformList(parseFromString=s).getSVGMatrix()
+            tParse = min(tParse, time.perf_counter() - t)
+
+            cache = SVGTransformListCache(maxEntries=maxEntries)
+            t = time.perf_counter()
+            for s in document:
+                cache.get(s).getSVGMatrix()
+            tCached = min(tCached, time.perf_counter() - t)
+        statistics = cache.getStatistics()
+
+        print("{:10d} {:10d} {:12.3f} {:12.3f} {:10d} {:10d} {:10d}".format(numElements, k, tParse, tCached,
+            statistics["hits"], statistics["evictions"], statistics["bypasses"]))
+
+if __name__ == "__main__":
+    benchmarkCache()
@@ -1,6 +1,10 @@
 #!/usr/bin/python3
 
-from ..math.transform import SVGTransformList, SVGMatrix
+import numpy as np
+
+from ..math.transform import SVGTransformList, SVGMatrix, svgMatrixIdentity
+from ..math.transform_cache import svgTransformListCache
+from ..math.number import parseNumbers
 from .xmlelement import XMLElement
 
 
@@ -18,10 +22,12 @@ from .xmlelement import XMLElement
 #  - getMinY()
 #  - getMaxY()
 #
-# The class SVGBoundingBox can be used as parent class
+# The class SVGBoundingBoxMixin can be used as parent class
 # to fulfill that.
 #
 class SVGElement(XMLElement):
+    __slots__ = ("parsedTransform", "ctm", "ctmOwner", "ctmIndex", "ctms")
+
     #
     # An element is initialized by setting the XML tag name and attributes.
     # Additionally the containing SVG is referenced.
@@ -34,16 +40,46 @@ class SVGElement(XMLElement):
         # Current transformation matrix for this element and it's children
         # (this matrix already includes the transformations of parent elements)
         self.ctm = None
+        # The row of this element's CTM in the table of the element calculateCTMs() was called on
+        self.ctmOwner = None
+        self.ctmIndex = None
+        # The CTMs of this element and its descendants, see calculateCTMs()
+        self.ctms = None
+
+    #
+    # Return the numbers of an attribute, e.g. points="0,0 1,1",
+    # as NumPy array of floats, or None if the attribute is not set
+    #
+    def getNumbers(self, key):
+        value = self.getAttribute(key)
+        if value is None:
+            return None
+        return parseNumbers(str(value))
+
+    #
+    # Return the viewBox attribute as array of min x, min y, width and height,
+    # or None if the attribute is not set
+    #
+    def getViewBox(self):
+        viewBox = self.getNumbers("viewBox")
+        if viewBox is None:
+            return None
+        if len(viewBox) != 4:
+            raise SyntaxError("Expected four numbers in viewBox, got: \"{:s}\"".format(self.getAttribute("viewBox")))
+        return viewBox
 
     #
     # Parse the coordinates transformation attribute
     #
+    # Identical strings are only parsed once, see SVGTransformListCache;
+    # the resulting list is read-only.
+    #
     def parseTransform(self):
         if ((not (self.attributes is None)) and ("transform" in self.attributes.keys())):
-            self.parsedTransform = SVGTransformList(parseFromString=self.attributes["transform"], debug=self.debug)
+            self.parsedTransform = svgTransformListCache.get(self.attributes["transform"], debug=self.debug)
             return
         # Error; use empty transformation list
-        self.parsedTransform = SVGTransformList()
+        self.parsedTransform = svgTransformListCache.get("", debug=self.debug)
 
     #
     # Return the transformation list of the current element
@@ -69,18 +105,65 @@ class SVGElement(XMLElement):
     def getSVGMatrix(self):
         return self.getTransform().getSVGMatrix()
 
+    #
+    # Update an attribute; changing the transformation
+    # invalidates the CTMs of this element and its descendants
+    #
+    def setAttribute(self, key, value):
+        XMLElement.setAttribute(self, key, value)
+        if key == "transform":
+            self.invalidateTransform()
+
+    def deleteAttribute(self, key):
+        XMLElement.deleteAttribute(self, key)
+        if key == "transform":
+            self.invalidateTransform()
+
+    #
+    # Discard the parsed transformation of this element
+    # and the CTMs of this element and all of its descendants
+    #
+    # CTMs are only cached below elements with a cached CTM (see calculateCTM() and calculateCTMs()),
+    # so that the descendants of an element without one are skipped.
+    #
+    def invalidateTransform(self):
+        self.parsedTransform = None
+        stack = [self]
+        while len(stack) > 0:
+            e = stack.pop()
+            if (e.ctm is None) and (e.ctmOwner is None):
+                continue
+            e.ctm = None
+            e.ctmOwner = None
+            e.ctmIndex = None
+            stack.extend(e.children)
+
     #
     # Return the current transformation matrix (CTM)
     # of the current element including transformations of parent elements
     # as SVGMatrix
     #
+    # Walks up to the closest ancestor with a known CTM without recursion
+    # and multiplies the transformations on the way back down.
+    #
     def calculateCTM(self):
-        m = self.getSVGMatrix()
-        if self.parentElement is None:
-            self.ctm = m
-            return
-        parentCTM = self.parentElement.getCTM()
-        self.ctm = m.applyToMatrix(parentCTM)
+        path = []
+        e = self
+        ctm = None
+        while not (e is None):
+            if not (e.ctm is None):
+                ctm = e.ctm
+                break
+            if not (e.ctmOwner is None):
+                ctm = SVGMatrix(*e.ctmOwner.ctms[e.ctmIndex].tolist(), debug=e.debug)
+                e.ctm = ctm
+                break
+            path.append(e)
+            e = e.parentElement
+        for e in reversed(path):
+            m = e.getSVGMatrix()
+            ctm = m if (ctm is None) else ctm.multiply(m)
+            e.ctm = ctm
 
     #
     # Return the current transformation matrix
@@ -93,3 +176,41 @@ class SVGElement(XMLElement):
             print("<{:s}>: ctm =".format(self.getTag()))
             print(str(self.ctm))
         return self.ctm
+
+    #
+    # Calculate the CTMs of this element and all of its descendants in a single pass
+    #
+    # The elements are visited in depth-first order using an explicit stack,
+    # multiplying every element's transformation with its parent's CTM once.
+    # Returns the list of elements (beginning with this element)
+    # and their CTMs as array of shape (n, 6) with the components a-f of the matrices.
+    # The array is kept, so that getCTM() of the elements looks up their row
+    # until their transformation changes.
+    #
+    def calculateCTMs(self):
+        elements = []
+        rows = []
+        if self.parentElement is None:
+            stack = [(self, (1.0, 0.0, 0.0, 1.0, 0.0, 0.0))]
+        else:
+            stack = [(self, self.parentElement.getCTM().getComponents())]
+        while len(stack) > 0:
+            (e, parentCTM) = stack.pop()
+            m = e.getSVGMatrix()
+            if m.kind == svgMatrixIdentity:
+                # Most elements are not transformed themselves
+                ctm = parentCTM
+            else:
+                (a, b, c, d, e0, f0) = parentCTM
+                (a1, b1, c1, d1, e1, f1) = m.getComponents()
+                ctm = (a * a1 + c * b1, b * a1 + d * b1, a * c1 + c * d1, b * c1 + d * d1,
+                    a * e1 + c * f1 + e0, b * e1 + d * f1 + f0)
+            e.ctmOwner = self
+            e.ctmIndex = len(elements)
+            elements.append(e)
+            rows.append(ctm)
+            # Push the children in reverse to visit them in document order
+            for child in reversed(e.children):
+                stack.append((child, ctm))
+        self.ctms = np.array(rows, dtype=np.float64).reshape((-1, 6))
+        return (elements, self.ctms)
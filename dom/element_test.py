@@ -1,6 +1,9 @@
 #!/usr/bin/python3
 
+import numpy as np
+
 from .element import SVGElement
+from ..io.svgreader import SVGReader
 
 
 def testParsing():
@@ -45,6 +48,76 @@ def testTransformation():
     assert(not (False in (result == [-1.0, 0.0])))
 
 
+def testCTMs():
+    svg = SVGReader(fromString="<svg><g transform=\"translate(10, 20)\"><g transform=\"rotate(90)\"><path d=\"M 0 0\"/>"
+        + "<rect transform=\"scale(2)\"/></g><rect/></g><rect transform=\"skewX(45)\"/></svg>")
+    (elements, ctms) = svg.calculateCTMs()
+    assert(elements[0] is svg)
+    assert([e.getTag() for e in elements[1:]] == ["svg", "g", "g", "path", "rect", "rect", "rect"])
+    assert(ctms.shape == (8, 6))
+    assert(np.allclose(ctms[5], [0, 2, -2, 0, 10, 20]))
+    for (e, row) in zip(elements, ctms):
+        assert(np.allclose(e.getCTM().getComponents(), row))
+        e.ctm = None
+        e.ctmOwner = None
+        assert(np.allclose(e.getCTM().getComponents(), row))
+
+    # Changing a transformation invalidates the subtree only
+    (elements, ctms) = svg.calculateCTMs()
+    elements[3].setAttribute("transform", "translate(1, 1)")
+    assert([e.ctmOwner is None for e in elements] == [False, False, False, True, True, True, False, False])
+    assert(np.allclose(elements[4].getCTM().getComponents(), [1, 0, 0, 1, 11, 21]))
+    assert(np.allclose(elements[5].getCTM().getComponents(), [2, 0, 0, 2, 11, 21]))
+    elements[2].deleteAttribute("transform")
+    assert(np.allclose(elements[5].getCTM().getComponents(), [2, 0, 0, 2, 1, 1]))
+    assert(np.allclose(svg.calculateCTMs()[1][:, 4], [0, 0, 0, 1, 1, 1, 0, 0]))
+
+    # Invalidating within an invalidated subtree skips its descendants, which have no CTM either
+    elements[2].setAttribute("transform", "translate(5, 5)")
+    assert(all([(e.ctm is None) and (e.ctmOwner is None) for e in elements[2:6]]))
+    elements[3].deleteAttribute("transform")
+    assert(np.allclose(elements[5].getCTM().getComponents(), [2, 0, 0, 2, 5, 5]))
+    assert(np.allclose(elements[6].getCTM().getComponents(), [1, 0, 0, 1, 5, 5]))
+
+
+def testDeepCTM():
+    # Neither calculating one CTM nor all of them recurses
+    root = SVGElement(tag="g")
+    e = root
+    for i in range(5000):
+        child = SVGElement(parent=e, tag="g", attributes={"transform": "translate(1, 2)"})
+        e.addChild(child)
+        e = child
+    assert(np.allclose(e.getCTM().getComponents(), [1, 0, 0, 1, 5000, 10000]))
+    (elements, ctms) = root.calculateCTMs()
+    assert(len(elements) == 5001)
+    assert(np.allclose(ctms[-1], [1, 0, 0, 1, 5000, 10000]))
+
+
+def testCompactElements():
+    svg = SVGReader(fromString="<svg><g><path d=\"M 0 0\"/><rect width=\"1\"/></g><g/></svg>")
+    (root, group, path, rect, empty) = svg.getElementList()
+    for e in [root, group, path, rect, empty]:
+        assert(not hasattr(e, "__dict__"))
+    # Tags are interned
+    assert(SVGElement(tag="".join(["pa", "th"])).getTag() is path.getTag())
+
+    # Elements share the empty attributes and children until they are written
+    assert(group.getAttributes() is empty.getAttributes())
+    assert(path.getChildren() is empty.getChildren())
+    empty.setAttribute("id", "empty")
+    empty.addChild(SVGElement(svg=svg, parent=empty, tag="g"))
+    assert(str(empty) == "<g id=\"empty\"><g/></g>")
+    assert(len(group.getAttributes()) == 0)
+    assert(len(path.getChildren()) == 0)
+    try:
+        group.deleteAttribute("id")
+        assert(False)
+    except KeyError:
+        pass
+    assert([e.getTag() for e in svg] == ["svg", "g", "path", "rect", "g", "g"])
+
+
 if __name__ == "__main__":
     testDeserialize()
     testSerialize()
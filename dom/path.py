@@ -9,29 +9,42 @@ import numpy as np
 
 from .element import SVGElement
 from .path_d import SVGPathDefinition
-from ..selecting.bbox import SVGBoundingBox
+from .path_d_cache import svgPathDefinitionCache
+from ..selecting.bbox import SVGBoundingBoxMixin
 
 
 #
 # Objects of this class are created
 # for every <path/> element encountered in an SVG
 #
-class SVGPath(SVGElement, SVGBoundingBox):
+#
+# The path definition is kept as string until it is accessed,
+# so that documents can be loaded without parsing all paths.
+# Identical strings are only parsed once, see SVGPathDefinitionCache.
+#
+class SVGPath(SVGElement, SVGBoundingBoxMixin):
+    __slots__ = ()
+
     def __init__(self, svg=None, parent=None, attributes={}, debug=False):
         SVGElement.__init__(self, svg=svg, parent=parent, tag="path", attributes=attributes, debug=debug)
-        if "d" in self.attributes.keys():
-            d = self.attributes["d"]
-            self.attributes["d"] = SVGPathDefinition(path=self, d=d, debug=self.debug)
 
-    # Return this object's path definition object
+    # Return this object's path definition object, parse it if necessary
     def getD(self):
         if "d" in self.attributes.keys():
-            return self.attributes["d"]
+            d = self.attributes["d"]
+            if type(d) is str:
+                d = svgPathDefinitionCache.get(d, path=self, debug=self.debug)
+                self.attributes["d"] = d
+            return d
         return None
 
     # Update path definition string
     def setD(self, s):
-        self.attributes["d"] = SVGPathDefinition(path=self, d=s, debug=self.debug)
+        self.setAttribute("d", s)
+
+    # Return true, if the path definition has been parsed
+    def isParsed(self):
+        return type(self.attributes.get("d")) is SVGPathDefinition
 
     # Return the number of points this path is comprised of
     def __len__(self):
@@ -74,46 +87,128 @@ class SVGPath(SVGElement, SVGBoundingBox):
         return points.T[1, :]
 
     #
-    # Overload some getters of SVGBoundingBox
+    # Return the exact bounding box of the path definition
+    # as array of min x, min y, max x and max y
+    #
+    def getBounds(self):
+        d = self.getD()
+        if d is None:
+            raise ValueError("Path without definition has no bounding box")
+        return d.getBounds()
+
+    #
+    # Return the bounding box in document coordinates, i.e. transformed by the CTM
+    #
+    # Boxes under axis-aligned CTMs are transformed as a whole,
+    # otherwise the bounding box of the transformed path is calculated.
+    #
+    def getDocumentBounds(self):
+        bounds = self.getBounds()
+        ctm = self.getCTM()
+        if ctm.isAxisAligned():
+            return ctm.applyToBounds(bounds)
+        return self.getD().transform(ctm, inplace=False).getBounds()
+
+    #
+    # Overload some getters of SVGBoundingBoxMixin
     #
     def getMinX(self):
-        return self.getPointsX().min()
+        return self.getBounds()[0]
 
     def getMinY(self):
-        return self.getPointsY().min()
+        return self.getBounds()[1]
 
     def getMaxX(self):
-        return self.getPointsX().max()
+        return self.getBounds()[2]
 
     def getMaxY(self):
-        return self.getPointsY().max()
+        return self.getBounds()[3]
+
+    #
+    # Return whether the area filled by the path contains each of the given points,
+    # e.g. an array of shape (n, 2), see SVGPathDefinition.containsPoints()
+    #
+    def containsPoints(self, points, fillRule="nonzero", tolerance=0.1):
+        d = self.getD()
+        if d is None:
+            return np.zeros(len(np.reshape(points, (-1, 2))), dtype=bool)
+        return d.containsPoints(points, fillRule, tolerance)
 
     #
-    # If this path has a parent element,
-    # then split all closed paths in this path
-    # into separate paths and append them
-    # to the parent element after this path.
+    # Simplify runs of straight lines within the given tolerance,
+    # see SVGPathDefinition.simplify()
+    #
+    def simplify(self, tolerance=0.1):
+        d = self.getD()
+        if not (d is None):
+            d.simplify(tolerance)
+        return self
+
+    #
+    # Return the length of the path definition
+    #
+    def getTotalLength(self):
+        d = self.getD()
+        if d is None:
+            return 0.0
+        return d.getTotalLength()
+
+    #
+    # Return the point(s) at the given length(s) along the path definition
+    #
+    def getPointAtLength(self, length):
+        d = self.getD()
+        if d is None:
+            raise ValueError("Path without definition has no points")
+        return d.getPointAtLength(length)
+
+    #
+    # Return n points evenly spaced along the path definition
+    #
+    def resample(self, n):
+        d = self.getD()
+        if d is None:
+            raise ValueError("Path without definition has no points")
+        return d.resample(n)
+
+    #
+    # Split this path into one path per subpath,
+    # e.g. d="M ... Z M ... Z" into two paths
+    #
+    # The new paths inherit this path's attributes;
+    # their definitions are sliced from this path's commands without parsing them again.
+    # Except for the first one, the new paths' ids are suffixed with their index.
+    # If modifyParentSVG is true, this path is replaced by the new paths
+    # in its parent element's list of children.
     #
     def split(self, modifyParentSVG=True):
-        if modifyParentSVG and (self.parent is None):
+        if modifyParentSVG and (self.parentElement is None):
             print("Error: Unable to split: SVG to modify is undefined.")
             sys.exit(1)
 
+        d = self.getD()
+        if d is None:
+            return []
+
         paths = []
-        new_path = Path()
-
-        # d="m/M ... z/Z" is one closed path
-        for segment in this.d.segments:
-            # append segment to current path
-            new_path.d.segments.append(segment)
-
-            # is the path complete?
-            if segment.type == 'z' \
-            or segment.type == 'Z':
-                # path is complete, cut!
-                new_path.epilogue = this.epilogue
-                paths.append(new_path)
-                # proceed with new path
-                new_path = Path()
+        for k in range(d.getNumSubpaths()):
+            attributes = dict(self.attributes)
+            if (k > 0) and ("id" in attributes.keys()):
+                attributes["id"] = "{:s}-{:d}".format(attributes["id"], k)
+            path = SVGPath(svg=self.documentRoot, parent=self.parentElement, attributes=attributes, debug=self.debug)
+            path.attributes["d"] = d.getSubpath(k)
+            path.attributes["d"].path = path
+            paths.append(path)
+
+        if modifyParentSVG:
+            children = self.parentElement.children
+            index = children.index(self)
+            children[index:index+1] = paths
 
         return paths
+
+    #
+    # Split this path into its subpaths in place of this path
+    #
+    def breakApart(self):
+        return self.split(modifyParentSVG=True)
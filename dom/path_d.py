@@ -8,72 +8,434 @@ import re
 import numpy as np
 from copy import deepcopy
 
-from ..math.transform import sNumeric
-
-
-#
-# Compile regular expression for parsing
-#
-whitespace = "[ \t\,\:\;\(\)]*"
-# uncaptured group
-begin = "" #"(?:"
-end = "" #")"
-
-# Arc:
-# A rx ry x-axis-rotation large-arc-flag sweep-flag x y
-# a rx ry x-axis-rotation large-arc-flag sweep-flag dx dy
-sA = begin + whitespace + "([aA]{1})" + (whitespace + sNumeric)*7 + end
-
-# Bezier curve:
-#  C x1 y1, x2 y2, x y
-#  c dx1 dy1, dx2 dy2, dx dy
-sC = begin + whitespace + "([cC]{1})" + (whitespace + sNumeric)*6 + end
-
-# Quadratic curve:
-#  Q x1 y1, x y
-#  q dx1 dy1, dx dy
-# Append Bezier (smooth):
-#  S x2 y2, x y
-#  s dx2 dy2, dx dy
-sQS = begin + whitespace + "([qQsS]{1})" + (whitespace + sNumeric)*4 + end
-
-# MoveTo:
-#  M x y
-#  m dx dy
-# LineTo:
-#  L x y
-#  l dx dy
-# Append quadratic Bezier:
-#  T x y
-#  t dx dy
-sMLT = begin + whitespace + "([mMlLtT]{1})" + (whitespace + sNumeric)*2 + end
-
-# Horizontal line:
-#  H x
-#  h dx
-# Vertical line:
-#  V y
-#  v dy
-sHV = begin + whitespace + "([hHvV]{1})" + (whitespace + sNumeric) + end
-
-# Close path:
-#  Z
-#  z
-sZ = begin + whitespace + "([zZ]{1})" + end
-
-sSVGPathCommand = "|".join([sA,sC,sQS,sMLT,sHV,sZ])
-#print(sSVGPathCommand)
-rSVGPathCommand = re.compile(sSVGPathCommand)
-#print(rSVGPathCommand)
+from ..math.number import sNumber, formatNumbers
+from ..math.polygon import containsPoints, simplifyPolylines
+from ..math.curve import quadraticToCubic, evaluateCubic, cubicDerivative, cubicSubdivisions, cubicBounds, cubicLengths, \
+    arcFromEndpoints, evaluateArc, arcDerivative, arcSubdivisions, arcBounds, arcLengths, subdivisionParameters
+from ..math.transform import svgMatrixIdentity, svgMatrixGeneral, classifyMatrices, applyMatricesToPoints
 
 
+
+#
+# Compile regular expressions for parsing
+#
+whitespace = "[ \t\r\n,:;()]*"
+
 svgPathDCommandCharsLower = "mlvhcqstaz"
 svgPathDCommandCharsUpper = "MLVHCQSTAZ"
 svgPathDCommandChars = svgPathDCommandCharsLower + svgPathDCommandCharsUpper
 
-# Command chars can be omitted indicating repetition of the previous command with new values
-sBeginsWithCommandChar = "^" + whitespace + "([" + svgPathDCommandChars + "]{1})" + whitespace
-rSVGPathCommandChar = re.compile(sBeginsWithCommandChar)
+# Scanners, each matching at a given offset of the path definition string
+rSVGPathSeparator = re.compile(whitespace)
+rSVGPathCommandChar = re.compile(whitespace + "([" + svgPathDCommandChars + "])")
+rSVGPathNumber = re.compile(whitespace + "(" + sNumber + ")")
+# Arc flags are single digits and may be packed, e.g. "a1 1 0 00 1 1";
+# other numbers are tolerated as flags, if they are not packed.
+rSVGPathFlag = re.compile(whitespace + "([01])(?![.eE])")
+# The token at the end of a string, which may be continued by another chunk of the string
+rSVGPathTrailingToken = re.compile("[^ \t\r\n,:;()" + svgPathDCommandChars + "]*$")
+
+#
+# The number of numeric arguments per command
+#
+svgPathDArgumentCount = {
+    # MoveTo:
+    #  M x y
+    #  m dx dy
+    "M": 2,
+    # LineTo:
+    #  L x y
+    #  l dx dy
+    "L": 2,
+    # Horizontal line:
+    #  H x
+    #  h dx
+    "H": 1,
+    # Vertical line:
+    #  V y
+    #  v dy
+    "V": 1,
+    # Bezier curve:
+    #  C x1 y1, x2 y2, x y
+    #  c dx1 dy1, dx2 dy2, dx dy
+    "C": 6,
+    # Append Bezier (smooth):
+    #  S x2 y2, x y
+    #  s dx2 dy2, dx dy
+    "S": 4,
+    # Quadratic curve:
+    #  Q x1 y1, x y
+    #  q dx1 dy1, dx dy
+    "Q": 4,
+    # Append quadratic Bezier:
+    #  T x y
+    #  t dx dy
+    "T": 2,
+    # Arc:
+    #  A rx ry x-axis-rotation large-arc-flag sweep-flag x y
+    #  a rx ry x-axis-rotation large-arc-flag sweep-flag dx dy
+    "A": 7,
+    # Close path:
+    #  Z
+    #  z
+    "Z": 0,
+    }
+for c in svgPathDCommandCharsUpper:
+    svgPathDArgumentCount[c.lower()] = svgPathDArgumentCount[c]
+
+# Path commands are stored as opcodes, i.e. the ASCII code of the command char.
+# Lowercase (relative) opcodes differ from uppercase (absolute) ones by this bit:
+svgPathDOpcodeRelative = 0x20
+# Clear the relative bit to obtain the uppercase opcode
+svgPathDOpcodeMask = 0xFF ^ svgPathDOpcodeRelative
+
+# Look up the number of arguments by opcode
+svgPathDArgumentCountByOpcode = np.zeros(128, dtype=np.intp)
+for c in svgPathDCommandChars:
+    svgPathDArgumentCountByOpcode[ord(c)] = svgPathDArgumentCount[c]
+
+# The coordinate axis of every argument by command: 0 for x, 1 for y, -1 for other arguments
+svgPathDArgumentAxes = {
+    "M": [0, 1],
+    "L": [0, 1],
+    "H": [0],
+    "V": [1],
+    "C": [0, 1, 0, 1, 0, 1],
+    "S": [0, 1, 0, 1],
+    "Q": [0, 1, 0, 1],
+    "T": [0, 1],
+    "A": [-1, -1, -1, -1, -1, 0, 1],
+    "Z": [],
+    }
+svgPathDArgumentAxisByOpcode = np.full((128, 7), -1, dtype=np.int8)
+for c in svgPathDCommandChars:
+    axes = svgPathDArgumentAxes[c.upper()]
+    svgPathDArgumentAxisByOpcode[ord(c), :len(axes)] = axes
+
+# Endpoints of paths with fewer commands are calculated command by command,
+# which is faster than the fixed overhead (~0.1 ms) of the vectorized solver
+svgPathDScalarEndpointsBelow = 192
+
+# The length table divides every curve and arc into this many parameter intervals
+svgPathDLengthIntervals = 8
+# The number of Newton steps finding the parameter at a given length
+svgPathDLengthIterations = 3
+
+# Command chars can be omitted indicating repetition of the previous command with new values;
+# the coordinate pairs following a moveto are implicit lineto commands.
+svgPathDRepeatedCommandChars = {"M": "L", "m": "l"}
+
+
+#
+# Scan the command beginning at the given offset of a path definition string
+#
+# Returns a tuple of command char, list of arguments and
+# the offset following the command, or None at the end of the string.
+# The string is never copied, so that scanning a whole path is linear in its length.
+#
+def scanPathCommand(d, offset=0, previousCommandChar=None):
+    offset = rSVGPathSeparator.match(d, offset).end()
+    if offset >= len(d):
+        return None
+
+    m = rSVGPathCommandChar.match(d, offset)
+    if m is None:
+        if (previousCommandChar is None) or (previousCommandChar in "zZ"):
+            raise SyntaxError("Expected path command at offset {:d}".format(offset))
+        c = svgPathDRepeatedCommandChars.get(previousCommandChar, previousCommandChar)
+    else:
+        c = m.group(1)
+        offset = m.end()
+
+    args = []
+    isArc = (c == "a") or (c == "A")
+    for i in range(svgPathDArgumentCount[c]):
+        m = None
+        if isArc and ((i == 3) or (i == 4)):
+            m = rSVGPathFlag.match(d, offset)
+        if m is None:
+            m = rSVGPathNumber.match(d, offset)
+        if m is None:
+            raise SyntaxError("Expected argument {:d} of path command \"{:s}\" at offset {:d}".format(i+1, c, offset))
+        args.append(float(m.group(1)))
+        offset = m.end()
+
+    return (c, args, offset)
+
+
+#
+# Return true, if the command beginning at the given offset
+# lacks arguments at the end of the string, i.e. further arguments would complete it
+#
+def isIncompletePathCommand(d, offset=0, previousCommandChar=None):
+    try:
+        scanned = scanPathCommand(d + " 0" * 7, offset, previousCommandChar)
+    except SyntaxError:
+        return False
+    return (not (scanned is None)) and (scanned[2] > len(d))
+
+
+#
+# Return the absolute endpoint of a single command
+# beginning at the cursor within the subpath beginning at subpathStart
+#
+def calculateEndpoint(c, args, cursor, subpathStart):
+    upper = c.upper()
+    if upper == "Z":
+        return subpathStart
+    (x, y) = cursor if (c != upper) else (0.0, 0.0)
+    if upper == "H":
+        return (x + args[0], cursor[1])
+    if upper == "V":
+        return (cursor[0], y + args[0])
+    return (x + args[-2], y + args[-1])
+
+
+#
+# Iterate over the commands of a path definition without storing them
+#
+# The path definition is given as string, as iterable of strings or as file object,
+# which is read in chunks of the given size; commands may span several chunks.
+# Yields tuples of command char, list of arguments, absolute startpoint and absolute endpoint.
+#
+def iterPathCommands(d, chunkSize=65536):
+    if type(d) is str:
+        chunks = iter([d])
+    elif hasattr(d, "read"):
+        chunks = iter(lambda: d.read(chunkSize), "")
+    else:
+        chunks = iter(d)
+
+    text = ""
+    c = None
+    cursor = (0.0, 0.0)
+    subpathStart = cursor
+    final = False
+    while not final:
+        chunk = next(chunks, None)
+        final = chunk is None
+        if not final:
+            text += chunk
+        # The last token may be continued by the next chunk
+        view = text if final else text[:rSVGPathTrailingToken.search(text).start()]
+        offset = 0
+        while True:
+            try:
+                scanned = scanPathCommand(view, offset, c)
+            except SyntaxError:
+                if final or (not isIncompletePathCommand(view, offset, c)):
+                    raise
+                break
+            if scanned is None:
+                break
+            (c, args, offset) = scanned
+            endpoint = calculateEndpoint(c, args, cursor, subpathStart)
+            yield (c, args, cursor, endpoint)
+            cursor = endpoint
+            if (c == "M") or (c == "m"):
+                subpathStart = endpoint
+        text = text[offset:]
+
+
+#
+# Evaluate the recurrence x[i] = (x[i-1] if accumulate[i] else 0) + values[i]
+# for all i at once, beginning with x[-1] = 0
+#
+# values and accumulate may have a trailing axis, which is evaluated independently.
+# Returns x and, for every i, the last index not accumulating (or -1).
+#
+def scanRecurrence(values, accumulate):
+    n = len(values)
+    index = np.arange(n).reshape((n,) + (1,) * (values.ndim - 1))
+    start = np.maximum.accumulate(np.where(accumulate, -1, index), axis=0)
+    # Only accumulating values are summed up, so that large absolute values do not spoil the precision
+    c = np.cumsum(np.where(accumulate, values, 0.0), axis=0)
+    s = np.maximum(start, 0)
+    x = np.take_along_axis(values, s, axis=0) + c - np.take_along_axis(c, s, axis=0)
+    return (np.where(start >= 0, x, c), start)
+
+
+#
+# Return the command index of every argument
+#
+def argumentCommandIndices(offsets):
+    return np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+
+
+#
+# Return the coordinate axis of every argument (0 for x, 1 for y, -1 otherwise)
+#
+def argumentAxes(opcodes, offsets):
+    index = argumentCommandIndices(offsets)
+    position = np.arange(offsets[-1]) - offsets[index]
+    return (index, svgPathDArgumentAxisByOpcode[opcodes[index], position])
+
+
+#
+# Calculate the absolute endpoints of all commands at once
+#
+# Within a subpath every endpoint is either anchored at an absolute command,
+# relative to the subpath's startpoint (after M or Z)
+# or relative to the cursor the commands begin at (before the first M).
+# The subpaths' startpoints depend on each other in the same way.
+#
+# The cursor defaults to the origin and the startpoint of the subpath
+# the commands begin in defaults to the cursor.
+# The result is written to out, if given.
+#
+def calculateEndpoints(opcodes, offsets, args, cursor=(0.0, 0.0), subpathStart=None, out=None):
+    n = len(opcodes)
+    if n < svgPathDScalarEndpointsBelow:
+        return calculateEndpointsScalar(opcodes, offsets, args, cursor, subpathStart, out)
+    cursor = np.asarray(cursor, dtype=np.float64)
+    subpathStart = cursor if (subpathStart is None) else np.asarray(subpathStart, dtype=np.float64)
+    if out is None:
+        out = np.empty((n, 2))
+    upper = opcodes & svgPathDOpcodeMask
+    relative = (opcodes & svgPathDOpcodeRelative) != 0
+    isM = upper == ord("M")
+    isZ = upper == ord("Z")
+    isH = upper == ord("H")
+    isV = upper == ord("V")
+
+    # The values moving the cursor, i.e. the last argument pair or the H/V argument
+    first = offsets[:-1]
+    last = offsets[1:]
+    v = np.zeros((n, 2))
+    pair = (last - first) >= 2
+    v[pair, 0] = args[last[pair] - 2]
+    v[pair, 1] = args[last[pair] - 1]
+    v[isH, 0] = args[first[isH]]
+    v[isV, 1] = args[first[isV]]
+
+    # Walk along each subpath relative to its startpoint
+    hasAxis = np.stack([~isV, ~isH], axis=1)
+    floating = (isM | isZ)[:, None]
+    anchored = ~relative[:, None] & hasAxis & ~floating
+    (local, start) = scanRecurrence(np.where(floating, 0.0, v), ~(floating | anchored))
+    # Endpoints not depending on a subpath's startpoint
+    known = (start < 0) | np.take_along_axis(anchored, np.maximum(start, 0), axis=0)
+    knownBase = np.where(start < 0, cursor, 0.0)
+
+    # The subpaths' startpoints
+    m = np.flatnonzero(isM)
+    previous = m - 1
+    hasPrevious = (previous >= 0)[:, None]
+    p = np.maximum(previous, 0)
+    previousKnown = ~hasPrevious | known[p]
+    previousValue = np.where(hasPrevious, local[p] + knownBase[p], cursor)
+    r = relative[m][:, None]
+    beta = np.vstack([[subpathStart], v[m] + np.where(r, previousValue, 0.0)])
+    alpha = np.vstack([[[False, False]], r & ~previousKnown])
+    (subpathStarts, _) = scanRecurrence(beta, alpha)
+
+    subpath = np.cumsum(isM)
+    np.add(local, np.where(known, knownBase, subpathStarts[subpath]), out=out)
+    return out
+
+
+#
+# Calculate the absolute endpoints like calculateEndpoints(),
+# one command after the other
+#
+def calculateEndpointsScalar(opcodes, offsets, args, cursor=(0.0, 0.0), subpathStart=None, out=None):
+    offsets = offsets.tolist()
+    args = args.tolist()
+    cursor = (float(cursor[0]), float(cursor[1]))
+    subpathStart = cursor if (subpathStart is None) else (float(subpathStart[0]), float(subpathStart[1]))
+    endpoints = []
+    for (i, opcode) in enumerate(opcodes.tolist()):
+        c = chr(opcode)
+        cursor = calculateEndpoint(c, args[offsets[i]:offsets[i+1]], cursor, subpathStart)
+        if (c == "M") or (c == "m"):
+            subpathStart = cursor
+        endpoints.append(cursor)
+    if out is None:
+        out = np.empty((len(endpoints), 2))
+    if len(endpoints) > 0:
+        out[:] = endpoints
+    return out
+
+
+#
+# Return a mask of the commands beginning a subpath:
+# every moveto, the first command and commands following a close path
+#
+def calculateSubpathStarts(opcodes):
+    upper = opcodes & svgPathDOpcodeMask
+    starts = upper == ord("M")
+    if len(starts) > 0:
+        starts[0] = True
+        starts[1:] |= upper[:-1] == ord("Z")
+    return starts
+
+
+#
+# Calculate the geometry of the curved commands
+#
+# Returns the indices of the Bezier curve commands (C, S, Q, T) and
+# the control points of their equivalent cubic Bezier curves,
+# as well as the indices of the elliptical arc commands and their center parameterization.
+# Arcs degenerated to straight lines are omitted, just like all other straight lines.
+#
+def calculateCurves(opcodes, offsets, args, vertices):
+    upper = opcodes & svgPathDOpcodeMask
+    relative = (opcodes & svgPathDOpcodeRelative) != 0
+    startpoints = vertices[:-1]
+    endpoints = vertices[1:]
+    first = offsets[:-1]
+
+    # Return the absolute point given by the arguments k and k+1 of the commands i
+    def point(i, k):
+        p = np.stack([args[first[i]+k], args[first[i]+k+1]], axis=1)
+        return p + np.where(relative[i, None], startpoints[i], 0.0)
+
+    # Cubic Bezier curves; the first control point of S reflects the previous curve's second one
+    isC = upper == ord("C")
+    isS = upper == ord("S")
+    isCS = isC | isS
+    cubicIndices = np.flatnonzero(isCS)
+    c = np.flatnonzero(isC[cubicIndices])
+    s = np.flatnonzero(isS[cubicIndices])
+    cubics = np.empty((len(cubicIndices), 4, 2))
+    cubics[:, 0] = startpoints[cubicIndices]
+    cubics[:, 3] = endpoints[cubicIndices]
+    cubics[c, 1] = point(cubicIndices[c], 0)
+    cubics[c, 2] = point(cubicIndices[c], 2)
+    cubics[s, 2] = point(cubicIndices[s], 0)
+    cubics[s, 1] = startpoints[cubicIndices[s]]
+    # The previous command is a C or S, if it is the previous cubic curve as well
+    reflect = s[(s > 0) & (cubicIndices[s] - 1 == cubicIndices[np.maximum(s - 1, 0)])]
+    cubics[reflect, 1] = 2.0 * cubics[reflect, 0] - cubics[reflect - 1, 2]
+
+    # Quadratic Bezier curves; the control point of T reflects the previous curve's one,
+    # which may itself be reflected. With alternating signs the chain becomes a cumulative sum.
+    isQ = upper == ord("Q")
+    isT = upper == ord("T")
+    quadraticIndices = np.flatnonzero(isQ | isT)
+    q = np.flatnonzero(isQ[quadraticIndices])
+    t = np.flatnonzero(isT[quadraticIndices])
+    chained = np.zeros(len(quadraticIndices), dtype=bool)
+    chained[1:] = quadraticIndices[1:] - 1 == quadraticIndices[:-1]
+    chained[q] = False
+    p = startpoints[quadraticIndices].copy()
+    p[q] = point(quadraticIndices[q], 0)
+    p[chained] *= 2.0
+    sign = np.where(np.arange(len(quadraticIndices)) % 2 == 0, 1.0, -1.0)[:, None]
+    (p, _) = scanRecurrence(sign * p, np.repeat(chained[:, None], 2, axis=1))
+    p *= sign
+    quadratics = quadraticToCubic(startpoints[quadraticIndices], p, endpoints[quadraticIndices])
+
+    # Merge both kinds of Bezier curves
+    order = np.argsort(np.concatenate([cubicIndices, quadraticIndices]), kind="stable")
+    curveIndices = np.concatenate([cubicIndices, quadraticIndices])[order]
+    controls = np.concatenate([cubics, quadratics])[order]
+
+    # Elliptical arcs
+    i = np.flatnonzero(upper == ord("A"))
+    (arcs, valid) = arcFromEndpoints(startpoints[i], endpoints[i],
+        args[first[i]], args[first[i]+1], args[first[i]+2], args[first[i]+3], args[first[i]+4])
+    return (curveIndices, controls, i[valid], arcs[valid])
 
 
 #
@@ -81,14 +443,24 @@ rSVGPathCommandChar = re.compile(sBeginsWithCommandChar)
 #
 class SVGPathCommand:
     #
-    # Parse path command from regular expression match
+    # Parse path command from a list of command char and arguments,
+    # or materialize a view of a command stored in a path definition
     #
-    def __init__(self, command=[], startpoint=[0,0], previousCommand=None, debug=False):
+    def __init__(self, command=[], startpoint=[0,0], previousCommand=None, definition=None, index=None, debug=False):
         self.debug = debug
         self.startpoint = np.array(startpoint)
         self.endpoint = None
         self.m = []
 
+        if not (definition is None):
+            # Start- and endpoint are views of the definition's arrays
+            a = definition.offsets[index]
+            b = definition.offsets[index+1]
+            self.m = [chr(definition.opcodes[index])] + definition.args[a:b].tolist()
+            self.startpoint = definition.getStartpoints()[index]
+            self.endpoint = definition.getEndpoints()[index]
+            return
+
         if len(command) == 0:
             return
         if self.debug:
@@ -233,42 +605,47 @@ class SVGPathCommand:
         return cmd
 
     #
-    # Convert command back to string
+    # Convert command back to string, writing the flags of arcs as "0" or "1"
     #
     def __str__(self):
-        return " ".join([str(e) for e in self.m])
+        if len(self.m) == 0:
+            return ""
+        args = formatNumbers(self.m[1:])
+        if self.m[0] in "aA":
+            for i in [3, 4]:
+                args[i] = "0" if (self.m[i+1] == 0.0) else "1"
+        return " ".join([self.m[0]] + args)
 
 
 #
-# Loads, parsees and enables handling of paths
+# Loads, parses and enables handling of paths
 # as defined in a path's "d" attribute
 #
+# The commands are stored in columnar form:
+#  opcodes: the command chars' ASCII codes (uint8)
+#  offsets: the index of every command's first argument in args, plus the total number of arguments
+#  args:    the arguments of all commands (float64)
+# SVGPathCommand objects are only materialized on request.
+# With compact=True, materialized commands are not retained.
+#
 class SVGPathDefinition:
     #
     # initialize path data
     #
-    def __init__(self, path=None, d=None, debug=False):
+    def __init__(self, path=None, d=None, compact=False, debug=False):
         self.path = path
+        self.compact = compact
         self.debug = debug
 
         # Initialize empty
-        self.d = d
-        self.commands = []
+        self.clear()
         if d is None:
             return
 
         # Parse input string
         if self.debug:
             print("Parsing path definition: \"{:s}\"".format(d))
-
-        for idx, (s, cmd) in enumerate(self):
-            if self.debug:
-                a = str(cmd.getStartpoint())
-                b = str(cmd.getEndpoint())
-                r = str(cmd)
-                print("{:3d}: \"{:s}\" -> \"{:s}\", from {:s} to {:s}".format(idx, s, r, a, b))
-
-        self.updatePoints()
+        self.parse(d)
 
         #
         # TODO: Verification
@@ -278,101 +655,355 @@ class SVGPathDefinition:
         #
 
         if self.debug:
-            print("Results: {:s}".format(str([str(command) for command in self.commands])))
+            print("Results: {:s}".format(str(self)))
 
     #
-    # Path definition string tokenizer
+    # Remove all commands
     #
-    def __iter__(self):
-        self.commands = []
-        self.previousCommand = None
-        self.cursor = np.array([0.0, 0.0])
-        return self
+    def clear(self):
+        # The source string, as long as the commands are unmodified
+        self.d = None
+        self.opcodes = np.zeros(0, dtype=np.uint8)
+        self.offsets = np.zeros(1, dtype=np.intp)
+        self.args = np.zeros(0, dtype=np.float64)
+        # The startpoint of the first command
+        self.origin = np.array([0.0, 0.0])
+        self.commands = None
+        # Without commands, the origin is the only vertex
+        self.vertices = self.origin.reshape((1, 2)).copy()
+        self.updatePointsView()
 
     #
-    # Tokenize one command after the other
+    # Tokenize the path definition string into the command arrays
     #
-    def __next__(self):
-        self.d = self.d.strip()
-        if len(self.d) == 0:
-            raise StopIteration
+    def parse(self, d):
+        self.clear()
+        self.appendCommands(d)
+        self.d = d
 
-        # Explicitly insert repeated command char
-        m = rSVGPathCommandChar.match(self.d)
-        if self.debug:
-            print("Remains to be tokenized: " + self.d)
-            print(str(m))
-        repeat = True if (m is None) else False
-        if self.debug:
-            print("Repetition: {:s}".format("Yes" if repeat else "No"))
-        if repeat:
-            self.d = self.previousCommand.getCommandChar() + " " + self.d
-
-        # Parse remaining string
-        match = rSVGPathCommand.search(self.d)
-        if match is None:
-            print("Error: Syntax error in path definition.")
-            raise StopIteration
-        cmd = SVGPathCommand(command=match.groups(), startpoint=self.cursor, previousCommand=self.previousCommand, debug=self.debug)
-
-        # Store yielded command and move on to the next
-        self.commands.append(cmd)
-        self.previousCommand = cmd
-        self.cursor = cmd.getEndpoint()
-        span = match.span()
-        s = self.d[span[0]:span[1]]
-        self.d = self.d[span[1]:]
-        return (s, cmd)
+    #
+    # Tokenize a string of commands and append them to the path definition
+    #
+    def appendCommands(self, d):
+        opcodes = []
+        offsets = []
+        args = []
+        c = chr(self.opcodes[-1]) if (len(self) > 0) else None
+        offset = 0
+        numArgs = self.offsets[-1]
+        while True:
+            try:
+                scanned = scanPathCommand(d, offset, c)
+            except SyntaxError as e:
+                print("Error: Syntax error in path definition: {:s}".format(str(e)))
+                break
+            if scanned is None:
+                break
+            (c, a, offset) = scanned
+            opcodes.append(ord(c))
+            args += a
+            offsets.append(numArgs + len(args))
+
+        start = len(self)
+        if start == 0:
+            # Nothing to concatenate, e.g. while parsing
+            self.opcodes = np.array(opcodes, dtype=np.uint8)
+            self.offsets = np.array([0] + offsets, dtype=np.intp)
+            self.args = np.array(args, dtype=np.float64)
+        else:
+            self.opcodes = np.concatenate([self.opcodes, np.array(opcodes, dtype=np.uint8)])
+            self.offsets = np.concatenate([self.offsets, np.array(offsets, dtype=np.intp)])
+            self.args = np.concatenate([self.args, np.array(args, dtype=np.float64)])
+        self.d = None
+        self.updatePoints(start)
 
     #
-    # Whenever the path definition is altered,
-    # the array of points should be updated
+    # Replace the command at the given index,
+    # e.g. by ["L", 1.0, 2.0] or an SVGPathCommand
     #
-    def updatePoints(self):
-        # Walk along the path and store the points
-        cursor = np.array([0.0, 0.0])
-        if self.debug:
-            print("Startpoint: "+str(cursor))
-        self.points = np.array([cursor])
-        for cmd in self.getCommands():
-            cursor = cmd.getEndpoint()
-            if self.debug:
-                print("Next point: "+str(cursor))
-            self.points = np.append(self.points, [cursor], axis=0)
+    def setCommand(self, index, command):
+        if type(command) is SVGPathCommand:
+            command = command.m
+        c = command[0]
+        a = np.array(command[1:], dtype=np.float64)
+        if (not (c in svgPathDCommandChars)) or (len(a) != svgPathDArgumentCount[c]):
+            raise SyntaxError("Illegal path command: {:s}".format(str(command)))
+        if index < 0:
+            index += len(self)
+
+        # Splice the argument array
+        (first, last) = self.offsets[index:index+2]
+        self.args = np.concatenate([self.args[:first], a, self.args[last:]])
+        self.offsets = self.offsets.copy()
+        self.offsets[index+1:] += len(a) - (last - first)
+        self.opcodes = self.opcodes.copy()
+        self.opcodes[index] = ord(c)
+        self.d = None
+        self.updatePoints(index)
 
-        if self.debug:
-            print("Resulting array of points: "+str(self.points))
+    #
+    # Replace all commands by the given arrays of opcodes, offsets and arguments,
+    # e.g. for generated paths, which need not be formatted and parsed
+    #
+    def setCommands(self, opcodes, offsets, args):
+        opcodes = np.asarray(opcodes, dtype=np.uint8)
+        offsets = np.asarray(offsets, dtype=np.intp)
+        args = np.asarray(args, dtype=np.float64)
+        if (len(offsets) != len(opcodes) + 1) or (offsets[0] != 0) or (offsets[-1] != len(args)) \
+                or (np.diff(offsets) != svgPathDArgumentCountByOpcode[opcodes]).any():
+            raise SyntaxError("Illegal path commands: {:s}".format(bytes(opcodes).decode("ascii", "replace")))
+        self.opcodes = opcodes
+        self.offsets = offsets
+        self.args = args
+        self.d = None
+        self.updatePoints()
 
-        # If the first command is not drawn, then the startpoint is not treated as a curve point.
-        if self.commands[0].isMoveTo():
-            self.points = np.delete(self.points, 0, axis=0)
+    #
+    # Return a copy of this path definition
+    # not sharing any arrays with the original
+    #
+    def copy(self):
+        d = SVGPathDefinition(path=self.path, compact=self.compact, debug=self.debug)
+        d.d = self.d
+        d.opcodes = self.opcodes.copy()
+        d.offsets = self.offsets.copy()
+        d.args = self.args.copy()
+        d.origin = self.origin.copy()
+        d.vertices = self.vertices.copy()
+        d.updatePointsView()
+        return d
+
+    #
+    # Return a path definition sharing this definition's arrays
+    #
+    # The arrays are never modified in place, but replaced by every modification,
+    # so that the returned definition is a copy-on-write copy of this one.
+    #
+    def share(self, path=None, debug=False):
+        d = SVGPathDefinition(path=path, compact=self.compact, debug=debug)
+        d.d = self.d
+        d.opcodes = self.opcodes
+        d.offsets = self.offsets
+        d.args = self.args
+        d.origin = self.origin
+        d.vertices = self.vertices
+        d.updatePointsView()
+        return d
+
+    #
+    # Return the approximate number of bytes occupied by the arrays
+    #
+    def getMemoryUsage(self):
+        return self.opcodes.nbytes + self.offsets.nbytes + self.args.nbytes + self.origin.nbytes + self.vertices.nbytes
+
+    #
+    # Prevent the arrays from being modified in place,
+    # e.g. while they are shared by several definitions
+    #
+    def setReadOnly(self):
+        for a in [self.opcodes, self.offsets, self.args, self.origin, self.vertices]:
+            a.flags.writeable = False
+
+    #
+    # Iterate over the path's commands
+    #
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self.getCommand(index)
+
+    #
+    # Whenever the path definition is altered,
+    # the array of points should be updated.
+    # If only the commands beginning at the given index have changed,
+    # the points preceding them are retained.
+    # The endpoint solver only runs, if there are commands to update.
+    #
+    def updatePoints(self, start=0):
+        n = len(self)
+        start = min(start, n)
+        vertices = np.empty((n+1, 2))
+        if start == 0:
+            vertices[0] = self.origin
+            subpathStart = None
+        else:
+            vertices[:start+1] = self.vertices[:start+1]
+            # The current subpath begins at the last moveto
+            m = np.flatnonzero((self.opcodes[:start] & svgPathDOpcodeMask) == ord("M"))
+            subpathStart = vertices[m[-1]+1] if (len(m) > 0) else self.origin
+        if start < n:
+            calculateEndpoints(self.opcodes[start:], self.offsets[start:] - self.offsets[start], self.args[self.offsets[start]:],
+                cursor=vertices[start], subpathStart=subpathStart, out=vertices[start+1:])
+        self.vertices = vertices
+        self.updatePointsView()
 
         if self.debug:
             print("Points: {:s}".format(str(self.points)))
 
+    #
+    # The points are a view of the vertices:
+    # If the first command is not drawn, then the startpoint is not treated as a curve point.
+    #
+    def updatePointsView(self):
+        self.commands = None
+        self.subpaths = None
+        self.curves = None
+        self.bounds = None
+        self.lengths = None
+        skip = (len(self.opcodes) > 0) and ((self.opcodes[0] & svgPathDOpcodeMask) == ord("M"))
+        self.points = self.vertices[1:] if skip else self.vertices
+
     #
     # Return the number of commands in self path description
     #
     def __len__(self):
-        return len(self.commands)
+        return len(self.opcodes)
 
     #
-    # Stringify the path definition
+    # Stringify the path definition:
+    # unmodified definitions are returned verbatim
     #
     def __str__(self):
-        return " ".join([str(command) for command in self.commands])
+        if not (self.d is None):
+            return self.d
+        return self.toString()
+
+    #
+    # Stringify the path definition from its commands
+    #
+    # Numbers are written compactly and the flags of arcs as "0" or "1",
+    # since the path grammar does not allow any other flags.
+    #
+    def toString(self):
+        opcodes = self.opcodes.tolist()
+        offsets = self.offsets.tolist()
+        args = formatNumbers(self.args.tolist())
+        arcs = np.flatnonzero((self.opcodes & svgPathDOpcodeMask) == ord("A"))
+        for i in np.concatenate([self.offsets[arcs] + 3, self.offsets[arcs] + 4]).tolist():
+            args[i] = "0" if (self.args[i] == 0.0) else "1"
+        s = []
+        for i in range(len(opcodes)):
+            s.append(chr(opcodes[i]))
+            s += args[offsets[i]:offsets[i+1]]
+        return " ".join(s)
 
     #
     # Return the parsed array of of path commands
     #
     def getCommands(self):
-        return self.commands
+        if not (self.commands is None):
+            return self.commands
+        commands = [SVGPathCommand(definition=self, index=index, debug=self.debug) for index in range(len(self))]
+        if not self.compact:
+            self.commands = commands
+        return commands
 
     #
     # Return a specific command
     #
     def getCommand(self, index):
-        return self.getCommands()[index]
+        if not self.compact:
+            return self.getCommands()[index]
+        if index < 0:
+            index += len(self)
+        if (index < 0) or (index >= len(self)):
+            raise IndexError()
+        return SVGPathCommand(definition=self, index=index, debug=self.debug)
+
+    #
+    # Return the index of every subpath's first command,
+    # followed by the total number of commands,
+    # such that subpath k consists of the commands subpaths[k] to subpaths[k+1]-1
+    #
+    def getSubpathOffsets(self):
+        if self.subpaths is None:
+            self.subpaths = np.append(np.flatnonzero(calculateSubpathStarts(self.opcodes)), len(self))
+        return self.subpaths
+
+    def getNumSubpaths(self):
+        return len(self.getSubpathOffsets()) - 1
+
+    #
+    # Return a subpath as standalone path definition
+    #
+    # The command arrays are sliced, not parsed again.
+    # The subpath is made to begin with an absolute moveto,
+    # such that it remains in place without the preceding commands.
+    #
+    def getSubpath(self, k):
+        subpaths = self.getSubpathOffsets()
+        numSubpaths = len(subpaths) - 1
+        if k < 0:
+            k += numSubpaths
+        if (k < 0) or (k >= numSubpaths):
+            raise IndexError()
+        (first, last) = subpaths[k:k+2]
+        opcodes = self.opcodes[first:last]
+        offsets = self.offsets[first:last+1] - self.offsets[first]
+        args = self.args[self.offsets[first]:self.offsets[last]]
+        endpoints = self.vertices[first+1:last+1]
+
+        if (opcodes[0] & svgPathDOpcodeMask) == ord("M"):
+            if opcodes[0] != ord("M"):
+                opcodes = opcodes.copy()
+                opcodes[0] = ord("M")
+                args = args.copy()
+                args[:2] = endpoints[0]
+        else:
+            # After closepath, the subpath begins at the previous subpath's startpoint
+            opcodes = np.insert(opcodes, 0, ord("M"))
+            offsets = np.insert(offsets + 2, 0, 0)
+            args = np.concatenate([self.vertices[first], args])
+            endpoints = self.vertices[first:last+1]
+
+        d = SVGPathDefinition(path=self.path, compact=self.compact, debug=self.debug)
+        d.opcodes = opcodes
+        d.offsets = offsets
+        d.args = args
+        d.vertices = np.vstack([d.origin, endpoints])
+        d.updatePointsView()
+        return d
+
+    #
+    # Return the absolute start- and endpoints of all commands
+    #
+    def getStartpoints(self):
+        return self.vertices[:-1]
+
+    def getEndpoints(self):
+        return self.vertices[1:]
+
+    #
+    # Convert all commands to absolute commands
+    #
+    def toAbsolute(self, inplace=True):
+        return self.convertCoordinates(relative=False, inplace=inplace)
+
+    #
+    # Convert all commands to relative commands
+    #
+    def toRelative(self, inplace=True):
+        return self.convertCoordinates(relative=True, inplace=inplace)
+
+    #
+    # Add (or subtract) every command's startpoint to (or from) its coordinate arguments
+    #
+    def convertCoordinates(self, relative, inplace=True):
+        d = self if inplace else self.copy()
+        (index, axis) = argumentAxes(d.opcodes, d.offsets)
+        isRelative = (d.opcodes & svgPathDOpcodeRelative) != 0
+        convert = (isRelative[index] != relative) & (axis >= 0)
+        startpoints = d.getStartpoints()
+        args = d.args.copy()
+        if relative:
+            args[convert] -= startpoints[index[convert], axis[convert]]
+            d.opcodes = d.opcodes | svgPathDOpcodeRelative
+        else:
+            args[convert] += startpoints[index[convert], axis[convert]]
+            d.opcodes = d.opcodes & svgPathDOpcodeMask
+        d.args = args
+        d.d = None
+        d.updatePointsView()
+        return d
 
     #
     # Return the path's points
@@ -384,27 +1015,438 @@ class SVGPathDefinition:
     def getPoint(self, index):
         return self.getPoints()[index]
 
+    #
+    # Return the exact bounding box of the path
+    # as array of min x, min y, max x and max y
+    # including the extrema of curves and arcs
+    #
+    def getBounds(self):
+        if self.bounds is None:
+            points = self.getPoints()
+            if len(points) == 0:
+                raise ValueError("Empty path definition has no bounding box")
+            bounds = [np.hstack([points.min(axis=0), points.max(axis=0)])]
+            (curveIndices, controls, arcIndices, arcs) = self.getCurves()
+            bounds.append(cubicBounds(controls))
+            bounds.append(arcBounds(arcs))
+            bounds = np.vstack(bounds)
+            self.bounds = np.hstack([bounds[:, :2].min(axis=0), bounds[:, 2:].max(axis=0)])
+        return self.bounds
+
     def getMinX(self):
-        return self.getPoints().T[0, :].min()
+        return self.getBounds()[0]
 
     def getMinY(self):
-        return self.getPoints().T[1, :].min()
+        return self.getBounds()[1]
 
     def getMaxX(self):
-        return self.getPoints().T[0, :].max()
+        return self.getBounds()[2]
 
     def getMaxY(self):
-        return self.getPoints().T[1, :].max()
+        return self.getBounds()[3]
 
     #
-    # Apply a transformation matrix to all path points
+    # Return the geometry of the curved commands as cubic Bezier curves and elliptical arcs,
+    # see calculateCurves()
     #
-    def transform(self, matrix, inplace=True):
-        if inplace:
-            d = self
+    def getCurves(self):
+        if self.curves is None:
+            self.curves = calculateCurves(self.opcodes, self.offsets, self.args, self.vertices)
+        return self.curves
+
+    #
+    # Approximate the path by polylines within the given tolerance
+    #
+    # Returns an array of points and an array of offsets,
+    # such that subpath k consists of points[offsets[k]:offsets[k+1]].
+    #
+    def flatten(self, tolerance=0.1):
+        (curveIndices, controls, arcIndices, arcs) = self.getCurves()
+
+        # The number of segments per command: moveto begins a subpath with its endpoint,
+        # other commands beginning a subpath are preceded by their startpoint.
+        isM = (self.opcodes & svgPathDOpcodeMask) == ord("M")
+        starts = calculateSubpathStarts(self.opcodes)
+        counts = np.ones(len(self), dtype=np.intp)
+        counts[curveIndices] = cubicSubdivisions(controls, tolerance)
+        counts[arcIndices] = arcSubdivisions(arcs, tolerance)
+        includeStart = (starts & ~isM).astype(np.intp)
+
+        (index, t) = subdivisionParameters(counts, includeStart)
+        points = self.evaluate(index, t)
+
+        samples = counts + includeStart
+        first = np.cumsum(samples) - samples
+        offsets = np.append(first[starts], len(points))
+        return (points, offsets)
+
+    #
+    # Return whether the area filled by the path contains each of the given points
+    #
+    # The path is flattened within the given tolerance and its open subpaths are closed.
+    # The fill rule is either "nonzero" or "evenodd".
+    #
+    def containsPoints(self, points, fillRule="nonzero", tolerance=0.1):
+        (vertices, offsets) = self.flatten(tolerance)
+        return containsPoints(points, vertices, offsets, fillRule)
+
+    #
+    # Return which of the given command indices refer to curves and arcs
+    #
+    # Returns the positions within index referring to curves and their numbers within getCurves(),
+    # as well as the positions referring to arcs and their numbers.
+    #
+    def locateCurves(self, index):
+        (curveIndices, controls, arcIndices, arcs) = self.getCurves()
+        number = np.full(len(self), -1)
+        number[curveIndices] = np.arange(len(curveIndices))
+        onCurve = np.flatnonzero(number[index] >= 0)
+        curveNumbers = number[index[onCurve]]
+        number[:] = -1
+        number[arcIndices] = np.arange(len(arcIndices))
+        onArc = np.flatnonzero(number[index] >= 0)
+        return (onCurve, curveNumbers, onArc, number[index[onArc]])
+
+    #
+    # Evaluate every given command at its own parameter t,
+    # or the derivative with respect to t
+    #
+    def evaluate(self, index, t, derivative=False):
+        t = np.asarray(t, dtype=np.float64)
+        (curveIndices, controls, arcIndices, arcs) = self.getCurves()
+        (onCurve, curveNumbers, onArc, arcNumbers) = self.locateCurves(index)
+        startpoints = self.getStartpoints()[index]
+        endpoints = self.getEndpoints()[index]
+        if derivative:
+            points = endpoints - startpoints
+            points[onCurve] = cubicDerivative(controls[curveNumbers], t[onCurve])
+            points[onArc] = arcDerivative(arcs[arcNumbers], t[onArc])
         else:
-            # TODO: Will object references be correct?
-            d = deepcopy(self)
-        for cmd in d.getCommands():
-            cmd.transform(matrix, inplace=inplace)
-        self.updatePoints()
+            points = startpoints + t[:, None] * (endpoints - startpoints)
+            points[onCurve] = evaluateCubic(controls[curveNumbers], t[onCurve])
+            points[onArc] = evaluateArc(arcs[arcNumbers], t[onArc])
+        return points
+
+    #
+    # Return the length of every given command between the parameters t0 and t1
+    #
+    # Moveto commands have no length.
+    # The lengths of curves and arcs are integrated by Gauss-Legendre quadrature.
+    #
+    def getLengths(self, index, t0, t1):
+        t0 = np.asarray(t0, dtype=np.float64)
+        t1 = np.asarray(t1, dtype=np.float64)
+        (curveIndices, controls, arcIndices, arcs) = self.getCurves()
+        (onCurve, curveNumbers, onArc, arcNumbers) = self.locateCurves(index)
+        lines = self.getEndpoints()[index] - self.getStartpoints()[index]
+        lengths = np.linalg.norm(lines, axis=1) * (t1 - t0)
+        lengths[(self.opcodes[index] & svgPathDOpcodeMask) == ord("M")] = 0.0
+        lengths[onCurve] = cubicLengths(controls[curveNumbers], t0[onCurve], t1[onCurve])
+        lengths[onArc] = arcLengths(arcs[arcNumbers], t0[onArc], t1[onArc])
+        return lengths
+
+    #
+    # Return the table of the path's cumulative length
+    #
+    # Every command is one interval of the table, curves and arcs are divided into several.
+    # Returns the cumulative length at the beginning of every interval plus the total length,
+    # the command index of every interval as well as the parameters t at its beginning and end.
+    #
+    def getLengthTable(self):
+        if self.lengths is None:
+            (curveIndices, controls, arcIndices, arcs) = self.getCurves()
+            counts = np.ones(len(self), dtype=np.intp)
+            counts[curveIndices] = svgPathDLengthIntervals
+            counts[arcIndices] = svgPathDLengthIntervals
+            index = np.repeat(np.arange(len(self)), counts)
+            j = np.arange(len(index)) - (np.cumsum(counts) - counts)[index]
+            t0 = j / counts[index]
+            t1 = (j + 1) / counts[index]
+            cumulative = np.zeros(len(index) + 1)
+            np.cumsum(self.getLengths(index, t0, t1), out=cumulative[1:])
+            self.lengths = (cumulative, index, t0, t1)
+        return self.lengths
+
+    #
+    # Return the length of the path, not including moves
+    #
+    def getTotalLength(self):
+        return self.getLengthTable()[0][-1]
+
+    #
+    # Return the point at the given length along the path, or an array of points for an array of lengths
+    #
+    # The interval of the length table containing the length is found by binary search,
+    # then the parameter within that interval is refined by Newton's method.
+    #
+    def getPointAtLength(self, length):
+        (cumulative, index, t0, t1) = self.getLengthTable()
+        if len(index) == 0:
+            raise ValueError("Empty path definition has no points")
+        length = np.clip(np.asarray(length, dtype=np.float64), 0.0, cumulative[-1])
+        scalar = (length.ndim == 0)
+        length = np.atleast_1d(length)
+
+        # The last interval beginning before the length, or the first one
+        j = np.clip(np.searchsorted(cumulative, length, side="left") - 1, 0, len(index) - 1)
+        remaining = length - cumulative[j]
+        intervalLength = cumulative[j+1] - cumulative[j]
+        fraction = np.where(intervalLength > 0, remaining / np.where(intervalLength > 0, intervalLength, 1.0), 1.0)
+        t = t0[j] + fraction * (t1[j] - t0[j])
+
+        (onCurve, curveNumbers, onArc, arcNumbers) = self.locateCurves(index[j])
+        i = np.concatenate([onCurve, onArc])
+        k = j[i]
+        for iteration in range(svgPathDLengthIterations):
+            residual = self.getLengths(index[k], t0[k], t[i]) - remaining[i]
+            speed = np.linalg.norm(self.evaluate(index[k], t[i], derivative=True), axis=1)
+            step = np.where(speed > 0, residual / np.where(speed > 0, speed, 1.0), 0.0)
+            t[i] = np.clip(t[i] - step, t0[k], t1[k])
+
+        points = self.evaluate(index[j], t)
+        return points[0] if scalar else points
+
+    #
+    # Return n points evenly spaced along the path, including its start- and endpoint
+    #
+    def resample(self, n):
+        return self.getPointAtLength(np.linspace(0.0, self.getTotalLength(), n))
+
+    #
+    # Replace horizontal and vertical lines by lineto commands
+    #
+    def promoteLines(self, inplace=True):
+        d = self if inplace else self.copy()
+        upper = d.opcodes & svgPathDOpcodeMask
+        isH = upper == ord("H")
+        isV = upper == ord("V")
+        isHV = isH | isV
+        if not isHV.any():
+            return d
+        relative = (d.opcodes & svgPathDOpcodeRelative) != 0
+
+        # Every H and V gains one argument
+        counts = np.diff(d.offsets) + isHV
+        offsets = np.zeros(len(d) + 1, dtype=np.intp)
+        np.cumsum(counts, out=offsets[1:])
+        args = np.empty(offsets[-1])
+        index = argumentCommandIndices(d.offsets)
+        keep = ~isHV[index]
+        args[(np.arange(len(d.args)) + offsets[index] - d.offsets[index])[keep]] = d.args[keep]
+
+        # The coordinate missing is the startpoint's or zero
+        startpoints = d.getStartpoints()
+        i = np.flatnonzero(isH)
+        args[offsets[i]] = d.args[d.offsets[i]]
+        args[offsets[i]+1] = np.where(relative[i], 0.0, startpoints[i, 1])
+        i = np.flatnonzero(isV)
+        args[offsets[i]] = np.where(relative[i], 0.0, startpoints[i, 0])
+        args[offsets[i]+1] = d.args[d.offsets[i]]
+
+        d.opcodes = np.where(isHV, ord("L") | (d.opcodes & svgPathDOpcodeRelative), d.opcodes).astype(np.uint8)
+        d.offsets = offsets
+        d.args = args
+        d.d = None
+        d.updatePointsView()
+        return d
+
+    #
+    # Remove vertices from runs of straight lines,
+    # which deviate from the simplified lines by no more than the given tolerance
+    #
+    # Runs of lineto, horizontal and vertical line commands, possibly ending with closepath,
+    # are simplified by the Ramer-Douglas-Peucker algorithm; curves and arcs remain unchanged.
+    # Lines following a removed vertex are replaced by lineto commands.
+    #
+    def simplify(self, tolerance=0.1, inplace=True):
+        d = self if inplace else self.copy()
+        n = len(d)
+        upper = d.opcodes & svgPathDOpcodeMask
+        isLine = (upper == ord("L")) | (upper == ord("H")) | (upper == ord("V")) | (upper == ord("Z"))
+        if n < 2:
+            return d
+
+        # A run of lines begins with a line following anything else or beginning a subpath
+        starts = calculateSubpathStarts(d.opcodes)
+        runStart = isLine.copy()
+        runStart[1:] &= ~isLine[:-1] | starts[1:]
+        runIndex = np.cumsum(runStart) - 1
+        first = np.flatnonzero(runStart)
+        inRun = isLine & (runIndex >= 0)
+        counts = np.bincount(runIndex[inRun], minlength=len(first))
+
+        # Every run is a polyline of its first startpoint and all endpoints,
+        # i.e. the vertices from first to first+count
+        polylineOffsets = np.zeros(len(first) + 1, dtype=np.intp)
+        np.cumsum(counts + 1, out=polylineOffsets[1:])
+        run = np.repeat(np.arange(len(first)), counts + 1)
+        vertexIndex = first[run] + np.arange(len(run)) - polylineOffsets[run]
+        keepVertex = simplifyPolylines(d.vertices[vertexIndex], polylineOffsets, tolerance)
+        if keepVertex.all():
+            return d
+
+        # Commands ending in a removed vertex are removed,
+        # lines following them begin at another startpoint
+        keep = np.ones(n, dtype=bool)
+        keep[vertexIndex[~keepVertex] - 1] = False
+        rewrite = keep.copy()
+        rewrite[0] = False
+        rewrite[1:] &= ~keep[:-1]
+        rewrite &= upper != ord("Z")
+        previous = np.maximum.accumulate(np.where(keep, np.arange(n), -1))
+        startpoints = d.vertices[np.concatenate([[0], previous[:-1] + 1])]
+        relative = (d.opcodes & svgPathDOpcodeRelative) != 0
+
+        counts = np.where(rewrite, 2, np.diff(d.offsets))
+        counts[~keep] = 0
+        offsets = np.zeros(n + 1, dtype=np.intp)
+        np.cumsum(counts, out=offsets[1:])
+        args = np.empty(offsets[-1])
+        index = argumentCommandIndices(d.offsets)
+        copy = keep[index] & ~rewrite[index]
+        args[(np.arange(len(d.args)) + offsets[index] - d.offsets[index])[copy]] = d.args[copy]
+        i = np.flatnonzero(rewrite)
+        endpoints = d.vertices[i + 1] - np.where(relative[i, None], startpoints[i], 0.0)
+        args[offsets[i]] = endpoints[:, 0]
+        args[offsets[i] + 1] = endpoints[:, 1]
+        opcodes = np.where(rewrite, ord("L") | (d.opcodes & svgPathDOpcodeRelative), d.opcodes).astype(np.uint8)
+
+        # The endpoints of the remaining commands are unchanged
+        d.vertices = d.vertices[np.concatenate([[0], np.flatnonzero(keep) + 1])]
+        d.opcodes = opcodes[keep]
+        d.offsets = np.concatenate([offsets[:-1][keep], offsets[-1:]])
+        d.args = args
+        d.d = None
+        d.updatePointsView()
+        return d
+
+    #
+    # Apply a transformation matrix to the path
+    #
+    # All coordinates are transformed at once; relative coordinates are not translated.
+    # Horizontal and vertical lines are promoted to lineto commands, if the matrix rotates or skews.
+    # The radii and rotation of arcs are adapted to the transformed ellipse.
+    #
+    def transform(self, matrix, inplace=True):
+        d = self if inplace else self.copy()
+        if matrix.isIdentity():
+            return d
+        transformPathDefinitions([d], [matrix.getComponents()])
+        return d
+
+
+#
+# Apply one transformation matrix (given by its six components) to each path definition
+#
+# The arguments and vertices of all definitions are concatenated, so that their
+# coordinate pairs are transformed by a single call of applyMatricesToPoints(),
+# and the results are scattered back to the definitions.
+# Only lines are promoted per definition, if its matrix rotates or skews it.
+#
+# The origin is not written to the path's string, so that the string may not depend on it:
+# A leading relative moveto is rewritten as an absolute one,
+# and commands not beginning with a moveto are preceded by a moveto to the origin first.
+#
+def transformPathDefinitions(definitions, matrices):
+    matrices = np.asarray(matrices, dtype=np.float64).reshape((-1, 6))
+    if len(matrices) != len(definitions):
+        raise ValueError("Expected {:d} matrices, got {:d}".format(len(definitions), len(matrices)))
+    kinds = classifyMatrices(matrices)
+    keep = np.flatnonzero(kinds != svgMatrixIdentity)
+    if len(keep) == 0:
+        return definitions
+    items = [definitions[k] for k in keep.tolist()]
+    (matrices, kinds) = (matrices[keep], kinds[keep])
+    n = len(items)
+    for d in items:
+        if (len(d.opcodes) > 0) and ((d.opcodes[0] & svgPathDOpcodeMask) != ord("M")):
+            d.setCommands(np.concatenate([[ord("M")], d.opcodes]), np.concatenate([[0], d.offsets + 2]),
+                np.concatenate([d.origin, d.args]))
+
+    # Horizontal and vertical lines are promoted, if the matrix rotates or skews
+    counts = np.array([len(d.opcodes) for d in items], dtype=np.intp)
+    upper = np.concatenate([d.opcodes for d in items]) & svgPathDOpcodeMask
+    commandPaths = np.repeat(np.arange(n), counts)
+    hv = commandPaths[(upper == ord("H")) | (upper == ord("V"))]
+    promote = np.flatnonzero((np.bincount(hv, minlength=n) > 0) & (kinds == svgMatrixGeneral))
+    for k in promote.tolist():
+        items[k].promoteLines()
+
+    # Concatenate the commands with their offsets shifted to the concatenated arguments
+    argCounts = np.array([len(d.args) for d in items], dtype=np.intp)
+    argStarts = np.zeros(n + 1, dtype=np.intp)
+    np.cumsum(argCounts, out=argStarts[1:])
+    counts = np.array([len(d.opcodes) for d in items], dtype=np.intp)
+    commandPaths = np.repeat(np.arange(n), counts)
+    opcodes = np.concatenate([d.opcodes for d in items])
+    offsets = np.empty(len(opcodes) + 1, dtype=np.intp)
+    offsets[:-1] = np.concatenate([d.offsets[:-1] for d in items]) + argStarts[commandPaths]
+    offsets[-1] = argStarts[-1]
+    args = np.concatenate([d.args for d in items])
+    (index, axis) = argumentAxes(opcodes, offsets)
+    absolute = (opcodes & svgPathDOpcodeRelative) == 0
+    commandStarts = np.zeros(n + 1, dtype=np.intp)
+    np.cumsum(counts, out=commandStarts[1:])
+    i = commandStarts[:-1][counts > 0]
+    absolute[i] = True
+    opcodes[i] &= svgPathDOpcodeMask
+    (a, b, c, dy, e, f) = matrices[commandPaths].T
+
+    # Coordinate pairs: an x argument followed by a y argument of the same command,
+    # grouped by definition; relative coordinates are not translated
+    pair = np.flatnonzero((axis[:-1] == 0) & (axis[1:] == 1) & (index[:-1] == index[1:]))
+    pairOffsets = np.zeros(n + 1, dtype=np.intp)
+    np.cumsum(np.bincount(commandPaths[index[pair]], minlength=n), out=pairOffsets[1:])
+    points = applyMatricesToPoints(matrices, np.stack([args[pair], args[pair+1]], axis=1), pairOffsets,
+        inplace=True, translate=False)
+    i = index[pair]
+    args[pair] = points[:, 0] + absolute[i] * e[i]
+    args[pair+1] = points[:, 1] + absolute[i] * f[i]
+
+    # Horizontal and vertical lines remain, if the matrix is axis-aligned
+    single = np.ones(len(args), dtype=bool)
+    single[pair] = False
+    single[pair+1] = False
+    k = np.flatnonzero(single & (axis == 0))
+    i = index[k]
+    args[k] = a[i] * args[k] + absolute[i] * e[i]
+    k = np.flatnonzero(single & (axis == 1))
+    i = index[k]
+    args[k] = dy[i] * args[k] + absolute[i] * f[i]
+
+    # The ellipse of an arc is the image of the unit circle under linear * rotation * scale
+    i = np.flatnonzero((opcodes & svgPathDOpcodeMask) == ord("A"))
+    if len(i) > 0:
+        first = offsets[i]
+        phi = np.radians(args[first+2])
+        (cos, sin) = (np.cos(phi), np.sin(phi))
+        m = np.empty((len(i), 2, 2))
+        m[:, 0, 0] = (a[i] * cos + c[i] * sin) * args[first]
+        m[:, 1, 0] = (b[i] * cos + dy[i] * sin) * args[first]
+        m[:, 0, 1] = (c[i] * cos - a[i] * sin) * args[first+1]
+        m[:, 1, 1] = (dy[i] * cos - b[i] * sin) * args[first+1]
+        # Eigen decomposition of the symmetric matrix m * m^T
+        p = (m[:, 0, :] ** 2).sum(axis=1)
+        q = (m[:, 0, :] * m[:, 1, :]).sum(axis=1)
+        r = (m[:, 1, :] ** 2).sum(axis=1)
+        mean = (p + r) / 2.0
+        deviation = np.sqrt(((p - r) / 2.0) ** 2 + q * q)
+        args[first] = np.sqrt(mean + deviation)
+        args[first+1] = np.sqrt(np.maximum(mean - deviation, 0.0))
+        args[first+2] = np.degrees(0.5 * np.arctan2(2.0 * q, p - r))
+        # Mirroring reverses the sweep direction
+        mirrored = a[i] * dy[i] - b[i] * c[i] < 0
+        args[first+4] = np.where(mirrored, np.where(args[first+4] == 0.0, 1.0, 0.0), args[first+4])
+
+    # The endpoints of the commands are transformed like all other points
+    vertexStarts = np.zeros(n + 1, dtype=np.intp)
+    np.cumsum(counts + 1, out=vertexStarts[1:])
+    vertices = applyMatricesToPoints(matrices, np.concatenate([d.vertices for d in items]), vertexStarts, inplace=True)
+    for (k, d) in enumerate(items):
+        d.args = args[argStarts[k]:argStarts[k+1]]
+        d.vertices = vertices[vertexStarts[k]:vertexStarts[k+1]]
+        d.opcodes = opcodes[commandStarts[k]:commandStarts[k+1]]
+        d.origin = d.vertices[0].copy()
+        d.d = None
+        d.updatePointsView()
+    return definitions
@@ -0,0 +1,97 @@
+#!/usr/bin/python3
+#
+# Cache for parsed path definitions
+#
+# Generated SVGs often repeat identical path definition strings.
+# Each string is only parsed once; all paths with the same string
+# share the parsed arrays until they are modified (copy-on-write).
+#
+
+import sys
+from collections import OrderedDict
+
+from .path_d import SVGPathDefinition
+
+
+#
+# Least recently used cache of parsed path definitions
+# keyed by the definition string
+#
+# The cache is bounded by the number of entries and
+# by the approximate number of bytes of the strings and the parsed arrays.
+#
+class SVGPathDefinitionCache:
+    def __init__(self, maxEntries=4096, maxBytes=64*1024*1024, debug=False):
+        self.maxEntries = maxEntries
+        self.maxBytes = maxBytes
+        self.debug = debug
+        self.clear()
+
+    #
+    # Remove all entries and reset the statistics
+    #
+    def clear(self):
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, d):
+        return d in self.entries
+
+    #
+    # Return a parsed definition of the given string for the given path,
+    # sharing its arrays with all other definitions of the same string
+    #
+    def get(self, d, path=None, debug=False):
+        entry = self.entries.get(d)
+        if not (entry is None):
+            self.hits += 1
+            self.entries.move_to_end(d)
+            return entry[0].share(path=path, debug=debug)
+
+        self.misses += 1
+        definition = SVGPathDefinition(d=d, debug=debug)
+        size = sys.getsizeof(d) + definition.getMemoryUsage()
+        if (self.maxEntries > 0) and (size <= self.maxBytes):
+            definition.setReadOnly()
+            self.entries[d] = (definition, size)
+            self.bytes += size
+            self.evict()
+            return definition.share(path=path, debug=debug)
+
+        if self.debug:
+            print("Path definition of {:d} bytes exceeds the cache's budget".format(size))
+        definition.path = path
+        return definition
+
+    #
+    # Remove the least recently used entries,
+    # until the number of entries and bytes are within the bounds
+    #
+    def evict(self):
+        while (len(self.entries) > self.maxEntries) or (self.bytes > self.maxBytes):
+            (d, (definition, size)) = self.entries.popitem(last=False)
+            self.bytes -= size
+            self.evictions += 1
+
+    #
+    # Return the number of hits, misses and evictions
+    # as well as the current number of entries and bytes
+    #
+    def getStatistics(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self.entries),
+            "bytes": self.bytes
+            }
+
+
+# The cache shared by all paths
+svgPathDefinitionCache = SVGPathDefinitionCache()
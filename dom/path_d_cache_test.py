@@ -0,0 +1,59 @@
+#!/usr/bin/python
+
+import numpy as np
+
+from .path_d_cache import SVGPathDefinitionCache
+from ..math.transform import SVGMatrix
+
+
+def testSharing():
+    cache = SVGPathDefinitionCache()
+    a = cache.get("M 0 0 L 1 1")
+    b = cache.get("M 0 0 L 1 1")
+    assert(cache.getStatistics()["hits"] == 1)
+    assert(cache.getStatistics()["misses"] == 1)
+    assert(a is not b)
+    assert(a.args is b.args)
+    assert(str(b) == "M 0 0 L 1 1")
+
+    # Shared arrays are copied on write
+    a.transform(SVGMatrix(e=1, f=2))
+    assert(a.getPoints().tolist() == [[1, 2], [2, 3]])
+    assert(b.getPoints().tolist() == [[0, 0], [1, 1]])
+    a.setCommand(0, ["M", 5, 5])
+    b.toRelative()
+    c = cache.get("M 0 0 L 1 1")
+    assert(c.toString() == "M 0 0 L 1 1")
+
+    # Writing to shared arrays directly is prohibited
+    try:
+        c.args[0] = 1.0
+        assert(False)
+    except ValueError:
+        pass
+
+
+def testEviction():
+    cache = SVGPathDefinitionCache(maxEntries=2)
+    for d in ["M 0 0", "M 1 1", "M 0 0", "M 2 2"]:
+        cache.get(d)
+    assert(len(cache) == 2)
+    assert("M 0 0" in cache)
+    assert(not ("M 1 1" in cache))
+    assert(cache.getStatistics()["evictions"] == 1)
+
+    # The byte budget is never exceeded, large definitions are not cached
+    cache = SVGPathDefinitionCache(maxBytes=1000)
+    d = cache.get("M 0 0" + " L 1 1" * 100)
+    assert(len(d) == 101)
+    assert(len(cache) == 0)
+    for i in range(10):
+        cache.get("M {:d} 0 L 1 1".format(i))
+    statistics = cache.getStatistics()
+    assert(0 < statistics["entries"] < 10)
+    assert(statistics["bytes"] <= 1000)
+    assert(statistics["evictions"] == 10 - statistics["entries"])
+
+    cache.clear()
+    assert(len(cache) == 0)
+    assert(cache.getStatistics()["misses"] == 0)
@@ -1,9 +1,11 @@
 #!/usr/bin/python3
 
+import io
 import numpy as np
 
-from .path_d import SVGPathCommand, SVGPathDefinition
-from ..math.transform import SVGTransformList
+from .path_d import SVGPathCommand, SVGPathDefinition, iterPathCommands, calculateEndpoints, calculateEndpointsScalar, \
+    transformPathDefinitions
+from ..math.transform import SVGTransformList, SVGMatrix
 
 
 def testParsing():
@@ -37,11 +39,252 @@ def testParsing():
     assert(d.getCommand(10).isClosePath() == True)
 
 
+def testCompactSyntax():
+    # Packed numbers and implicit repetition
+    d = SVGPathDefinition(d="M1.5.5-1-2l1e1-2E-1.5 3z", debug=True)
+    assert(len(d) == 5)
+    assert([str(cmd) for cmd in d.getCommands()] == ["M 1.5 0.5", "L -1 -2", "l 10 -0.2", "l 0.5 3", "z"])
+
+    # Packed arc flags
+    d = SVGPathDefinition(d="M0 0a5 5 0 1020 0a5,5,0,0,1-20,0", debug=True)
+    assert(len(d) == 3)
+    assert(d.getCommand(1).m == ["a", 5.0, 5.0, 0.0, 1.0, 0.0, 20.0, 0.0])
+    assert(d.getCommand(2).m == ["a", 5.0, 5.0, 0.0, 0.0, 1.0, -20.0, 0.0])
+
+    # Parsing stops at syntax errors
+    d = SVGPathDefinition(d="M 1 2 L 3 # 4", debug=True)
+    assert(len(d) == 1)
+
+
+def testColumnarStorage():
+    s = "M 1 2 l 3 4 H 7 z m 1 1 Q 2 2 3 3"
+    for compact in [False, True]:
+        d = SVGPathDefinition(d=s, compact=compact, debug=True)
+        assert(d.opcodes.dtype == np.uint8)
+        assert(d.args.dtype == np.float64)
+        assert(list(d.offsets) == [0, 2, 4, 5, 5, 7, 11])
+        assert(len(d.args) == 11)
+        assert(str(d) == s)
+        assert(d.toString() == "M 1 2 l 3 4 H 7 z m 1 1 Q 2 2 3 3")
+
+        # Close path returns to the subpath's startpoint
+        assert(d.getCommand(3).isClosePath())
+        assert(list(d.getCommand(3).getEndpoint()) == [1, 2])
+        assert(list(d.getCommand(4).getEndpoint()) == [2, 3])
+        assert(list(d.getEndpoints()[:, 0]) == [1, 4, 7, 1, 2, 3])
+        assert(d.getMaxX() == 7)
+
+        # Materialized commands are views of the arrays
+        cmd = d.getCommand(2)
+        assert(cmd.m == ["H", 7.0])
+        assert(cmd.getStartpoint().base is not None)
+        assert((d.getCommand(2) is cmd) == (not compact))
+        assert(len([c for c in d]) == 6)
+
+
+def testAbsoluteRelative():
+    s = "m 1 2 l 3 4 h 2 v -1 c 1 1 2 2 3 3 a 5 5 0 0 1 2 0 z l 1 1 M 10 10 L 11 12 z"
+    d = SVGPathDefinition(d=s, debug=True)
+    points = d.getPoints().copy()
+
+    a = d.toAbsolute(inplace=False)
+    assert(a.toString() == "M 1 2 L 4 6 H 6 V 5 C 7 6 8 7 9 8 A 5 5 0 0 1 11 8 Z L 2 3 M 10 10 L 11 12 Z")
+    assert(str(d) == s)
+    a.updatePoints()
+    assert(np.array_equal(a.getPoints(), points))
+
+    r = a.toRelative(inplace=False)
+    assert(r.toString() == "m 1 2 l 3 4 h 2 v -1 c 1 1 2 2 3 3 a 5 5 0 0 1 2 0 z l 1 1 m 8 7 l 1 2 z")
+    r.updatePoints()
+    assert(np.array_equal(r.getPoints(), points))
+
+    # In place
+    assert(d.toAbsolute() is d)
+    assert(d.toString() == a.toString())
+
+
+def testIncrementalUpdate():
+    d = SVGPathDefinition(d="M 0 0 L 1 1 z m 1 1", debug=True)
+    d.appendCommands("2 0 z l 1 1")
+    assert(d.toString() == "M 0 0 L 1 1 z m 1 1 l 2 0 z l 1 1")
+    assert(d.getPoints().tolist() == [[0, 0], [1, 1], [0, 0], [1, 1], [3, 1], [1, 1], [2, 2]])
+
+    d.setCommand(3, ["M", 5, 5])
+    assert(d.getPoints().tolist() == [[0, 0], [1, 1], [0, 0], [5, 5], [7, 5], [5, 5], [6, 6]])
+    d.setCommand(1, ["C", 1, 1, 2, 2, 3, 3])
+    assert(d.offsets[-1] == 14)
+    assert(d.getPoint(1).tolist() == [3, 3])
+    assert(SVGPathDefinition(d=d.toString()).getPoints().tolist() == d.getPoints().tolist())
+
+
+def testSetCommands():
+    d = SVGPathDefinition(d="M 5 5 L 6 6")
+    d.setCommands([ord("M"), ord("h"), ord("Z")], [0, 2, 3, 3], [1, 2, 3])
+    assert(str(d) == "M 1 2 h 3 Z")
+    assert(d.getPoints().tolist() == [[1, 2], [4, 2], [1, 2]])
+    for (opcodes, offsets, args) in [("Mh", [0, 2, 4], [1, 2, 3, 4]), ("M", [0, 1], [1]), ("M", [0, 2], [1, 2, 3])]:
+        try:
+            d.setCommands([ord(c) for c in opcodes], offsets, args)
+            assert(False)
+        except SyntaxError:
+            pass
+
+
+def testEndpointSolvers():
+    # Short paths are solved command by command, long ones at once
+    rng = np.random.default_rng(4)
+    commands = rng.choice(list("MmLlHhVvCcZz"), size=500)
+    commands[0] = "m"
+    s = " ".join([c + " 1.5" * {"m": 2, "l": 2, "h": 1, "v": 1, "c": 6, "z": 0}[c.lower()] for c in commands])
+    d = SVGPathDefinition(d=s)
+    for (cursor, subpathStart) in [((0, 0), None), ((2, 3), (-1, 5))]:
+        vectorized = calculateEndpoints(d.opcodes, d.offsets, d.args, cursor, subpathStart)
+        scalar = calculateEndpointsScalar(d.opcodes, d.offsets, d.args, cursor, subpathStart)
+        assert(np.allclose(vectorized, scalar))
+    assert(np.allclose(d.getEndpoints(), calculateEndpointsScalar(d.opcodes, d.offsets, d.args)))
+    assert(calculateEndpointsScalar(d.opcodes[:0], d.offsets[:1], d.args[:0]).shape == (0, 2))
+
+
+def testFlattening():
+    d = SVGPathDefinition(d="M 0 0 L 10 0 A 5 5 0 0 1 10 10 z m 20 0 q 5 -5 10 0 t 10 0 c 0 5 5 5 10 0 z h 3", debug=True)
+    (points, offsets) = d.flatten(tolerance=0.01)
+    assert(len(offsets) == 4)
+    assert(offsets[-1] == len(points))
+
+    # Closed subpaths end at their startpoint
+    first = points[offsets[0]:offsets[1]]
+    assert(first[0].tolist() == [0, 0])
+    assert(first[1].tolist() == [10, 0])
+    assert(first[-1].tolist() == [0, 0])
+    # The arc bulges out to the right
+    assert(abs(first[:, 0].max() - 15) < 0.01)
+    assert(np.allclose(np.linalg.norm(first[1:-2] - [10, 5], axis=1), 5))
+
+    # Quadratic curves, the second one reflecting the first's control point, and a cubic curve
+    second = points[offsets[1]:offsets[2]]
+    assert(abs(second[second[:, 0] <= 30, 1].min() + 2.5) < 0.01)
+    assert(abs(second[(second[:, 0] >= 30) & (second[:, 0] <= 40), 1].max() - 2.5) < 0.01)
+    assert(abs(second[:, 1].max() - 3.75) < 0.01)
+
+    # A subpath without moveto follows close path
+    assert(points[offsets[2]:].tolist() == [[20, 0], [23, 0]])
+
+    # Lines are not subdivided
+    (points, offsets) = SVGPathDefinition(d="M 1 1 h 1 v 1 z").flatten()
+    assert(points.tolist() == [[1, 1], [2, 1], [2, 2], [1, 1]])
+    assert(offsets.tolist() == [0, 4])
+
+
+def testLength():
+    d = SVGPathDefinition(d="M 0 0 h 4 v 4 h -4 z M 10 0 A 10 10 0 0 1 -10 0")
+    assert(np.isclose(d.getTotalLength(), 16 + 10 * np.pi))
+    assert(d.getPointAtLength(0).tolist() == [0, 0])
+    assert(d.getPointAtLength(6).tolist() == [4, 2])
+    assert(d.getPointAtLength([-1, 16]).tolist() == [[0, 0], [0, 0]])
+    assert(np.allclose(d.getPointAtLength(16 + 5 * np.pi), [0, 10]))
+    assert(np.allclose(d.getPointAtLength(1000), [-10, 0]))
+    assert(np.allclose(d.getPointAtLength(np.arange(8) * 2), [[0, 0], [2, 0], [4, 0], [4, 2], [4, 4], [2, 4], [0, 4], [0, 2]]))
+    assert(np.allclose(SVGPathDefinition(d="M 0 0 h 4 v 4 h -4 z").resample(5), [[0, 0], [4, 0], [4, 4], [0, 4], [0, 0]]))
+
+    # Resampled points are evenly spaced along curves
+    d = SVGPathDefinition(d="M 0 0 C 0 10 10 10 10 0 q 5 -20 10 0")
+    points = d.resample(101)
+    assert(np.allclose(points[[0, -1]], [[0, 0], [20, 0]]))
+    (flat, offsets) = d.flatten(tolerance=1e-5)
+    length = np.linalg.norm(np.diff(flat, axis=0), axis=1).sum()
+    assert(abs(d.getTotalLength() - length) < 1e-4)
+    # Chords of a gently curved curve match its arc length
+    d = SVGPathDefinition(d="M 0 0 C 0 10 10 10 10 0")
+    points = d.resample(101)
+    assert(np.allclose(np.linalg.norm(np.diff(points, axis=0), axis=1), d.getTotalLength() / 100, rtol=1e-3))
+
+    # The table is updated, when the commands change
+    d.setCommand(1, ["L", 10, 0])
+    assert(d.getTotalLength() == 10)
+    try:
+        SVGPathDefinition(d="").getPointAtLength(0)
+        assert(False)
+    except ValueError:
+        pass
+
+
+def testSimplify():
+    d = SVGPathDefinition(d="M 0 0 L 1 0.01 2 0 h 1 l 1 -0.01 v 5 L 4 10 C 5 10 5 11 4 11 l -1 0.01 H 0 z m 1 0 h 1 v 1")
+    points = d.getPoints().copy()
+    d.simplify(0.1)
+    assert(d.toString() == "M 0 0 l 4 -0.01 L 4 10 C 5 10 5 11 4 11 L 0 11.01 z m 1 0 h 1 v 1")
+    assert(SVGPathDefinition(d=d.toString()).getPoints().tolist() == d.getPoints().tolist())
+    assert(len(d.getPoints()) == 9)
+    assert(d.getPoints()[-3:].tolist() == points[-3:].tolist())
+
+    # Nothing to simplify
+    d = SVGPathDefinition(d="M 0 0 L 1 1 L 2 0 z")
+    assert(d.simplify(0.1, inplace=False).toString() == d.toString())
+    assert(str(d) == "M 0 0 L 1 1 L 2 0 z")
+
+
+def testSubpaths():
+    d = SVGPathDefinition(d="M 0 0 L 1 1 z m 1 1 l 2 0 z l 1 1 M 5 5 h 1", debug=True)
+    assert(d.getNumSubpaths() == 4)
+    assert(d.getSubpathOffsets().tolist() == [0, 3, 6, 7, 9])
+
+    # Subpaths begin with an absolute moveto and stay in place
+    assert(d.getSubpath(0).toString() == "M 0 0 L 1 1 z")
+    assert(d.getSubpath(1).toString() == "M 1 1 l 2 0 z")
+    assert(d.getSubpath(2).toString() == "M 1 1 l 1 1")
+    assert(d.getSubpath(-1).toString() == "M 5 5 h 1")
+    for k in range(d.getNumSubpaths()):
+        s = d.getSubpath(k)
+        assert(s.getPoints().tolist() == SVGPathDefinition(d=s.toString()).getPoints().tolist())
+    assert(d.getSubpath(1).getPoints().tolist() == [[1, 1], [3, 1], [1, 1]])
+
+    # The index is updated, when the commands change
+    d.setCommand(7, ["L", 6, 6])
+    assert(d.getNumSubpaths() == 3)
+    assert(d.getSubpath(-1).toString() == "M 1 1 l 1 1 L 6 6 h 1")
+
+
+def testStreaming():
+    s = "M1 2L3-4.5e1 5,6 h-1.5.5 v1 z m 1 1 c 1 1 2 2 3 3 s 1 1 2 2 q 1 1 2 2 t 1 1 a 1 1 0 01 1 1 Z L 2 2"
+    d = SVGPathDefinition(d=s)
+    reference = [(c.m[0], c.m[1:], c.getStartpoint().tolist(), c.getEndpoint().tolist()) for c in d]
+    assert(len(reference) == 15)
+
+    # Chunks may split numbers and commands anywhere
+    for size in range(1, 12):
+        chunks = [s[i:i+size] for i in range(0, len(s), size)]
+        commands = [(c, args, list(start), list(end)) for (c, args, start, end) in iterPathCommands(chunks)]
+        assert(commands == reference)
+    assert(len(list(iterPathCommands(io.StringIO(s), chunkSize=5))) == 15)
+    assert(list(iterPathCommands(s))[1] == ("L", [3.0, -45.0], (1.0, 2.0), (3.0, -45.0)))
+
+    # Syntax errors are raised, but only when reached
+    commands = iterPathCommands(["M 1 1 L 2", " 2 x 1"])
+    assert(next(commands)[0] == "M")
+    assert(next(commands)[0] == "L")
+    try:
+        next(commands)
+        assert(False)
+    except SyntaxError:
+        pass
+    try:
+        list(iterPathCommands(["M 1 1 L 2"]))
+        assert(False)
+    except SyntaxError:
+        pass
+
+
 def testSerialization():
     for s in ["M 1.0 2.0", "C 1.0 2.0 3.0 4.0 5.0 6.0"]:
         d = SVGPathDefinition(path=None, d=s, debug=True)
         assert(str(d) == s)
 
+    # Arc flags are written as "0" or "1", even if given as other numbers
+    d = SVGPathDefinition(d="M 0.5 0 A 5 5 30 1.0 0 10 0.5 a 1 2 0 2 1 3 4", debug=True)
+    assert(d.toString() == "M 0.5 0 A 5 5 30 1 0 10 0.5 a 1 2 0 1 1 3 4")
+    assert(str(d.getCommand(1)) == "A 5 5 30 1 0 10 0.5")
+    assert(SVGPathDefinition(d=d.toString()).args.tolist() == [0.5, 0, 5, 5, 30, 1, 0, 10, 0.5, 1, 2, 0, 1, 1, 3, 4])
+
 
 def testTransformation():
     # The path definition
@@ -70,6 +313,93 @@ def testTransformation():
     assert(not (False in (d.getCommand(0).getEndpoint()   == [6, 8])))
     assert(not (False in (d.getCommand(1).getStartpoint() == [6, 8])))
     assert(not (False in (d.getCommand(1).getEndpoint()   == [4, 6])))
+    assert(str(d) == "M 6 8 L 4 6")
+
+
+def testTransformationArguments():
+    # Relative coordinates are not translated; axis-aligned matrices keep H and V
+    d = SVGPathDefinition(d="M 1 1 h 2 V 3 c 1 0 1 1 0 1 a 2 1 0 0 1 -2 0 z", debug=True)
+    d.transform(SVGMatrix(a=2, d=3, e=1, f=1))
+    assert(d.toString() == "M 3 4 h 4 V 10 c 2 0 2 3 0 3 a 4 3 0 0 1 -4 0 z")
+    assert(d.getPoints().tolist() == [[3, 4], [7, 4], [7, 10], [7, 13], [3, 13], [3, 4]])
+
+    # Rotation promotes H and V to lineto and rotates arcs
+    d = SVGPathDefinition(d="M 1 0 h 2 V 3 A 2 1 0 0 1 1 3", debug=True)
+    d.transform(SVGTransformList(parseFromString="rotate(90)").getSVGMatrix())
+    assert(len(d.args) == 2 + 2 + 2 + 7)
+    assert([chr(c) for c in d.opcodes] == ["M", "l", "L", "A"])
+    assert(np.allclose(d.args, [0, 1, 0, 2, -3, 3, 2, 1, 90, 0, 1, -3, 1]))
+    assert(np.allclose(d.getPoints(), [[0, 1], [0, 3], [-3, 3], [-3, 1]]))
+
+    # Mirroring reverses the sweep direction
+    d = SVGPathDefinition(d="M 0 0 A 1 1 0 0 1 2 0", debug=True)
+    d.transform(SVGMatrix(a=-1))
+    assert(np.allclose(d.args, [0, 0, 1, 1, 0, 0, 0, -2, 0]))
+    assert(np.allclose(d.getBounds(), [-2, -1, 0, 0]))
+
+    # The flags remain valid tokens, also for flags tolerated as other numbers
+    d = SVGPathDefinition(d="M 0 0 A 1 1 0 0 1 2 0 a 1 2 0 1 0 2 0 A 1 1 0 1 2 6 0", debug=True)
+    d.transform(SVGMatrix(a=-1, e=1))
+    assert(str(d) == "M 1 0 A 1 1 0 0 0 -1 0 a 2 1 90 1 1 -2 0 A 1 1 0 1 0 -5 0")
+
+    # A leading relative moveto is absolute and remains so in the string
+    d = SVGPathDefinition(d="m 10 10 l 5 0 a 1 1 0 0 1 2 0", debug=True)
+    d.transform(SVGMatrix(a=-1, e=100, f=1))
+    assert(str(d) == "M 90 11 l -5 0 a 1 1 0 0 0 -2 0")
+    assert(d.getPoints().tolist() == [[90, 11], [85, 11], [83, 11]])
+    assert(SVGPathDefinition(d=str(d)).getPoints().tolist() == d.getPoints().tolist())
+
+
+def testTransformPathDefinitions():
+    # All definitions at once equal one definition at a time
+    strings = [
+        "M 1 1 h 2 V 3 c 1 0 1 1 0 1 a 2 1 0 0 1 -2 0 z",
+        "M 1 0 h 2 V 3 A 2 1 0 0 1 1 3",
+        "",
+        "m 1 2 l 3 4 q 1 1 2 0 t 2 0 s 1 1 2 2 Z m 1 1 v 2",
+        "M 0 0 A 1 1 0 0 1 2 0 a 1 2 0 1 0 2 0",
+    ]
+    transforms = ["translate(1, 2) scale(2, 3)", "rotate(90)", "skewX(30)", "rotate(30) scale(-1, 2)", "scale(-1, 1)"]
+    matrices = [SVGTransformList(parseFromString=t).getSVGMatrix() for t in transforms]
+    for offset in range(len(strings)):
+        definitions = [SVGPathDefinition(d=s) for s in strings]
+        expected = [d.transform(matrices[(k + offset) % len(matrices)], inplace=False) for (k, d) in enumerate(definitions)]
+        transformPathDefinitions(definitions,
+            [matrices[(k + offset) % len(matrices)].getComponents() for k in range(len(definitions))])
+        for (d, e) in zip(definitions, expected):
+            assert(str(d) == str(e))
+            assert(np.allclose(d.args, e.args))
+            assert(np.allclose(d.vertices, e.vertices))
+            assert(np.allclose(d.origin, e.origin))
+            assert(np.allclose(d.getPoints(), e.getPoints()))
+
+    # The serialized paths reparse to the transformed points, also beginning with a relative moveto
+    rng = np.random.default_rng(2)
+    strings = ["m 10 10 l 5 0", "m 10 10 5 0 z m 1 2 h 3", "l 1 1 h 2", "M 1 2 m 3 4 l 1 1",
+        "m 0 0 c " + " ".join(["{:.3f}".format(x) for x in rng.normal(size=60)])]
+    transforms = ["translate(100, 0)", "matrix(0 1 1 0 3 3)", "scale(-1 2) translate(3 4)", "rotate(30, 5, 5)"]
+    for t in transforms:
+        matrix = SVGTransformList(parseFromString=t).getSVGMatrix()
+        definitions = [SVGPathDefinition(d=s) for s in strings]
+        expected = [matrix.applyToPoints(d.getPoints()) for d in definitions]
+        transformPathDefinitions(definitions, [matrix.getComponents()] * len(definitions))
+        for (d, e) in zip(definitions, expected):
+            assert(str(d)[0] == "M")
+            assert(np.allclose(d.getPoints()[-len(e):], e))
+            assert(np.allclose(SVGPathDefinition(d=str(d)).getPoints(), d.getPoints()))
+
+    # Identity matrices leave the definitions untouched
+    d = SVGPathDefinition(d="M 1 2 h 3")
+    args = d.args
+    transformPathDefinitions([d], [[1, 0, 0, 1, 0, 0]])
+    assert(d.args is args)
+
+    # One matrix per definition
+    try:
+        transformPathDefinitions([d], [])
+        assert(False)
+    except ValueError:
+        pass
 
 
 # def testSplitting():
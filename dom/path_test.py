@@ -1,8 +1,10 @@
 #!/usr/bin/python
 
+from .element import SVGElement
 from .path import SVGPath
 from .path_d import SVGPathDefinition
 from ..selecting.bbox import SVGBoundingBox
+from ..math.transform import SVGMatrix
 
 
 def testParsing():
@@ -16,11 +18,65 @@ def testParsing():
     assert(p.getD().getCommand(0).isMoveTo() == True)
 
 
+def testLazyParsing():
+    p = SVGPath(attributes = {"d": "M 2 1 L 5.2 3.4", "id": "p"})
+    assert(not p.isParsed())
+    assert(p.getId() == "p")
+    assert(str(p) == "<path d=\"M 2 1 L 5.2 3.4\" id=\"p\"/>")
+    assert(not p.isParsed())
+    assert(p.getMaxX() == 5.2)
+    assert(p.isParsed())
+
+    p.setD("M 0 0")
+    assert(not p.isParsed())
+    assert(len(p) == 1)
+
+
 def testSerialization():
+    # Unmodified path definitions are exported verbatim
     p = SVGPath(attributes = {"d": "M 2 1 L 5.2 3.4"})
     assert(len(p) == 2)
     assert(type(p.getD()) is SVGPathDefinition)
-    assert(str(p) == "<path d=\"M 2.0 1.0 L 5.2 3.4\"/>")
+    assert(str(p) == "<path d=\"M 2 1 L 5.2 3.4\"/>")
+
+    # Modified path definitions are exported from the parsed commands
+    m = SVGMatrix(e=1, f=2)
+    p.getD().transform(m)
+    assert(str(p) == "<path d=\"{:s}\"/>".format(p.getD().toString()))
+
+
+def testSplit():
+    g = SVGElement()
+    p = SVGPath(parent=g, attributes = {"d": "m 1 1 h 2 v 2 z m 5 0 h 2 v 2 z", "id": "p", "fill": "none"})
+    g.addChild(SVGPath(parent=g))
+    g.addChild(p)
+    g.addChild(SVGPath(parent=g))
+
+    paths = p.breakApart()
+    assert(len(paths) == 2)
+    assert(g.getChildren()[1:3] == paths)
+    assert(len(g.getChildren()) == 4)
+    assert([q.getId() for q in paths] == ["p", "p-1"])
+    assert(paths[1].getAttribute("fill") == "none")
+    assert(paths[0].getD().toString() == "M 1 1 h 2 v 2 z")
+    assert(paths[1].getPoints().tolist() == [[6, 1], [8, 1], [8, 3], [6, 1]])
+
+    # Arcs are split with valid flags
+    p = SVGPath(attributes = {"d": "M 0 0 a 1 1 0 0 1 2 0 z m 4 0 A 1 2 0 1 0 6 0"})
+    assert([str(q.getD()) for q in p.split(modifyParentSVG=False)] == ["M 0 0 a 1 1 0 0 1 2 0 z", "M 4 0 A 1 2 0 1 0 6 0"])
+
+    # Without modifying the parent
+    p = SVGPath(attributes = {"d": "M 0 0 L 1 1 M 2 2 L 3 3"})
+    assert([q.getMaxX() for q in p.split(modifyParentSVG=False)] == [1, 3])
+
+
+def testContainsPoints():
+    # A circle and an unclosed triangle
+    p = SVGPath(attributes = {"d": "M 10 0 A 10 10 0 0 1 -10 0 A 10 10 0 0 1 10 0 z M 20 0 l 10 0 l 0 10"})
+    points = [[0, 0], [7, 7], [0, 9.5], [8, 8], [29, 1], [21, 5], [-20, 0]]
+    assert(p.containsPoints(points).tolist() == [True, True, True, False, True, False, False])
+    assert(p.containsPoints(points, fillRule="evenodd").tolist() == [True, True, True, False, True, False, False])
+    assert(SVGPath().containsPoints(points).tolist() == [False] * 7)
 
 
 def testMetrics():
@@ -54,7 +110,14 @@ def testBoundingBox():
     assert(b.touchesElement(p) == True)
     assert(p.touchesElement(b) == True)
 
-    # TODO: quadratic, ellipsoid, arc, etc.
+    # Curves and arcs extend beyond their endpoints
+    p = SVGPath(attributes = {"d": "M 0 0 C 0 4 10 4 10 0 Q 15 -10 20 0 A 5 5 0 0 1 30 0"})
+    assert(abs(p.getMinX() - 0) < 1e-9)
+    assert(abs(p.getMinY() + 5) < 1e-9)
+    assert(abs(p.getMaxX() - 30) < 1e-9)
+    assert(abs(p.getMaxY() - 3) < 1e-9)
+    b = SVGBoundingBox(minX=0, minY=-1, maxX=30, maxY=3)
+    assert(b.containsElement(p) == False)
 
 
 # def testSplitting():
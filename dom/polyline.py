@@ -0,0 +1,106 @@
+#!/usr/bin/python
+#
+# SVG polylines and polygons
+#
+
+import numpy as np
+
+from .element import SVGElement
+from ..math.number import formatNumbers
+from ..selecting.bbox import SVGBoundingBoxMixin
+
+
+#
+# Objects of this class are created
+# for every <polyline/> element encountered in an SVG
+#
+# The points are kept as string until they are accessed.
+#
+class SVGPolyline(SVGElement, SVGBoundingBoxMixin):
+    __slots__ = ("points",)
+
+    def __init__(self, svg=None, parent=None, tag="polyline", attributes={}, debug=False):
+        SVGElement.__init__(self, svg=svg, parent=parent, tag=tag, attributes=attributes, debug=debug)
+        self.points = None
+
+    #
+    # Return the points as NumPy array of shape (n, 2)
+    #
+    # An odd number of coordinates is an error, which, as in browsers,
+    # only discards the last coordinate.
+    #
+    def getPoints(self):
+        if self.points is None:
+            numbers = self.getNumbers("points")
+            if numbers is None:
+                numbers = np.empty(0)
+            if len(numbers) % 2 != 0:
+                print("Warning: Ignoring the last of an odd number of coordinates in <{:s}>".format(self.getTag()))
+                numbers = numbers[:-1]
+            self.points = numbers.reshape((-1, 2))
+        return self.points
+
+    #
+    # Update the points given as array of shape (n, 2)
+    #
+    def setPoints(self, points):
+        points = np.asarray(points, dtype=np.float64).reshape((-1, 2))
+        numbers = formatNumbers(points.ravel().tolist())
+        self.setAttribute("points", " ".join([x + "," + y for (x, y) in zip(numbers[0::2], numbers[1::2])]))
+        self.points = points
+
+    # Parse the points again, if they are modified as string
+    def setAttribute(self, key, value):
+        SVGElement.setAttribute(self, key, value)
+        if key == "points":
+            self.points = None
+
+    # Return the number of points
+    def __len__(self):
+        return len(self.getPoints())
+
+    #
+    # Return the bounding box of the points
+    # as array of min x, min y, max x and max y
+    #
+    def getBounds(self):
+        points = self.getPoints()
+        if len(points) == 0:
+            raise ValueError("<{:s}> without points has no bounding box".format(self.getTag()))
+        return np.concatenate([points.min(axis=0), points.max(axis=0)])
+
+    #
+    # Return the bounding box in document coordinates, i.e. transformed by the CTM
+    #
+    def getDocumentBounds(self):
+        bounds = self.getBounds()
+        ctm = self.getCTM()
+        if ctm.isAxisAligned():
+            return ctm.applyToBounds(bounds)
+        points = ctm.applyToPoints(self.getPoints())
+        return np.concatenate([points.min(axis=0), points.max(axis=0)])
+
+    #
+    # Overload some getters of SVGBoundingBoxMixin
+    #
+    def getMinX(self):
+        return self.getBounds()[0]
+
+    def getMinY(self):
+        return self.getBounds()[1]
+
+    def getMaxX(self):
+        return self.getBounds()[2]
+
+    def getMaxY(self):
+        return self.getBounds()[3]
+
+
+#
+# A polygon is a closed polyline
+#
+class SVGPolygon(SVGPolyline):
+    __slots__ = ()
+
+    def __init__(self, svg=None, parent=None, attributes={}, debug=False):
+        SVGPolyline.__init__(self, svg=svg, parent=parent, tag="polygon", attributes=attributes, debug=debug)
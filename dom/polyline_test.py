@@ -0,0 +1,38 @@
+#!/usr/bin/python3
+
+import numpy as np
+
+from .polyline import SVGPolyline, SVGPolygon
+from ..io.svgreader import SVGReader
+
+
+def testPoints():
+    e = SVGPolyline(attributes={"points": "0,0 10,0 10,5-1-2 7"})
+    print("Warning expected:")
+    assert(e.getPoints().tolist() == [[0, 0], [10, 0], [10, 5], [-1, -2]])
+    assert(len(e) == 4)
+    assert(e.getBounds().tolist() == [-1, -2, 10, 5])
+    e.setAttribute("points", "1 1")
+    assert(e.getPoints().tolist() == [[1, 1]])
+    e.setPoints([[0.1, 2], [3, 4]])
+    assert(str(e) == "<polyline points=\"0.1,2 3,4\"/>")
+    e.setPoints(np.array([[1e-05, -0.5]]))
+    assert(e.getAttribute("points") == "1e-05,-0.5")
+
+
+def testReader():
+    dom = SVGReader(fromString="<svg viewBox=\"0,0 100 50\"><polygon points=\"0 0 1 0 1 1\"/><polyline/></svg>")
+    assert(dom.getChild(0).getViewBox().tolist() == [0, 0, 100, 50])
+    polygons = dom.find("polygon")
+    assert(len(polygons) == 1)
+    assert(type(polygons[0]) is SVGPolygon)
+    assert(polygons[0].getMaxY() == 1)
+    assert(len(dom.find("polyline")[0].getPoints()) == 0)
+
+
+def testDocumentBounds():
+    dom = SVGReader(fromString="<svg><g transform=\"scale(2 -1)\"><polyline points=\"0,0 1,1 2,0\"/>"
+        "<polygon transform=\"rotate(45)\" points=\"0,0 1,0 1,1 0,1\"/></g></svg>")
+    (polyline, polygon) = dom.find("polyline") + dom.find("polygon")
+    assert(polyline.getDocumentBounds().tolist() == [0, -1, 4, 0])
+    assert(np.allclose(polygon.getDocumentBounds(), [-np.sqrt(2), -np.sqrt(2), np.sqrt(2), 0]))
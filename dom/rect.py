@@ -3,36 +3,33 @@
 # SVG rectangles
 #
 
+import numpy as np
+
 from .element import SVGElement
-from ..selecting.bbox import SVGBoundingBox
+from .path_d import SVGPathDefinition, svgPathDArgumentCountByOpcode
+from ..math.number import parseNumber, formatNumbers
+from ..selecting.bbox import SVGBoundingBoxMixin
+
 
+class SVGRect(SVGElement, SVGBoundingBoxMixin):
+    __slots__ = ("x", "y", "width", "height", "rx", "ry")
 
-class SVGRect(SVGElement, SVGBoundingBox):
     #
     # TODO: Add support for transformed element or parents
     #
     def __init__(self, svg=None, parent=None, attributes={}, debug=False):
         SVGElement.__init__(self, svg=svg, parent=parent, tag="rect", attributes=attributes, debug=debug)
+        self.parseGeometry()
 
-        x = 0.0
-        if "x" in attributes.keys():
-            x = attributes["x"]
-        self.x = float(x)
-
-        y = 0.0
-        if "y" in attributes.keys():
-            y = attributes["y"]
-        self.y = float(y)
-
-        width = 0.0
-        if "width" in attributes.keys():
-            width = attributes["width"]
-        self.width = float(width)
-
-        height = 0.0
-        if "height" in attributes.keys():
-            height = attributes["height"]
-        self.height = float(height)
+    #
+    # Parse position, size and corner radii from the attributes
+    #
+    def parseGeometry(self):
+        attributes = self.attributes
+        self.x = parseNumber(attributes.get("x", 0.0))
+        self.y = parseNumber(attributes.get("y", 0.0))
+        self.width = parseNumber(attributes.get("width", 0.0))
+        self.height = parseNumber(attributes.get("height", 0.0))
 
         # Width and height shall not be negative
         if self.width < 0.0:
@@ -42,10 +39,96 @@ class SVGRect(SVGElement, SVGBoundingBox):
             self.y += self.height
             self.height *= -1.0
 
-        # Calculate bounding box in absolute coordinates
-        self.bottomLeftRelative = (self.x, self.y)
-        self.topRightRelative   = (self.x+self.width, self.y+self.height)
-        # self.bottomLeftAbsolute = self.bottomLeftRelative * self.getCTM()
-        # self.topRightAbsolute   = self.topRightRelative * self.getCTM()
-        # (self.minX, self.minY) = self.bottomLeftAbsolute
-        # (self.maxX, self.maxY) = self.topRightAbsolute
+        # A missing radius equals the other one; both are limited to half the size
+        rx = attributes.get("rx")
+        ry = attributes.get("ry")
+        if rx is None:
+            rx = ry
+        if ry is None:
+            ry = rx
+        self.rx = 0.0 if (rx is None) else min(abs(parseNumber(rx)), self.width / 2.0)
+        self.ry = 0.0 if (ry is None) else min(abs(parseNumber(ry)), self.height / 2.0)
+
+    #
+    # Return the bounding box in the rectangle's own coordinate system
+    # as array of min x, min y, max x and max y
+    #
+    def getBounds(self):
+        return np.array([self.x, self.y, self.x + self.width, self.y + self.height], dtype=np.float64)
+
+    #
+    # Overload the getters of SVGBoundingBoxMixin,
+    # which are calculated instead of stored to keep rectangles small
+    #
+    def getMinX(self):
+        return self.x
+
+    def getMinY(self):
+        return self.y
+
+    def getMaxX(self):
+        return self.x + self.width
+
+    def getMaxY(self):
+        return self.y + self.height
+
+    #
+    # Update position, size and corner radii
+    #
+    def setGeometry(self, x, y, width, height, rx=0.0, ry=0.0):
+        attributes = dict(self.attributes)
+        values = [float(value) for value in [x, y, width, height, rx, ry]]
+        for (key, value, s) in zip(["x", "y", "width", "height", "rx", "ry"], values, formatNumbers(values)):
+            if (key in ["rx", "ry"]) and (value == 0.0):
+                attributes.pop(key, None)
+            else:
+                attributes[key] = s
+        self.attributes = attributes
+        self.parseGeometry()
+
+    #
+    # Return the bounding box in document coordinates, i.e. transformed by the CTM,
+    # as array of min x, min y, max x and max y
+    #
+    # Only rotated or skewed rectangles with rounded corners need their outline.
+    #
+    def getDocumentBounds(self):
+        ctm = self.getCTM()
+        if ctm.isAxisAligned() or (self.rx == 0.0) or (self.ry == 0.0):
+            return ctm.applyToBounds(self.getBounds())
+        return self.toPathDefinition().transform(ctm).getBounds()
+
+    #
+    # Return the rectangle's corners in its own coordinate system
+    # as array of shape (4, 2) in counter-clockwise order (y axis pointing up)
+    #
+    def getCorners(self):
+        (x0, y0) = (self.x, self.y)
+        (x1, y1) = (self.x + self.width, self.y + self.height)
+        return np.array([[x0, y0], [x1, y0], [x1, y1], [x0, y1]], dtype=np.float64)
+
+    #
+    # Return an equivalent path definition,
+    # with elliptical arcs for rounded corners
+    # See: https://www.w3.org/TR/SVG11/shapes.html#RectElement
+    #
+    # The commands are built as arrays, without formatting and parsing a string.
+    #
+    def toPathDefinition(self, path=None):
+        (x, y, w, h, rx, ry) = (self.x, self.y, self.width, self.height, self.rx, self.ry)
+        if (rx == 0.0) or (ry == 0.0):
+            commands = "MHVHZ"
+            args = [x, y, x + w, y + h, x]
+        else:
+            commands = "MHAVAHAVAZ"
+            args = [x + rx, y, x + w - rx,
+                rx, ry, 0, 0, 1, x + w, y + ry, y + h - ry,
+                rx, ry, 0, 0, 1, x + w - rx, y + h, x + rx,
+                rx, ry, 0, 0, 1, x, y + h - ry, y + ry,
+                rx, ry, 0, 0, 1, x + rx, y]
+        opcodes = np.frombuffer(commands.encode("ascii"), dtype=np.uint8)
+        offsets = np.zeros(len(opcodes) + 1, dtype=np.intp)
+        np.cumsum(svgPathDArgumentCountByOpcode[opcodes], out=offsets[1:])
+        d = SVGPathDefinition(path=path, debug=self.debug)
+        d.setCommands(opcodes, offsets, args)
+        return d
@@ -0,0 +1,28 @@
+#!/usr/bin/python3
+
+import numpy as np
+
+from .rect import SVGRect
+
+
+def testPathDefinition():
+    rect = SVGRect(attributes={"x": "1", "y": "2", "width": "4", "height": "2"})
+    assert(str(rect.toPathDefinition()) == "M 1 2 H 5 V 4 H 1 Z")
+    assert(rect.toPathDefinition().getBounds().tolist() == rect.getBounds().tolist())
+
+    # Rounded corners are arcs, whose radii are limited to half the size
+    rect = SVGRect(attributes={"x": "1", "y": "2", "width": "4", "height": "2", "rx": "1.5", "ry": "3"})
+    assert((rect.rx, rect.ry) == (1.5, 1))
+    assert(str(rect.toPathDefinition()) == "M 2.5 2 H 3.5 A 1.5 1 0 0 1 5 3 V 3 A 1.5 1 0 0 1 3.5 4 H 2.5 "
+        "A 1.5 1 0 0 1 1 3 V 3 A 1.5 1 0 0 1 2.5 2 Z")
+    assert(np.allclose(rect.toPathDefinition().getBounds(), [1, 2, 5, 4]))
+
+
+def testSetGeometry():
+    # Numbers are written like in path definitions
+    rect = SVGRect(attributes={"x": "1", "y": "2", "width": "4", "height": "2", "rx": "1"})
+    rect.setGeometry(10, 0.5, np.float64(4), 2.25)
+    assert([rect.getAttribute(key) for key in ["x", "y", "width", "height", "rx", "ry"]] == ["10", "0.5", "4", "2.25", None, None])
+    rect.setGeometry(1, 2, 3, 4, rx=0.5, ry=1)
+    assert((rect.getAttribute("rx"), rect.getAttribute("ry")) == ("0.5", "1"))
+    assert(rect.getBounds().tolist() == [1, 2, 4, 6])
@@ -1,19 +1,34 @@
 #!/usr/bin/python3
 
+import sys
+from types import MappingProxyType
+
 from ..selecting.jquery import jQuerySelector, jQueryFilter
 
 
+# Elements without attributes or children share these read-only ones,
+# until an attribute is set or a child is added
+emptyAttributes = MappingProxyType({})
+emptyChildren = ()
+
+
 #
 # A super-class for the more XML/DOM-related methods
 #
+# Documents may consist of millions of elements, which therefore have no __dict__:
+# subclasses declare the attributes they add in __slots__.
+#
 class XMLElement:
+    __slots__ = ("debug", "documentRoot", "parentElement", "tag", "attributes", "children")
+
     def __init__(self, root=None, parent=None, tag="xml", attributes={}, debug=False):
         self.debug = debug
         self.documentRoot = root
         self.parentElement = parent
-        self.tag = tag
-        self.attributes = dict(attributes)
-        self.children = []
+        # All elements with the same tag share a single string
+        self.tag = sys.intern(tag) if (type(tag) is str) else tag
+        self.attributes = dict(attributes) if len(attributes) > 0 else emptyAttributes
+        self.children = emptyChildren
 
     def isRootNode(self):
         # if self.parentElement is None:
@@ -71,11 +86,13 @@ class XMLElement:
         return None
 
     def setAttribute(self, key, value):
-        if self.attributes is None:
+        if (self.attributes is None) or (self.attributes is emptyAttributes):
             self.attributes = {}
         self.attributes[key] = value
 
     def deleteAttribute(self, key):
+        if self.attributes is emptyAttributes:
+            raise KeyError(key)
         self.attributes.pop(key)
 
     def getDocumentRoot(self):
@@ -91,6 +108,8 @@ class XMLElement:
         return self.children[index]
 
     def addChild(self, element):
+        if self.children is emptyChildren:
+            self.children = []
         self.children.append(element)
 
     def getElementList(self, recursionDepth=0):
@@ -109,17 +128,7 @@ class XMLElement:
         return len(self.getElementList())
 
     def __iter__(self):
-        self.iterIndex = 0
-        self.iterElementList = self.getElementList()
-        return self
-
-    def __next__(self):
-        if self.iterIndex >= len(self.iterElementList):
-            raise StopIteration
-        else:
-            element = self.iterElementList[self.iterIndex]
-            self.iterIndex += 1
-            return element
+        return iter(self.getElementList())
 
     #
     # Use a selector to find matching elements
@@ -6,10 +6,19 @@
 
 import sys, os
 import xml.sax
+import numpy as np
 
 from ..dom.element import SVGElement
 from ..dom.path import SVGPath
+from ..dom.path_d import SVGPathDefinition, transformPathDefinitions
 from ..dom.rect import SVGRect
+from ..dom.polyline import SVGPolyline, SVGPolygon
+from ..math.transform import SVGMatrix, classifyMatrices, applyMatricesToPoints, svgMatrixIdentity, svgMatrixGeneral
+
+
+# The commands of a rectangle transformed to a polygon of its corners: M L L L Z
+rectPolygonOpcodes = np.array([ord(c) for c in "MLLLZ"], dtype=np.uint8)
+rectPolygonOffsets = np.array([0, 2, 4, 6, 8, 8], dtype=np.intp)
 
 
 #
@@ -73,6 +82,118 @@ class SVGReader(xml.sax.ContentHandler, SVGElement):
         self.fromFile(filename)
         os.remove(filename)
 
+    #
+    # Simplify all paths of the document, see SVGPathDefinition.simplify()
+    #
+    # Returns the total number of points before and after simplification.
+    #
+    def simplifyPaths(self, tolerance=0.1):
+        before = 0
+        after = 0
+        for e in self.getElementList():
+            if not isinstance(e, SVGPath):
+                continue
+            d = e.getD()
+            if d is None:
+                continue
+            before += len(d.getPoints())
+            d.simplify(tolerance)
+            after += len(d.getPoints())
+        if self.debug:
+            print("Simplified paths from {:d} to {:d} points".format(before, after))
+        return (before, after)
+
+    #
+    # Apply all transformations to the coordinates of the elements and remove the transform attributes
+    #
+    # The CTMs of all elements are calculated in a single pass (see SVGElement.calculateCTMs()),
+    # then every path, polyline, polygon and rect is transformed by its CTM at once.
+    # Rects remain rects, if their CTM is axis-aligned; otherwise they are replaced by equivalent paths.
+    # Other elements without children, e.g. texts, cannot be flattened;
+    # their CTM becomes their transform attribute instead.
+    # Stroke widths are not scaled.
+    #
+    # Returns the number of elements, whose coordinates were transformed.
+    #
+    def flattenTransforms(self):
+        (elements, ctms) = self.calculateCTMs()
+        kinds = classifyMatrices(ctms)
+        replacements = {}
+        parents = {}
+        paths = []
+        polylines = []
+        flattened = 0
+        for (element, ctm, kind) in zip(elements, ctms.tolist(), kinds.tolist()):
+            if kind == svgMatrixIdentity:
+                # Nothing to transform, only nested transformations cancelling out
+                if "transform" in element.attributes:
+                    element.deleteAttribute("transform")
+                continue
+            (a, b, c, d, e, f) = ctm
+            if isinstance(element, SVGPath):
+                # Transformed all at once below
+                definition = element.getD()
+                if not (definition is None):
+                    paths.append((definition, ctm))
+                    flattened += 1
+            elif isinstance(element, SVGPolyline):
+                # Transformed all at once below
+                if len(element.getPoints()) > 0:
+                    polylines.append((element, ctm))
+                    flattened += 1
+            elif isinstance(element, SVGRect) and (kind != svgMatrixGeneral):
+                (x0, y0) = (a * element.x + e, d * element.y + f)
+                (x1, y1) = (x0 + a * element.width, y0 + d * element.height)
+                element.setGeometry(min(x0, x1), min(y0, y1), abs(x1 - x0), abs(y1 - y0),
+                    abs(a) * element.rx, abs(d) * element.ry)
+                flattened += 1
+            elif isinstance(element, SVGRect):
+                matrix = SVGMatrix(a, b, c, d, e, f, debug=self.debug)
+                attributes = dict(element.attributes)
+                for key in ["x", "y", "width", "height", "rx", "ry", "transform"]:
+                    attributes.pop(key, None)
+                path = SVGPath(svg=self, parent=element.parentElement, attributes=attributes, debug=self.debug)
+                if (element.rx == 0.0) or (element.ry == 0.0):
+                    # A polygon of the transformed corners
+                    corners = matrix.applyToPoints(element.getCorners(), inplace=True)
+                    definition = SVGPathDefinition(path=path, debug=self.debug)
+                    definition.setCommands(rectPolygonOpcodes, rectPolygonOffsets, corners.ravel())
+                else:
+                    definition = element.toPathDefinition(path=path).transform(matrix)
+                path.setAttribute("d", definition)
+                replacements[id(element)] = path
+                parents[id(element.parentElement)] = element.parentElement
+                flattened += 1
+            elif (len(element.children) == 0) and (element is not self):
+                element.setAttribute("transform", "matrix({} {} {} {} {} {})".format(a, b, c, d, e, f))
+                continue
+            if "transform" in element.attributes:
+                element.deleteAttribute("transform")
+
+        for parent in parents.values():
+            parent.children = [replacements.get(id(child), child) for child in parent.children]
+
+        if len(paths) > 0:
+            transformPathDefinitions([definition for (definition, ctm) in paths], [ctm for (definition, ctm) in paths])
+
+        if len(polylines) > 0:
+            points = [element.getPoints() for (element, ctm) in polylines]
+            offsets = np.zeros(len(points) + 1, dtype=np.intp)
+            np.cumsum([len(p) for p in points], out=offsets[1:])
+            points = applyMatricesToPoints([ctm for (element, ctm) in polylines], np.vstack(points), offsets, inplace=True)
+            for (k, (element, ctm)) in enumerate(polylines):
+                element.setPoints(points[offsets[k]:offsets[k+1]])
+
+        # The parsed transformations and CTMs are outdated
+        for element in elements:
+            element.parsedTransform = None
+            element.ctm = None
+            element.ctmOwner = None
+            element.ctmIndex = None
+        if self.debug:
+            print("Flattened the transformations of {:d} elements".format(flattened))
+        return flattened
+
     #
     # Reset XML parser
     #
@@ -109,11 +230,17 @@ class SVGReader(xml.sax.ContentHandler, SVGElement):
         elif tag == "rect":
             # <rect .../>
             e = SVGRect(svg=self, parent=parent, attributes=attributes, debug=self.debug)
+        elif tag == "polyline":
+            # <polyline points="..."/>
+            e = SVGPolyline(svg=self, parent=parent, attributes=attributes, debug=self.debug)
+        elif tag == "polygon":
+            # <polygon points="..."/>
+            e = SVGPolygon(svg=self, parent=parent, attributes=attributes, debug=self.debug)
         else:
             # Generic element without children
             e = SVGElement(svg=self, parent=parent, tag=tag, attributes=attributes, debug=self.debug)
 
-        parent.children.append(e)
+        parent.addChild(e)
 
     #
     # XML parser callback: an elements ends
@@ -1,6 +1,7 @@
 #!/usr/bin/python3
 
 import os
+import numpy as np
 
 from ..io.svgreader import SVGReader
 from ..dom.element import SVGElement
@@ -55,3 +56,56 @@ def test_file_export():
 
     # Compare
     assert(sIn == sOut)
+
+
+def test_simplify_paths():
+    sIn = "<svg><path d=\"M 0 0 L 1 0 L 2 0 L 2 2\"/><g><path d=\"M 0 0 h 1 h 1 h 1\"/></g><path/></svg>"
+    dom = SVGReader(fromString=sIn)
+    assert(dom.simplifyPaths(0.1) == (8, 5))
+    assert(str(dom.find("path")[1].getD()) == "M 0 0 l 3 0")
+
+
+def test_flatten_transforms():
+    dom = SVGReader(fromString="<svg><g transform=\"translate(10, 20)\"><g transform=\"rotate(90)\">"
+        + "<path d=\"M 1 0 h 1 a 1 2 0 0 1 1 1 z\"/><rect x=\"0\" y=\"0\" width=\"2\" height=\"1\"/><polyline points=\"1,0 2,0\"/></g>"
+        + "<rect x=\"1\" y=\"1\" width=\"2\" height=\"1\" rx=\"0.5\" transform=\"scale(-2, 3)\"/>"
+        + "<polygon points=\"0,0 1,0 1,1\"/><text transform=\"rotate(90)\"/>"
+        + "<path d=\"m 1 2 3 0 c 1 0 1 1 0 1 z m 5 5 h 1\"/></g><text/></svg>")
+    elements = dom.getElementList()
+    ctms = dict([(id(e), e.getCTM()) for e in elements])
+    path = dom.find("path")[0]
+    expected = ctms[id(path)].applyToPoints(path.getPoints())
+    (rect, rectAligned) = dom.find("rect")
+    corners = ctms[id(rect)].applyToPoints(rect.getCorners())
+    polygon = dom.find("polygon")[0]
+    text = dom.find("text")[0]
+    relativePath = dom.find("path")[1]
+    relativeExpected = relativePath.getPoints() + [10, 20]
+
+    assert(dom.flattenTransforms() == 6)
+    assert(np.allclose(path.getPoints(), expected))
+    assert(np.allclose(polygon.getPoints(), [[10, 20], [11, 20], [11, 21]]))
+
+    # The path beginning with a relative moveto is serialized with its translation
+    assert(str(relativePath.getD()) == "M 11 22 l 3 0 c 1 0 1 1 0 1 z m 5 5 h 1")
+    reread = SVGReader(fromString="<svg><path d=\"{:s}\"/></svg>".format(str(relativePath.getD())))
+    assert(np.allclose(reread.find("path")[0].getPoints(), relativeExpected))
+    assert(np.allclose(dom.find("polyline")[0].getPoints(), [[10, 21], [10, 22]]))
+
+    # The rotated rect was replaced by a path, the scaled one remains a rect
+    assert(dom.find("rect") == [rectAligned])
+    assert((rectAligned.x, rectAligned.y, rectAligned.width, rectAligned.height) == (4, 23, 4, 3))
+    assert((rectAligned.rx, rectAligned.ry) == (1, 1.5))
+    rectPath = dom.find("path")[1]
+    assert(str(rectPath.getD()) == "M 10 20 L 10 22 L 9 22 L 9 20 Z")
+    assert(np.allclose(np.unique(rectPath.getPoints(), axis=0), np.unique(corners, axis=0)))
+    assert(np.allclose(rectPath.getBounds(), [9, 20, 10, 22]))
+
+    # The text keeps its transformation
+    assert(text.getAttribute("transform") == "matrix(6.123233995736766e-17 1.0 -1.0 6.123233995736766e-17 10.0 20.0)")
+    assert(dom.find("text")[1].getAttribute("transform") is None)
+    for e in dom.getElementList():
+        if e.getTag() != "text":
+            assert(e.getAttribute("transform") is None)
+            assert(e.getCTM().getComponents() == (1, 0, 0, 1, 0, 0))
+    assert(np.allclose(text.getCTM().getMatrix(), ctms[id(text)].getMatrix()))
@@ -0,0 +1,307 @@
+#!/usr/bin/python3
+#
+# Vectorized geometry of Bezier curves and elliptical arcs
+#
+# Cubic Bezier curves are given as NumPy arrays of shape (n, 4, 2)
+# holding the control points of n curves.
+#
+# Elliptical arcs are given in center parameterization
+# as NumPy arrays of shape (n, 7) with the columns:
+#  center x, center y, radius x, radius y, x-axis rotation (radians), start angle, sweep angle
+# See also:
+#  https://www.w3.org/TR/SVG11/implnote.html#ArcImplementationNotes
+#
+
+import numpy as np
+
+
+#
+# Return the cubic Bezier curves equivalent to straight lines
+#
+def lineToCubic(p0, p1):
+    p0 = np.asarray(p0, dtype=np.float64)
+    d = np.asarray(p1, dtype=np.float64) - p0
+    return np.stack([p0, p0 + d / 3.0, p0 + d * (2.0 / 3.0), p0 + d], axis=1)
+
+
+#
+# Return the cubic Bezier curves equivalent to quadratic Bezier curves
+# (degree elevation)
+#
+def quadraticToCubic(p0, p1, p2):
+    p0 = np.asarray(p0, dtype=np.float64)
+    p1 = np.asarray(p1, dtype=np.float64)
+    p2 = np.asarray(p2, dtype=np.float64)
+    return np.stack([p0, p0 + (p1 - p0) * (2.0 / 3.0), p2 + (p1 - p2) * (2.0 / 3.0), p2], axis=1)
+
+
+#
+# Evaluate every curve at its own parameter t
+#
+def evaluateCubic(controls, t):
+    t = np.asarray(t, dtype=np.float64)[:, None]
+    mt = 1.0 - t
+    return (mt * mt * mt) * controls[:, 0] \
+        + (3.0 * mt * mt * t) * controls[:, 1] \
+        + (3.0 * mt * t * t) * controls[:, 2] \
+        + (t * t * t) * controls[:, 3]
+
+
+#
+# Return the derivative of every curve with respect to t
+#
+# t has the shape (n,) or (n, k) for k parameters per curve.
+#
+def cubicDerivative(controls, t):
+    t = np.asarray(t, dtype=np.float64)
+    shape = (len(controls),) + (1,) * (t.ndim - 1) + (2,)
+    d0 = (controls[:, 1] - controls[:, 0]).reshape(shape)
+    d1 = (controls[:, 2] - controls[:, 1]).reshape(shape)
+    d2 = (controls[:, 3] - controls[:, 2]).reshape(shape)
+    t = t[..., None]
+    mt = 1.0 - t
+    return 3.0 * ((mt * mt) * d0 + (2.0 * mt * t) * d1 + (t * t) * d2)
+
+
+#
+# Return the nodes and weights of the Gauss-Legendre quadrature
+# of the given order on the interval [0, 1]
+#
+def gaussLegendre(order):
+    (x, w) = np.polynomial.legendre.leggauss(order)
+    return ((x + 1.0) / 2.0, w / 2.0)
+
+
+#
+# Integrate the norm of the derivative of every curve or arc from t0 to t1
+#
+def integrateSpeed(derivative, curves, t0, t1, order):
+    t0 = np.broadcast_to(np.asarray(t0, dtype=np.float64), (len(curves),))
+    t1 = np.broadcast_to(np.asarray(t1, dtype=np.float64), (len(curves),))
+    (x, w) = gaussLegendre(order)
+    h = t1 - t0
+    speed = np.linalg.norm(derivative(curves, t0[:, None] + h[:, None] * x), axis=2)
+    return h * speed.dot(w)
+
+
+#
+# Return the length of every curve between the parameters t0 and t1
+#
+def cubicLengths(controls, t0=0.0, t1=1.0, order=8):
+    return integrateSpeed(cubicDerivative, controls, t0, t1, order)
+
+
+#
+# Return the number of segments of equal parameter length,
+# which approximate each curve within the given tolerance (Wang's formula)
+#
+def cubicSubdivisions(controls, tolerance):
+    dd1 = np.linalg.norm(controls[:, 0] - 2.0 * controls[:, 1] + controls[:, 2], axis=1)
+    dd2 = np.linalg.norm(controls[:, 1] - 2.0 * controls[:, 2] + controls[:, 3], axis=1)
+    n = np.ceil(np.sqrt(0.75 * np.maximum(dd1, dd2) / tolerance))
+    return np.maximum(n, 1).astype(np.intp)
+
+
+#
+# Convert arcs from endpoint to center parameterization
+#
+# The angle of the x-axis rotation is given in degrees, as in path definitions.
+# Radii too small to connect the endpoints are scaled up.
+# Returns the arcs and a mask of the valid ones;
+# arcs with a zero radius or coinciding endpoints are to be treated as straight lines.
+#
+def arcFromEndpoints(p0, p1, rx, ry, angle, largeArc, sweep):
+    p0 = np.asarray(p0, dtype=np.float64)
+    p1 = np.asarray(p1, dtype=np.float64)
+    rx = np.abs(np.asarray(rx, dtype=np.float64))
+    ry = np.abs(np.asarray(ry, dtype=np.float64))
+    largeArc = np.asarray(largeArc)
+    sweep = np.asarray(sweep)
+    phi = np.radians(angle)
+    cos = np.cos(phi)
+    sin = np.sin(phi)
+
+    # Transform the midpoint into the ellipse's coordinate system
+    dx = (p0[:, 0] - p1[:, 0]) / 2.0
+    dy = (p0[:, 1] - p1[:, 1]) / 2.0
+    x1 = cos * dx + sin * dy
+    y1 = -sin * dx + cos * dy
+
+    valid = (rx > 0) & (ry > 0) & ((x1 != 0) | (y1 != 0))
+    rx = np.where(valid, rx, 1.0)
+    ry = np.where(valid, ry, 1.0)
+
+    # Correct out-of-range radii
+    scale = np.sqrt(np.maximum(x1 * x1 / (rx * rx) + y1 * y1 / (ry * ry), 1.0))
+    rx = rx * scale
+    ry = ry * scale
+
+    # The center
+    numerator = rx * rx * ry * ry - rx * rx * y1 * y1 - ry * ry * x1 * x1
+    denominator = np.where(valid, rx * rx * y1 * y1 + ry * ry * x1 * x1, 1.0)
+    coefficient = np.sqrt(np.maximum(numerator, 0.0) / denominator)
+    coefficient = np.where((largeArc != 0) == (sweep != 0), -coefficient, coefficient)
+    cx1 = coefficient * rx * y1 / ry
+    cy1 = -coefficient * ry * x1 / rx
+    cx = cos * cx1 - sin * cy1 + (p0[:, 0] + p1[:, 0]) / 2.0
+    cy = sin * cx1 + cos * cy1 + (p0[:, 1] + p1[:, 1]) / 2.0
+
+    # The angles
+    ux = (x1 - cx1) / rx
+    uy = (y1 - cy1) / ry
+    vx = (-x1 - cx1) / rx
+    vy = (-y1 - cy1) / ry
+    theta = np.arctan2(uy, ux)
+    delta = np.arctan2(ux * vy - uy * vx, ux * vx + uy * vy)
+    delta = np.where((sweep == 0) & (delta > 0), delta - 2.0 * np.pi, delta)
+    delta = np.where((sweep != 0) & (delta < 0), delta + 2.0 * np.pi, delta)
+
+    return (np.stack([cx, cy, rx, ry, phi, theta, delta], axis=1), valid)
+
+
+#
+# Evaluate every arc at the angle theta (radians)
+#
+def evaluateArcAngle(arcs, theta):
+    x = arcs[:, 2] * np.cos(theta)
+    y = arcs[:, 3] * np.sin(theta)
+    cos = np.cos(arcs[:, 4])
+    sin = np.sin(arcs[:, 4])
+    return np.stack([arcs[:, 0] + cos * x - sin * y, arcs[:, 1] + sin * x + cos * y], axis=1)
+
+
+#
+# Evaluate every arc at its own parameter t, i.e. the fraction of its sweep angle
+#
+def evaluateArc(arcs, t):
+    return evaluateArcAngle(arcs, arcs[:, 5] + np.asarray(t, dtype=np.float64) * arcs[:, 6])
+
+
+#
+# Return the derivative of every arc with respect to t,
+# i.e. the fraction of its sweep angle
+#
+# t has the shape (n,) or (n, k) for k parameters per arc.
+#
+def arcDerivative(arcs, t):
+    t = np.asarray(t, dtype=np.float64)
+    shape = (len(arcs),) + (1,) * (t.ndim - 1)
+    (rx, ry, phi, theta, delta) = [arcs[:, i].reshape(shape) for i in range(2, 7)]
+    angle = theta + t * delta
+    x = -rx * np.sin(angle) * delta
+    y = ry * np.cos(angle) * delta
+    cos = np.cos(phi)
+    sin = np.sin(phi)
+    return np.stack([cos * x - sin * y, sin * x + cos * y], axis=-1)
+
+
+#
+# Return the length of every arc between the parameters t0 and t1
+#
+def arcLengths(arcs, t0=0.0, t1=1.0, order=8):
+    return integrateSpeed(arcDerivative, arcs, t0, t1, order)
+
+
+#
+# Return the number of segments of equal angle,
+# which approximate each arc within the given tolerance
+#
+def arcSubdivisions(arcs, tolerance):
+    r = np.maximum(arcs[:, 2], arcs[:, 3])
+    step = 2.0 * np.arccos(np.clip(1.0 - tolerance / r, -1.0, 1.0))
+    n = np.ceil(np.abs(arcs[:, 6]) / np.maximum(step, 1e-9))
+    return np.maximum(n, 1).astype(np.intp)
+
+
+#
+# Return the parameters at which curves are to be sampled,
+# when curve i is subdivided into counts[i] segments
+#
+# Returns the curve index and the parameter t of every sample.
+# The curves' startpoints (t=0) are only sampled, where includeStart is true.
+#
+def subdivisionParameters(counts, includeStart=None):
+    counts = np.asarray(counts, dtype=np.intp)
+    samples = counts if (includeStart is None) else counts + includeStart
+    index = np.repeat(np.arange(len(counts)), samples)
+    first = np.cumsum(samples) - samples
+    j = np.arange(len(index)) - first[index]
+    if includeStart is None:
+        j += 1
+    else:
+        j += 1 - np.asarray(includeStart, dtype=np.intp)[index]
+    return (index, j / counts[index])
+
+
+#
+# Return the parameters of each curve's extrema along the x and y axis
+#
+# The result has the shape (n, 2, 2): curve, axis, root.
+# Where the derivative has fewer roots within (0, 1), NaN is returned.
+#
+def cubicExtrema(controls):
+    p0 = controls[:, 0]
+    p1 = controls[:, 1]
+    p2 = controls[:, 2]
+    p3 = controls[:, 3]
+    # The derivative divided by three: a t^2 + b t + c
+    a = -p0 + 3.0 * p1 - 3.0 * p2 + p3
+    b = 2.0 * (p0 - 2.0 * p1 + p2)
+    c = p1 - p0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Numerically stable roots, also for (almost) vanishing a
+        discriminant = b * b - 4.0 * a * c
+        q = -0.5 * (b + np.where(b < 0, -1.0, 1.0) * np.sqrt(np.maximum(discriminant, 0.0)))
+        t = np.stack([q / a, c / q], axis=2)
+    t[(discriminant < 0)[:, :, None] | ~((t > 0) & (t < 1))] = np.nan
+    return t
+
+
+#
+# Return the exact bounding box of every curve as (n, 4) array
+# with the columns min x, min y, max x, max y
+#
+def cubicBounds(controls):
+    t = cubicExtrema(controls)
+    mt = 1.0 - t
+    # Evaluate each axis at its own extrema
+    values = (mt * mt * mt) * controls[:, 0, :, None] \
+        + (3.0 * mt * mt * t) * controls[:, 1, :, None] \
+        + (3.0 * mt * t * t) * controls[:, 2, :, None] \
+        + (t * t * t) * controls[:, 3, :, None]
+    low = np.fmin(np.minimum(controls[:, 0], controls[:, 3]), np.fmin.reduce(values, axis=2))
+    high = np.fmax(np.maximum(controls[:, 0], controls[:, 3]), np.fmax.reduce(values, axis=2))
+    return np.hstack([low, high])
+
+
+#
+# Return the exact bounding box of every arc as (n, 4) array
+# with the columns min x, min y, max x, max y
+#
+def arcBounds(arcs):
+    rx = arcs[:, 2]
+    ry = arcs[:, 3]
+    cos = np.cos(arcs[:, 4])
+    sin = np.sin(arcs[:, 4])
+    # The angles of the ellipse's extrema along the x and y axis
+    thetaX = np.arctan2(-ry * sin, rx * cos)
+    thetaY = np.arctan2(ry * cos, rx * sin)
+    candidates = np.stack([thetaX, thetaX + np.pi, thetaY, thetaY + np.pi], axis=1)
+
+    # Only extrema within the swept angle count
+    theta = arcs[:, 5, None]
+    delta = arcs[:, 6, None]
+    swept = np.where(delta >= 0, np.mod(candidates - theta, 2.0 * np.pi), np.mod(theta - candidates, 2.0 * np.pi))
+    inside = swept <= np.abs(delta)
+
+    n = len(arcs)
+    ends = np.stack([evaluateArc(arcs, np.zeros(n)), evaluateArc(arcs, np.ones(n))], axis=1)
+    x = np.where(inside[:, :2], arcs[:, 0, None] + rx[:, None] * cos[:, None] * np.cos(candidates[:, :2])
+        - ry[:, None] * sin[:, None] * np.sin(candidates[:, :2]), np.nan)
+    y = np.where(inside[:, 2:], arcs[:, 1, None] + rx[:, None] * sin[:, None] * np.cos(candidates[:, 2:])
+        + ry[:, None] * cos[:, None] * np.sin(candidates[:, 2:]), np.nan)
+    low = np.stack([np.fmin(ends[:, :, 0].min(axis=1), np.fmin.reduce(x, axis=1)),
+        np.fmin(ends[:, :, 1].min(axis=1), np.fmin.reduce(y, axis=1))], axis=1)
+    high = np.stack([np.fmax(ends[:, :, 0].max(axis=1), np.fmax.reduce(x, axis=1)),
+        np.fmax(ends[:, :, 1].max(axis=1), np.fmax.reduce(y, axis=1))], axis=1)
+    return np.hstack([low, high])
@@ -0,0 +1,128 @@
+#!/usr/bin/python3
+
+import numpy as np
+
+from .curve import lineToCubic, quadraticToCubic, evaluateCubic, cubicDerivative, cubicSubdivisions, cubicExtrema, \
+    cubicBounds, cubicLengths, arcFromEndpoints, evaluateArc, arcDerivative, arcSubdivisions, arcBounds, arcLengths, \
+    subdivisionParameters
+
+
+def testCubicConversion():
+    c = lineToCubic([[0, 0]], [[3, 6]])
+    assert(c.tolist() == [[[0, 0], [1, 2], [2, 4], [3, 6]]])
+    assert(cubicSubdivisions(c, 0.1).tolist() == [1])
+
+    c = quadraticToCubic([[0, 0]], [[3, 3]], [[6, 0]])
+    t = np.array([0.25])
+    # Quadratic Bezier at t=0.25
+    assert(np.allclose(evaluateCubic(c, t), [[1.5, 1.125]]))
+
+
+def testCubicSubdivisions():
+    c = np.array([[[0, 0], [0, 100], [100, 100], [100, 0]], [[0, 0], [1, 1], [2, 1], [3, 0]]], dtype=np.float64)
+    for tolerance in [1.0, 0.1, 0.01]:
+        counts = cubicSubdivisions(c, tolerance)
+        # Deviation between each segment and the curve at equal parameters
+        for i in range(len(c)):
+            for k in range(counts[i]):
+                t = np.linspace(k / counts[i], (k+1) / counts[i], 20)
+                curve = evaluateCubic(np.repeat(c[i:i+1], 20, axis=0), t)
+                chord = curve[0] + (curve[-1] - curve[0]) * np.linspace(0, 1, 20)[:, None]
+                assert(np.linalg.norm(curve - chord, axis=1).max() <= tolerance)
+
+
+def testArcFromEndpoints():
+    # Half circle around (10, 5)
+    (arcs, valid) = arcFromEndpoints([[10, 0]], [[10, 10]], [5], [5], [0], [0], [1])
+    assert(valid.tolist() == [True])
+    assert(np.allclose(arcs, [[10, 5, 5, 5, 0, -np.pi/2, np.pi]]))
+    assert(np.allclose(evaluateArc(arcs, [0.5]), [[15, 5]]))
+
+    # Radii too small are scaled up, zero radii yield lines
+    (arcs, valid) = arcFromEndpoints([[0, 0], [0, 0]], [[10, 0], [10, 0]], [1, 0], [1, 5], [30, 0], [1, 0], [0, 0])
+    assert(valid.tolist() == [True, False])
+    assert(np.allclose(arcs[0, 2:4], [5, 5]))
+    assert(np.allclose(evaluateArc(arcs[:1], [0, 1]), [[0, 0], [10, 0]]))
+
+    # Large arc flag
+    (arcs, valid) = arcFromEndpoints([[0, 0]], [[10, 0]], [10], [10], [0], [1], [1])
+    assert(abs(arcs[0, 6]) > np.pi)
+
+
+def testArcSubdivisions():
+    (arcs, valid) = arcFromEndpoints([[10, 0]], [[10, 10]], [5], [5], [0], [0], [1])
+    for tolerance in [0.5, 0.01]:
+        n = arcSubdivisions(arcs, tolerance)[0]
+        # Sagitta of each segment
+        assert(5 * (1 - np.cos(np.pi / n / 2)) <= tolerance)
+
+
+def testSubdivisionParameters():
+    (index, t) = subdivisionParameters([2, 1, 4])
+    assert(index.tolist() == [0, 0, 1, 2, 2, 2, 2])
+    assert(t.tolist() == [0.5, 1, 1, 0.25, 0.5, 0.75, 1])
+
+    (index, t) = subdivisionParameters([2, 1], includeStart=[1, 0])
+    assert(index.tolist() == [0, 0, 0, 1])
+    assert(t.tolist() == [0, 0.5, 1, 1])
+
+
+def testCubicBounds():
+    c = np.array([
+        [[0, 0], [0, 100], [100, 100], [100, 0]],
+        [[0, 0], [10, 0], [20, 0], [30, 0]],
+        [[0, 0], [30, 30], [-20, 30], [10, 0]],
+        ], dtype=np.float64)
+    t = cubicExtrema(c)
+    assert(np.isnan(t[1]).all())
+    assert(np.allclose(t[0, 1][~np.isnan(t[0, 1])], [0.5]))
+
+    b = cubicBounds(c)
+    assert(np.allclose(b[0], [0, 0, 100, 75]))
+    assert(np.allclose(b[1], [0, 0, 30, 0]))
+    # Compare to dense sampling
+    samples = np.linspace(0, 1, 10001)
+    points = evaluateCubic(np.repeat(c[2:], len(samples), axis=0), samples)
+    assert(np.allclose(b[2], np.hstack([points.min(axis=0), points.max(axis=0)]), atol=1e-6))
+
+    # Degree-elevated quadratic curve
+    b = cubicBounds(quadraticToCubic([[0, 0]], [[5, 10]], [[10, 0]]))
+    assert(np.allclose(b, [[0, 0, 10, 5]]))
+
+
+def testArcBounds():
+    # Half circle around (10, 5) bulging to the right, and the other half
+    (arcs, valid) = arcFromEndpoints([[10, 0], [10, 0]], [[10, 10], [10, 10]], [5, 5], [5, 5], [0, 0], [0, 0], [1, 0])
+    assert(np.allclose(arcBounds(arcs), [[10, 0, 15, 10], [5, 0, 10, 10]]))
+
+    # Rotated ellipse compared to dense sampling
+    (arcs, valid) = arcFromEndpoints([[0, 0]], [[7, 3]], [8], [3], [30], [1], [0])
+    samples = np.linspace(0, 1, 100001)
+    points = evaluateArc(np.repeat(arcs, len(samples), axis=0), samples)
+    assert(np.allclose(arcBounds(arcs)[0], np.hstack([points.min(axis=0), points.max(axis=0)]), atol=1e-6))
+
+
+def testLengths():
+    # Straight lines have constant speed
+    c = lineToCubic([[0, 0], [1, 1]], [[3, 4], [1, 1]])
+    assert(np.allclose(cubicDerivative(c, [0.3, 0.5]), [[3, 4], [0, 0]]))
+    assert(np.allclose(cubicLengths(c), [5, 0]))
+    assert(np.allclose(cubicLengths(c, 0.25, [0.5, 1.0]), [1.25, 0]))
+
+    # A curve's length matches its dense polyline
+    c = np.array([[[0, 0], [0, 4], [10, 4], [10, 0]]], dtype=np.float64)
+    points = evaluateCubic(np.repeat(c, 100001, axis=0), np.linspace(0, 1, 100001))
+    length = np.linalg.norm(np.diff(points, axis=0), axis=1).sum()
+    assert(abs(cubicLengths(c)[0] - length) < 1e-4)
+    t = np.linspace(0, 1, 9)
+    assert(abs(cubicLengths(np.repeat(c, 8, axis=0), t[:-1], t[1:]).sum() - length) < 1e-7)
+    h = 1e-6
+    assert(np.allclose(cubicDerivative(c, [0.3]), (evaluateCubic(c, [0.3 + h]) - evaluateCubic(c, [0.3 - h])) / (2 * h)))
+
+    # Half a circle and a quarter of an ellipse
+    (arcs, valid) = arcFromEndpoints([[10, 0], [2, 0]], [[-10, 0], [0, 1]], [10, 2], [10, 1], [0, 0], [0, 0], [1, 1])
+    assert(np.allclose(arcLengths(arcs[:1], 0.0, [0.5]), [5 * np.pi]))
+    assert(np.allclose(arcDerivative(arcs, [0.3, 0.3]),
+        (evaluateArc(arcs, [0.3 + h] * 2) - evaluateArc(arcs, [0.3 - h] * 2)) / (2 * h), atol=1e-6))
+    points = evaluateArc(np.repeat(arcs[1:], 100001, axis=0), np.linspace(0, 1, 100001))
+    assert(abs(arcLengths(arcs[1:])[0] - np.linalg.norm(np.diff(points, axis=0), axis=1).sum()) < 1e-6)
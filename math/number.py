@@ -0,0 +1,69 @@
+#!/usr/bin/python3
+#
+# Lexer for the numbers and lists of numbers in SVG attributes,
+# e.g. transformation arguments, the points of polylines and polygons or viewBox
+# https://www.w3.org/TR/SVG11/types.html#DataTypeList
+#
+
+import re
+import warnings
+import numpy as np
+
+
+# Numbers may be packed without separators,
+# e.g. "1.5.5" is 1.5 followed by .5 and "-1-2" is -1 followed by -2
+sNumber = "[+-]?(?:[0-9]+[.]?[0-9]*|[.][0-9]+)(?:[eE][+-]?[0-9]+)?"
+
+rNumber = re.compile(sNumber)
+# Any other character is a token of its own, which fails to convert
+rNumberToken = re.compile(sNumber + "|[^ ]")
+
+# Numbers in lists are separated by whitespace and/or a comma,
+# which are all replaced by blanks
+numberSeparatorTable = str.maketrans("\t\r\n,", "    ")
+
+
+#
+# Return the numbers of a list as NumPy array of floats
+#
+# Lists separated by whitespace and/or commas are converted by NumPy in a single pass.
+# Only if that fails, e.g. for packed numbers like "-1-2",
+# the string is split by a regular expression.
+# Raises SyntaxError, if the string is not a list of numbers.
+#
+def parseNumbers(s):
+    s = s.translate(numberSeparatorTable).strip()
+    if s == "":
+        return np.empty(0, dtype=np.float64)
+    try:
+        # Older NumPy versions only warn about unmatched data
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", DeprecationWarning)
+            numbers = np.fromstring(s, dtype=np.float64, sep=" ")
+        # NumPy accepts "nan" and "inf", SVG does not
+        if np.isfinite(numbers).all():
+            return numbers
+    except (ValueError, DeprecationWarning):
+        pass
+    try:
+        return np.array(rNumberToken.findall(s), dtype=np.float64)
+    except ValueError:
+        raise SyntaxError("Illegal list of numbers: \"{:s}\"".format(s if len(s) < 80 else s[:77] + "..."))
+
+
+#
+# Return the shortest strings reading back as the given floats,
+# without a trailing ".0" of integral values, e.g. "1", "0.5" and "1e-05"
+#
+def formatNumbers(values):
+    return [s[:-2] if s.endswith(".0") else s for s in map(repr, values)]
+
+
+#
+# Return a single number as float, e.g. of an attribute like width="10"
+#
+def parseNumber(s):
+    numbers = parseNumbers(str(s))
+    if len(numbers) != 1:
+        raise SyntaxError("Expected a single number, got: \"{:s}\"".format(str(s)))
+    return float(numbers[0])
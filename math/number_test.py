@@ -0,0 +1,50 @@
+#!/usr/bin/python3
+
+import numpy as np
+
+from .number import parseNumbers, parseNumber, formatNumbers
+
+
+def testParseNumbers():
+    assert(parseNumbers("").tolist() == [])
+    assert(parseNumbers(" \t\n").tolist() == [])
+    assert(parseNumbers("1,2 3\t4\r\n5").tolist() == [1, 2, 3, 4, 5])
+    assert(parseNumbers("1e5 .5 5. +.5 -0.5E-2 1E+2").tolist() == [1e5, 0.5, 5, 0.5, -0.005, 100])
+
+    # Packed numbers
+    assert(parseNumbers("-1-2").tolist() == [-1, -2])
+    assert(parseNumbers("1.5.5,0.5-.5").tolist() == [1.5, 0.5, 0.5, -0.5])
+    assert(parseNumbers("1e2.5").tolist() == [100, 0.5])
+
+    for s in ["1 x 2", "nan", "inf", "1e", "1 +", ".", "0x10", "1;2"]:
+        try:
+            parseNumbers(s)
+            assert(False)
+        except SyntaxError:
+            pass
+
+
+def testParseNumber():
+    assert(parseNumber(" 2.5 ") == 2.5)
+    assert(parseNumber(3) == 3.0)
+    try:
+        parseNumber("1 2")
+        assert(False)
+    except SyntaxError:
+        pass
+
+
+def testFormatNumbers():
+    values = [1.0, -2.0, 0.5, -0.25, 1e-05, 1e20, 123456.789, 0.1 + 0.2]
+    strings = formatNumbers(values)
+    assert(strings[:5] == ["1", "-2", "0.5", "-0.25", "1e-05"])
+    assert(parseNumbers(" ".join(strings)).tolist() == values)
+
+
+def testLongList():
+    rng = np.random.default_rng(3)
+    numbers = rng.uniform(-1e3, 1e3, 10000)
+    s = " ".join(["{:.17g}".format(x) for x in numbers])
+    assert(parseNumbers(s).tolist() == numbers.tolist())
+    s = "".join(["{:+.17g}".format(x) for x in numbers])
+    assert(parseNumbers(s).tolist() == numbers.tolist())
@@ -0,0 +1,258 @@
+#!/usr/bin/python3
+#
+# Vectorized algorithms on polygons
+#
+# Polygons are given as NumPy arrays of shape (n, 2) holding the vertices of all rings
+# and an array of offsets, such that ring k consists of vertices[offsets[k]:offsets[k+1]].
+# Rings are implicitly closed, i.e. the last vertex connects to the first one.
+#
+
+import numpy as np
+
+
+# The maximum number of point-edge pairs evaluated at once
+polygonPairsPerChunk = 1 << 22
+
+
+#
+# Return the index of the vertex following every vertex within its ring
+#
+def followingVertices(offsets):
+    offsets = np.asarray(offsets, dtype=np.intp)
+    following = np.arange(1, offsets[-1] + 1)
+    nonEmpty = offsets[1:] > offsets[:-1]
+    following[offsets[1:][nonEmpty] - 1] = offsets[:-1][nonEmpty]
+    return following
+
+
+#
+# Return the start- and endpoints of all edges of the polygon's rings
+#
+def polygonEdges(vertices, offsets):
+    vertices = np.asarray(vertices, dtype=np.float64)
+    return (vertices, vertices[followingVertices(offsets)])
+
+
+#
+# Return the vertices and offsets of the given rings only
+#
+def selectRings(vertices, offsets, rings):
+    offsets = np.asarray(offsets, dtype=np.intp)
+    rings = np.asarray(rings, dtype=np.intp)
+    counts = offsets[rings+1] - offsets[rings]
+    selectedOffsets = np.zeros(len(rings) + 1, dtype=np.intp)
+    np.cumsum(counts, out=selectedOffsets[1:])
+    ring = np.repeat(np.arange(len(rings)), counts)
+    index = offsets[rings][ring] + np.arange(selectedOffsets[-1]) - selectedOffsets[ring]
+    return (np.asarray(vertices)[index], selectedOffsets)
+
+
+#
+# Return the signed area of every ring, positive for counter-clockwise rings
+# (in a coordinate system with the y axis pointing up)
+#
+def ringAreas(vertices, offsets):
+    (start, end) = polygonEdges(vertices, offsets)
+    ring = np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+    cross = start[:, 0] * end[:, 1] - start[:, 1] * end[:, 0]
+    return np.bincount(ring, weights=cross, minlength=len(offsets) - 1) / 2.0
+
+
+#
+# Return the bounding box of every ring as (n, 4) array
+# with the columns min x, min y, max x, max y; empty rings yield NaN
+#
+def ringBounds(vertices, offsets):
+    vertices = np.asarray(vertices, dtype=np.float64)
+    offsets = np.asarray(offsets, dtype=np.intp)
+    bounds = np.full((len(offsets) - 1, 4), np.nan)
+    nonEmpty = np.flatnonzero(offsets[1:] > offsets[:-1])
+    if len(nonEmpty) > 0:
+        first = offsets[nonEmpty]
+        bounds[nonEmpty, :2] = np.minimum.reduceat(vertices, first, axis=0)
+        bounds[nonEmpty, 2:] = np.maximum.reduceat(vertices, first, axis=0)
+    return bounds
+
+
+#
+# Return the winding number of the polygon around every point
+#
+# The edges are sorted into horizontal bands, so that every point
+# is only tested against the edges overlapping its band.
+# Points outside the polygon's bounding box are not tested at all.
+#
+def windingNumbers(points, vertices, offsets):
+    points = np.asarray(points, dtype=np.float64).reshape((-1, 2))
+    winding = np.zeros(len(points), dtype=np.intp)
+    (start, end) = polygonEdges(vertices, offsets)
+
+    # Horizontal edges never cross a horizontal ray
+    crossing = start[:, 1] != end[:, 1]
+    start = start[crossing]
+    end = end[crossing]
+    if len(start) == 0:
+        return winding
+    low = np.minimum(start[:, 1], end[:, 1])
+    high = np.maximum(start[:, 1], end[:, 1])
+
+    # Bounding box prefilter
+    minX = min(start[:, 0].min(), end[:, 0].min())
+    maxX = max(start[:, 0].max(), end[:, 0].max())
+    (minY, maxY) = (low.min(), high.max())
+    candidates = np.flatnonzero((points[:, 0] >= minX) & (points[:, 0] <= maxX)
+        & (points[:, 1] >= minY) & (points[:, 1] < maxY))
+    if len(candidates) == 0:
+        return winding
+
+    # Sort the edges into bands of equal height
+    numBands = min(len(start), 65536)
+    height = (maxY - minY) / numBands
+    firstBand = np.clip(((low - minY) / height).astype(np.intp), 0, numBands - 1)
+    lastBand = np.clip(((high - minY) / height).astype(np.intp), 0, numBands - 1)
+    spans = lastBand - firstBand + 1
+    edge = np.repeat(np.arange(len(start)), spans)
+    band = firstBand[edge] + np.arange(len(edge)) - (np.cumsum(spans) - spans)[edge]
+    order = np.argsort(band, kind="stable")
+    bandEdges = edge[order]
+    bandOffsets = np.searchsorted(band[order], np.arange(numBands + 1))
+
+    # Test the candidates in chunks of a limited number of point-edge pairs
+    pointBand = np.clip(((points[candidates, 1] - minY) / height).astype(np.intp), 0, numBands - 1)
+    counts = bandOffsets[pointBand + 1] - bandOffsets[pointBand]
+    chunk = np.cumsum(counts) // polygonPairsPerChunk
+    bounds = np.searchsorted(chunk, np.arange(chunk[-1] + 2))
+    for (a, b) in zip(bounds[:-1], bounds[1:]):
+        if a == b:
+            continue
+        pair = np.repeat(np.arange(b - a), counts[a:b])
+        e = bandEdges[bandOffsets[pointBand[a:b]][pair] + np.arange(len(pair)) - (np.cumsum(counts[a:b]) - counts[a:b])[pair]]
+        p = points[candidates[a:b][pair]]
+        (x0, y0) = (start[e, 0], start[e, 1])
+        (x1, y1) = (end[e, 0], end[e, 1])
+        upward = (y0 <= p[:, 1]) & (p[:, 1] < y1)
+        downward = (y1 <= p[:, 1]) & (p[:, 1] < y0)
+        # Only crossings right of the point count
+        x = x0 + (p[:, 1] - y0) * (x1 - x0) / np.where(y1 != y0, y1 - y0, 1.0)
+        right = x > p[:, 0]
+        weights = np.where(right & upward, 1, 0) - np.where(right & downward, 1, 0)
+        winding[candidates[a:b]] = np.bincount(pair, weights=weights, minlength=b - a).astype(np.intp)
+    return winding
+
+
+#
+# Return whether the polygon contains every point according to the fill rule,
+# i.e. "nonzero" or "evenodd"
+#
+def containsPoints(points, vertices, offsets, fillRule="nonzero"):
+    winding = windingNumbers(points, vertices, offsets)
+    if fillRule == "nonzero":
+        return winding != 0
+    if fillRule == "evenodd":
+        return (winding % 2) != 0
+    raise ValueError("Unknown fill rule \"{:s}\"".format(str(fillRule)))
+
+
+#
+# Return the distance of every point to the line segment from a to b
+#
+def segmentDistances(points, a, b):
+    (dx, dy) = (b[:, 0] - a[:, 0], b[:, 1] - a[:, 1])
+    (px, py) = (points[:, 0] - a[:, 0], points[:, 1] - a[:, 1])
+    lengthSquared = dx * dx + dy * dy
+    t = np.clip((px * dx + py * dy) / np.where(lengthSquared > 0, lengthSquared, 1.0), 0.0, 1.0)
+    return np.hypot(px - t * dx, py - t * dy)
+
+
+#
+# Simplify polylines by the Ramer-Douglas-Peucker algorithm
+#
+# Unlike polygon rings, the polylines are open: the first and last vertex of every polyline are kept.
+# Instead of recursing, all pending segments of all polylines are subdivided at once
+# in every iteration, so that the number of iterations is the depth of the recursion.
+# Returns a mask of the vertices to keep.
+#
+def simplifyPolylines(vertices, offsets, tolerance):
+    vertices = np.asarray(vertices, dtype=np.float64)
+    offsets = np.asarray(offsets, dtype=np.intp)
+    keep = np.zeros(len(vertices), dtype=bool)
+    nonEmpty = offsets[1:] > offsets[:-1]
+    keep[offsets[:-1][nonEmpty]] = True
+    keep[offsets[1:][nonEmpty] - 1] = True
+
+    # The pending segments are given by their first and last vertex
+    first = offsets[:-1][nonEmpty]
+    last = offsets[1:][nonEmpty] - 1
+    while True:
+        pending = (last - first) >= 2
+        first = first[pending]
+        last = last[pending]
+        if len(first) == 0:
+            return keep
+
+        # The interior vertices of all segments
+        counts = last - first - 1
+        segment = np.repeat(np.arange(len(first)), counts)
+        starts = np.cumsum(counts) - counts
+        index = first[segment] + 1 + np.arange(len(segment)) - starts[segment]
+        distances = segmentDistances(vertices[index], vertices[first[segment]], vertices[last[segment]])
+
+        # Split the segments at their farthest vertex, if it exceeds the tolerance
+        farthest = np.maximum.reduceat(distances, starts)
+        split = farthest > tolerance
+        middle = np.minimum.reduceat(np.where(distances == farthest[segment], index, len(vertices)), starts)
+        keep[middle[split]] = True
+        (first, last) = (np.concatenate([first[split], middle[split]]), np.concatenate([middle[split], last[split]]))
+
+
+#
+# Clip the polygon's rings to the half-plane left of the line from a to b
+# (i.e. inside a counter-clockwise polygon with the y axis pointing up)
+#
+def clipPolygonsToHalfPlane(vertices, offsets, a, b):
+    offsets = np.asarray(offsets, dtype=np.intp)
+    following = followingVertices(offsets)
+    side = (b[0] - a[0]) * (vertices[:, 1] - a[1]) - (b[1] - a[1]) * (vertices[:, 0] - a[0])
+    inside = side >= 0
+    insideEnd = inside[following]
+
+    # Every edge yields its intersection with the line, if it crosses it,
+    # followed by its endpoint, if the endpoint is inside
+    crossing = inside != insideEnd
+    counts = crossing.astype(np.intp) + insideEnd
+    positions = np.cumsum(counts) - counts
+    clipped = np.empty((counts.sum(), 2))
+    i = np.flatnonzero(crossing)
+    t = side[i] / (side[i] - side[following[i]])
+    clipped[positions[i]] = vertices[i] + t[:, None] * (vertices[following[i]] - vertices[i])
+    i = np.flatnonzero(insideEnd)
+    clipped[positions[i] + crossing[i]] = vertices[following[i]]
+
+    ring = np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+    clippedOffsets = np.zeros(len(offsets), dtype=np.intp)
+    np.cumsum(np.bincount(ring, weights=counts, minlength=len(offsets) - 1).astype(np.intp), out=clippedOffsets[1:])
+    return (clipped, clippedOffsets)
+
+
+#
+# Clip the polygon's rings to a convex polygon by the Sutherland-Hodgman algorithm
+#
+# All rings are clipped at once to one edge of the convex polygon after another.
+# Rings are kept in order, those outside the convex polygon become empty.
+# Clipping concave rings may leave degenerate edges along the convex polygon's boundary,
+# which do not affect the filled area.
+#
+def clipPolygons(vertices, offsets, convex):
+    vertices = np.asarray(vertices, dtype=np.float64)
+    offsets = np.asarray(offsets, dtype=np.intp)
+    convex = np.asarray(convex, dtype=np.float64)
+    if ringAreas(convex, [0, len(convex)])[0] < 0:
+        convex = convex[::-1]
+    (start, end) = polygonEdges(convex, [0, len(convex)])
+    d = end - start
+    turns = d[:, 0] * np.roll(d[:, 1], -1) - d[:, 1] * np.roll(d[:, 0], -1)
+    if (len(convex) < 3) or (turns < -1e-12 * (d * d).sum()).any():
+        raise ValueError("Clipping requires a convex polygon")
+
+    for k in range(len(convex)):
+        (vertices, offsets) = clipPolygonsToHalfPlane(vertices, offsets, start[k], end[k])
+    return (vertices, offsets)
@@ -0,0 +1,111 @@
+#!/usr/bin/python3
+
+import numpy as np
+
+from .polygon import polygonEdges, windingNumbers, containsPoints, segmentDistances, simplifyPolylines, \
+    ringAreas, ringBounds, selectRings, clipPolygons
+
+
+def testEdges():
+    (start, end) = polygonEdges([[0, 0], [1, 0], [1, 1], [5, 5], [6, 5]], [0, 3, 3, 5])
+    assert(start.tolist() == [[0, 0], [1, 0], [1, 1], [5, 5], [6, 5]])
+    assert(end.tolist() == [[1, 0], [1, 1], [0, 0], [6, 5], [5, 5]])
+
+
+def testWindingNumbers():
+    # A square with a hole of the same orientation and a hole of opposite orientation
+    vertices = [[0, 0], [10, 0], [10, 10], [0, 10],
+        [1, 1], [4, 1], [4, 4], [1, 4],
+        [6, 6], [6, 9], [9, 9], [9, 6]]
+    offsets = [0, 4, 8, 12]
+    points = [[5, 5], [2, 2], [7, 7], [-1, 5], [5, 11], [11, 5]]
+    assert(windingNumbers(points, vertices, offsets).tolist() == [1, 2, 0, 0, 0, 0])
+    assert(containsPoints(points, vertices, offsets, "nonzero").tolist() == [True, True, False, False, False, False])
+    assert(containsPoints(points, vertices, offsets, "evenodd").tolist() == [True, False, False, False, False, False])
+    try:
+        containsPoints(points, vertices, offsets, "odd")
+        assert(False)
+    except ValueError:
+        pass
+    assert(windingNumbers(points, [[0, 0], [1, 0]], [0, 2]).tolist() == [0] * 6)
+
+
+def testRandomPolygon():
+    # Compare with testing every point against every edge
+    rng = np.random.default_rng(1)
+    angles = np.sort(rng.uniform(0, 4 * np.pi, 300))
+    radii = rng.uniform(1, 10, 300)
+    vertices = np.stack([radii * np.cos(angles), radii * np.sin(angles)], axis=1)
+    offsets = [0, 100, 300]
+    points = rng.uniform(-11, 11, (2000, 2))
+
+    (start, end) = polygonEdges(vertices, offsets)
+    (x0, y0, x1, y1) = (start[:, 0], start[:, 1], end[:, 0], end[:, 1])
+    (px, py) = (points[:, 0, None], points[:, 1, None])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        right = x0 + (py - y0) * (x1 - x0) / (y1 - y0) > px
+    expected = (((y0 <= py) & (py < y1) & right).sum(axis=1) - ((y1 <= py) & (py < y0) & right).sum(axis=1))
+    assert(np.abs(expected).max() > 1)
+    assert(windingNumbers(points, vertices, offsets).tolist() == expected.tolist())
+
+
+def testSimplifyPolylines():
+    # A noisy line, a zigzag and a closed ring
+    x = np.linspace(0, 10, 11)
+    line = np.stack([x, 0.01 * (-1) ** np.arange(11)], axis=1)
+    zigzag = np.array([[0, 0], [1, 1], [2, 0], [3, 1], [4, 0]])
+    ring = np.array([[0, 0], [1, 0.05], [2, 0], [2, 2], [0, 2], [0, 0]])
+    vertices = np.vstack([line, zigzag, [[5, 5]], ring])
+    offsets = [0, 11, 16, 16, 17, 23]
+    keep = simplifyPolylines(vertices, offsets, 0.1)
+    assert(np.flatnonzero(keep[:11]).tolist() == [0, 10])
+    assert(keep[11:16].all())
+    assert(keep[16])
+    assert(keep[17:].tolist() == [True, False, True, True, True, True])
+    assert(simplifyPolylines(vertices, offsets, 0.001).all())
+
+    # Equivalent to recursion
+    rng = np.random.default_rng(2)
+    vertices = np.cumsum(rng.normal(size=(500, 2)), axis=0)
+    def recurse(a, b, keep):
+        if b - a < 2:
+            return
+        d = segmentDistances(vertices[a+1:b], vertices[a:a+1], vertices[b:b+1])
+        if d.max() > 2.0:
+            m = a + 1 + int(np.argmax(d))
+            keep[m] = True
+            recurse(a, m, keep)
+            recurse(m, b, keep)
+    expected = np.zeros(500, dtype=bool)
+    expected[[0, 499]] = True
+    recurse(0, 499, expected)
+    assert(simplifyPolylines(vertices, [0, 500], 2.0).tolist() == expected.tolist())
+
+
+def testClipping():
+    # A square partially overlapping the clip rectangle, one inside, one outside and a triangle
+    vertices = [[-1, -1], [1, -1], [1, 1], [-1, 1],
+        [0.2, 0.2], [0.4, 0.2], [0.4, 0.4],
+        [5, 5], [6, 5], [6, 6],
+        [0, 0], [4, 0], [0, 4]]
+    offsets = [0, 4, 7, 10, 13]
+    rectangle = [[0, 0], [0, 2], [2, 2], [2, 0]]
+    (clipped, clippedOffsets) = clipPolygons(vertices, offsets, rectangle)
+    assert(np.diff(clippedOffsets).tolist()[2] == 0)
+    assert(np.allclose(np.abs(ringAreas(clipped, clippedOffsets)), [1, 0.02, 0, 4]))
+    assert(clipped[clippedOffsets[1]:clippedOffsets[2]].tolist() == [[0.4, 0.2], [0.4, 0.4], [0.2, 0.2]])
+    assert(np.allclose(ringBounds(clipped, clippedOffsets)[3], [0, 0, 2, 2]))
+    assert(np.isnan(ringBounds(clipped, clippedOffsets)[2]).all())
+
+    # Clipping to a convex polygon equals the intersection's area
+    (clipped, clippedOffsets) = clipPolygons(vertices[:4], [0, 4], [[0, -2], [2, 0], [0, 2], [-2, 0]])
+    assert(np.isclose(ringAreas(clipped, clippedOffsets)[0], 4))
+    try:
+        clipPolygons(vertices, offsets, [[0, 0], [2, 0], [1, 0.5], [2, 2], [0, 2]])
+        assert(False)
+    except ValueError:
+        pass
+
+    (selected, selectedOffsets) = selectRings(vertices, offsets, [3, 1])
+    assert(selectedOffsets.tolist() == [0, 3, 6])
+    assert(selected[3:].tolist() == [[0.2, 0.2], [0.4, 0.2], [0.4, 0.4]])
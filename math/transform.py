@@ -2,29 +2,91 @@
 
 # Use regular expressions for parsing
 import re
+from math import sin, cos, tan, radians
 
-# Use NumPy for matrix operations (element transformations)
+# Use NumPy for matrix operations on arrays of points
 import numpy as np
-from numpy import sin, cos, tan, pi
-
-
-# Comma before and after "E"
-rFv1 = "[\+\-]*[0-9]+\.[0-9]+[eE]{1}[\+\-]*[0-9]+\.[0-9]+"
-# Comma before "E"
-rFv2 = "[\+\-]*[0-9]+\.[0-9]+[eE]{1}[\+\-]*[0-9]+"
-# Comma after "E"; not supported
-#rFv3 = "[\+\-]*[0-9]+[eE]{1}[\+\-]*[0-9]+\.[0-9]+"
-# No comma neither before nor after "E"
-rFv4 = "[\+\-]*[0-9]+[eE]{1}[\+\-]*[0-9]+"
-# Comma, but no "E"
-rFnoE = "[\+\-]*[0-9]+\.[0-9]+"
-# No comma, no "E"
-rFint = "[\+\-]*[0-9]+"
-sNumeric = "("+rFv1+"|"+rFv2+"|"+rFv4+"|"+rFnoE+"|"+rFint+")"
-rFloat = re.compile(sNumeric)
-rOps = re.compile("([a-zA-Z]+)[^\(\)]*\([^\(\)]*\)")
-rArgs = re.compile("\(([^\(\)]*)\)")
-rTransform = re.compile("(matrix|translate||scale|rotate|skewX|skewY)[ \t]*\(([\+\-0-9eE\.\,\; \t]*)\)")
+
+from .number import sNumber, parseNumbers
+
+
+# A transform function, e.g. "rotate(45, 10, 20)", followed by separators
+rTransformFunction = re.compile("(matrix|translate|scale|rotate|skewX|skewY)[ \t\r\n]*[(]([^()]*)[)][^a-zA-Z()]*")
+# The arguments are numbers, which may be packed like in path definitions;
+# any other character is a token of its own, which fails to convert.
+rTransformArgument = re.compile(sNumber + "|[^ \t\r\n,]")
+# Transform functions are separated by whitespace and/or commas;
+# as before, other characters like semicolons are tolerated.
+rTransformSeparator = re.compile("[^a-zA-Z()]*")
+
+
+#
+# The kinds of affine transformations:
+# the axis-aligned kinds are combinations of the translation and scale bits
+#
+svgMatrixIdentity = 0
+svgMatrixTranslate = 1
+svgMatrixScale = 2
+svgMatrixScaleTranslate = 3
+svgMatrixGeneral = 4
+
+
+#
+# Return the kind of the affine transformation with the given components
+#
+def classifyComponents(a, b, c, d, e, f):
+    if (b != 0) or (c != 0):
+        return svgMatrixGeneral
+    return (2 if ((a != 1) or (d != 1)) else 0) | (1 if ((e != 0) or (f != 0)) else 0)
+
+
+#
+# Return the kinds of many affine transformations
+# given as array of shape (n, 6) with the components a-f
+#
+def classifyMatrices(components):
+    components = np.asarray(components, dtype=np.float64).reshape((-1, 6))
+    (a, b, c, d, e, f) = components.T
+    kinds = np.where((a != 1) | (d != 1), svgMatrixScale, svgMatrixIdentity) | np.where((e != 0) | (f != 0), svgMatrixTranslate, 0)
+    return np.where((b != 0) | (c != 0), svgMatrixGeneral, kinds)
+
+
+#
+# Apply a different affine transformation to every group of points at once
+#
+# The points of all groups, e.g. of many paths, are concatenated to an array of shape (n, 2),
+# such that group k consists of points[offsets[k]:offsets[k+1]].
+# Its transformation is row k of the array of shape (len(offsets) - 1, 6)
+# holding the components a-f, e.g. as returned by SVGElement.calculateCTMs().
+#
+# @param inplace: Overwrite the points, which must be a NumPy array of float64
+# @param translate: Omit the translation, e.g. for relative coordinates
+#
+def applyMatricesToPoints(matrices, points, offsets, inplace=False, translate=True):
+    matrices = np.asarray(matrices, dtype=np.float64).reshape((-1, 6))
+    offsets = np.asarray(offsets, dtype=np.intp)
+    if inplace:
+        if (type(points) is not np.ndarray) or (points.dtype != np.float64):
+            raise TypeError("Transforming points in place requires a NumPy array of float64")
+        result = points
+    else:
+        result = np.array(points, dtype=np.float64).reshape((-1, 2))
+    if (len(offsets) != len(matrices) + 1) or (offsets[0] != 0) or (offsets[-1] != len(result)):
+        raise ValueError("Expected {:d} offsets from 0 to {:d}, got {:d}".format(len(matrices) + 1, len(result), len(offsets)))
+
+    # The components of every point's matrix
+    (a, b, c, d, e, f) = np.repeat(matrices, np.diff(offsets), axis=0).T
+    x = result[:, 0]
+    y = result[:, 1]
+    x0 = x.copy()
+    x *= a
+    x += c * y
+    y *= d
+    y += b * x0
+    if translate:
+        x += e
+        y += f
+    return result
 
 
 #
@@ -33,22 +95,66 @@ rTransform = re.compile("(matrix|translate||scale|rotate|skewX|skewY)[ \t]*\(([\
 # See also:
 #  https://www.scriptverse.academy/tutorials/python-matrix-multiplication.html
 #
+# The matrix
+#  [[a, c, e],
+#   [b, d, f],
+#   [0, 0, 1]]
+# is stored as its six components only. Composing, inverting and
+# transforming single points is done in plain Python, which is much faster
+# than NumPy for 3x3 matrices; NumPy is only used for arrays of points.
+#
+# Matrices are not modified after construction. Their kind (see classifyComponents())
+# selects specialized branches, e.g. composing with the identity returns the other matrix.
+#
 class SVGMatrix:
+    __slots__ = ("a", "b", "c", "d", "e", "f", "kind", "debug")
+
     def __init__(self, a=1, b=0, c=0, d=1, e=0, f=0, npMatrix=None, debug=False):
         self.debug = debug
         if npMatrix is None:
-            self.matrix = np.array([[a, c, e], [b, d, f], [0, 0, 1]])
+            self.a = a
+            self.b = b
+            self.c = c
+            self.d = d
+            self.e = e
+            self.f = f
         else:
-            self.matrix = npMatrix
+            (self.a, self.c, self.e) = (float(npMatrix[0, 0]), float(npMatrix[0, 1]), float(npMatrix[0, 2]))
+            (self.b, self.d, self.f) = (float(npMatrix[1, 0]), float(npMatrix[1, 1]), float(npMatrix[1, 2]))
+        self.kind = classifyComponents(self.a, self.b, self.c, self.d, self.e, self.f)
+
+    #
+    # Return the kind of transformation, e.g. svgMatrixTranslate
+    #
+    def getKind(self):
+        return self.kind
+
+    def isIdentity(self):
+        return self.kind == svgMatrixIdentity
+
+    # Return true, if the matrix maps axis-aligned rectangles to axis-aligned rectangles
+    def isAxisAligned(self):
+        return self.kind != svgMatrixGeneral
 
     #
     # Return this object's transformation matrix as NumPy type
     #
     def getMatrix(self):
-        return self.matrix
+        return np.array([[self.a, self.c, self.e], [self.b, self.d, self.f], [0, 0, 1]])
+
+    # The NumPy matrix of earlier versions
+    @property
+    def matrix(self):
+        return self.getMatrix()
+
+    #
+    # Return the components a-f
+    #
+    def getComponents(self):
+        return (self.a, self.b, self.c, self.d, self.e, self.f)
 
     def __str__(self):
-        return str(self.matrix)
+        return str(self.getMatrix())
 
     #
     # Apply this transformation matrix to a point
@@ -57,101 +163,233 @@ class SVGMatrix:
     # Returns a one-dimensional NumPy array with two elements: x and y
     #
     def applyToPoint(self, point, debug=False):
-        # Is point a NumPy type?
-        if ((type(point) is np.array) or (type(point) is np.ndarray) or (type(point) is np.matrix)) \
-        and (len(point.shape) > 1):
-            # Two-dimensional NumPy array: Row vector or column vector?
-            if (point.shape[0] > point.shape[1]):
-                #point = point.T
-                x = point[0, 0]
-                y = point[1, 0]
-            else:
-                x = point[0, 0]
-                y = point[0, 1]
+        if (type(point) is tuple) or (type(point) is list):
+            (x, y) = (point[0], point[1])
         else:
-            # Tuple, array or one-dimensional NumPy array
-            x = point[0]
-            y = point[1]
-        # Re-create point in the proper form
-        point = np.matrix([[x], [y], [1.0]])
-
+            # Row and column vectors alike
+            (x, y) = np.asarray(point, dtype=np.float64).reshape(-1)[:2].tolist()
         if debug or self.debug:
-            print("Applying matrix \n{:s}\nto point\n{:s}".format(str(self.matrix), str(point)))
-
-        pointTransformed = self.matrix * point
-        pointTransformed = np.array([pointTransformed[0, 0], pointTransformed[1, 0]])
+            print("Applying matrix \n{:s}\nto point ({:s}, {:s})".format(str(self), str(x), str(y)))
+        if self.kind == svgMatrixGeneral:
+            pointTransformed = np.array([self.a * x + self.c * y + self.e, self.b * x + self.d * y + self.f], dtype=np.float64)
+        else:
+            pointTransformed = np.array([self.a * x + self.e, self.d * y + self.f], dtype=np.float64)
         if debug or self.debug:
             print("Result: \n{:s}".format(str(pointTransformed)))
         return pointTransformed
 
+    #
+    # Apply this transformation matrix to an array of points of shape (..., 2),
+    # e.g. (n, 2), or a strided view of the x and y columns of a larger array
+    #
+    # If inplace is true, the points are overwritten, which requires a writable float array;
+    # otherwise a new array is returned.
+    # Without translation, the points are transformed as vectors, e.g. relative coordinates.
+    #
+    def applyToPoints(self, points, inplace=False, translate=True):
+        (a, b, c, d, e, f) = (float(self.a), float(self.b), float(self.c), float(self.d), float(self.e), float(self.f))
+        if inplace:
+            if (type(points) is not np.ndarray) or (points.dtype != np.float64):
+                raise TypeError("Transforming points in place requires a NumPy array of float64")
+            result = points
+        else:
+            result = np.array(points, dtype=np.float64)
+        kind = self.kind if translate else (self.kind & ~svgMatrixTranslate)
+        if kind == svgMatrixIdentity:
+            return result
+        if kind == svgMatrixTranslate:
+            result[..., 0] += e
+            result[..., 1] += f
+            return result
+        x = result[..., 0]
+        y = result[..., 1]
+        if kind == svgMatrixGeneral:
+            # x' = a x + c y + e, then y' = b x + d y + f
+            x0 = x.copy()
+            x *= a
+            x += c * y
+            y *= d
+            y += b * x0
+        else:
+            x *= a
+            y *= d
+        if translate:
+            x += e
+            y += f
+        return result
+
+    #
+    # Return the bounding box of a transformed bounding box
+    # given as min x, min y, max x and max y
+    #
+    # The corners of axis-aligned boxes remain corners, so only two are transformed.
+    #
+    def applyToBounds(self, bounds):
+        (x0, y0, x1, y1) = [float(v) for v in bounds]
+        if self.kind == svgMatrixGeneral:
+            corners = self.applyToPoints([[x0, y0], [x1, y0], [x1, y1], [x0, y1]])
+            return np.concatenate([corners.min(axis=0), corners.max(axis=0)])
+        (x0, x1) = (self.a * x0 + self.e, self.a * x1 + self.e)
+        (y0, y1) = (self.d * y0 + self.f, self.d * y1 + self.f)
+        return np.array([min(x0, x1), min(y0, y1), max(x0, x1), max(y0, y1)], dtype=np.float64)
+
+    #
+    # Return the product of this matrix and another one, i.e. this * other,
+    # which applies the other matrix first
+    #
+    def multiply(self, other):
+        if other.kind == svgMatrixIdentity:
+            return self
+        if self.kind == svgMatrixIdentity:
+            return other
+        (a0, b0, c0, d0, e0, f0) = (self.a, self.b, self.c, self.d, self.e, self.f)
+        (a1, b1, c1, d1, e1, f1) = (other.a, other.b, other.c, other.d, other.e, other.f)
+        if (self.kind | other.kind) == svgMatrixTranslate:
+            return SVGMatrix(1.0, 0.0, 0.0, 1.0, e0 + e1, f0 + f1, None, self.debug)
+        if (self.kind != svgMatrixGeneral) and (other.kind != svgMatrixGeneral):
+            return SVGMatrix(a0 * a1, 0.0, 0.0, d0 * d1, a0 * e1 + e0, d0 * f1 + f0, None, self.debug)
+        return SVGMatrix(a0 * a1 + c0 * b1, b0 * a1 + d0 * b1, a0 * c1 + c0 * d1, b0 * c1 + d0 * d1,
+            a0 * e1 + c0 * f1 + e0, b0 * e1 + d0 * f1 + f0, None, self.debug)
+
+    #
+    # Return the product of another matrix and this one, i.e. matrix * this,
+    # which applies this matrix first
+    #
+    # The other matrix may be an SVGMatrix or a NumPy 3x3 matrix.
+    #
     def applyToMatrix(self, matrix, debug=False):
         if debug or self.debug:
-            print("Applying matrix \n{:s}\nto matrix\n{:s}\n".format(str(self.matrix), str(matrix)))
-        if type(matrix) is SVGMatrix:
-            matrix = matrix.getMatrix()
-        matrixTransformed = np.matmul(matrix, self.matrix)
+            print("Applying matrix \n{:s}\nto matrix\n{:s}\n".format(str(self), str(matrix)))
+        if not (type(matrix) is SVGMatrix):
+            matrix = SVGMatrix(npMatrix=np.asarray(matrix), debug=self.debug)
+        matrixTransformed = matrix.multiply(self)
         if debug or self.debug:
             print("Result: \n{:s}\n".format(str(matrixTransformed)))
-        return SVGMatrix(npMatrix=matrixTransformed, debug=self.debug)
+        return matrixTransformed
+
+    #
+    # Return the inverse matrix
+    #
+    def inverse(self):
+        (a, b, c, d, e, f) = (self.a, self.b, self.c, self.d, self.e, self.f)
+        determinant = a * d - b * c
+        if determinant == 0:
+            raise ValueError("Matrix is not invertible")
+        return SVGMatrix(d / determinant, -b / determinant, -c / determinant, a / determinant,
+            (c * f - d * e) / determinant, (b * e - a * f) / determinant, None, self.debug)
+
+
+#
+# Return the components (a, b, c, d, e, f) of the matrix of a transform function
+# given by its name and the list of its numeric arguments
+#
+# Raises SyntaxError, if the number of arguments is invalid.
+# See: https://www.w3.org/TR/SVG11/coords.html#TransformAttribute
+#
+def transformFunctionComponents(name, args):
+    n = len(args)
+    if (name == "matrix") and (n == 6):
+        return tuple(args)
+    if (name == "translate") and (n in [1, 2]):
+        return (1.0, 0.0, 0.0, 1.0, args[0], args[1] if (n == 2) else 0.0)
+    if (name == "scale") and (n in [1, 2]):
+        return (args[0], 0.0, 0.0, args[1] if (n == 2) else args[0], 0.0, 0.0)
+    if (name == "rotate") and (n in [1, 3]):
+        angle = radians(args[0])
+        (c, s) = (cos(angle), sin(angle))
+        if n == 1:
+            return (c, s, -s, c, 0.0, 0.0)
+        # Rotate around (cx, cy): translate(cx, cy) rotate(angle) translate(-cx, -cy)
+        (cx, cy) = (args[1], args[2])
+        return (c, s, -s, c, cx - c * cx + s * cy, cy - s * cx - c * cy)
+    if (name == "skewX") and (n == 1):
+        return (1.0, 0.0, tan(radians(args[0])), 1.0, 0.0, 0.0)
+    if (name == "skewY") and (n == 1):
+        return (1.0, tan(radians(args[0])), 0.0, 1.0, 0.0, 0.0)
+    raise SyntaxError("Invalid number of arguments for {:s}: {:d}".format(name, n))
+
+
+#
+# Parse a transform attribute in a single pass
+#
+# Returns the list of the transform functions as tuples of their name and argument string
+# and the components (a, b, c, d, e, f) of the composed matrix,
+# which is multiplied in place while scanning, without intermediate objects.
+# Raises SyntaxError, if the string is not a list of transform functions.
+#
+def parseTransformFunctions(s):
+    functions = []
+    (a, b, c, d, e, f) = (1.0, 0.0, 0.0, 1.0, 0.0, 0.0)
+    offset = rTransformSeparator.match(s).end()
+    while offset < len(s):
+        m = rTransformFunction.match(s, offset)
+        if m is None:
+            raise SyntaxError("Expected transform function at offset {:d} of \"{:s}\"".format(offset, s))
+        (name, args) = m.groups()
+        try:
+            numbers = [float(x) for x in rTransformArgument.findall(args)]
+        except ValueError:
+            raise SyntaxError("Illegal arguments of {:s}: \"{:s}\"".format(name, args))
+        (a1, b1, c1, d1, e1, f1) = transformFunctionComponents(name, numbers)
+        (a, b, c, d, e, f) = (a * a1 + c * b1, b * a1 + d * b1, a * c1 + c * d1, b * c1 + d * d1,
+            a * e1 + c * f1 + e, b * e1 + d * f1 + f)
+        functions.append((name, args))
+        offset = m.end()
+    return (functions, (a, b, c, d, e, f))
 
 
 #
 # Class to store/handle SVG element transformations
 #
+# The transform functions are kept as tuples of name and argument string;
+# SVGTransformCommand objects are only created on request.
+#
 class SVGTransformList():
     def __init__(self, element=None, parseFromString=None, debug=False):
         self.debug = debug
         self.element = element
+        self.readOnly = False
         self.clear()
         if  not (parseFromString is None):
             self.parseFromString(parseFromString)
 
     def __len__(self):
-        return len(self.transformations)
+        return len(self.functions)
 
     def getTransformations(self):
+        if self.transformations is None:
+            self.transformations = [svgTransformCommands[name]((name, args), debug=self.debug) for (name, args) in self.functions]
         return self.transformations
 
     def getTransformation(self, index):
-        return self.transformations[index]
+        return self.getTransformations()[index]
 
     def clear(self):
-        self.transformations = []
+        if self.readOnly:
+            raise ValueError("Transformation list is read-only")
+        self.functions = []
+        self.transformations = None
         self.matrix = None
 
+    #
+    # Prohibit modifying this list, e.g. when it is shared by many elements;
+    # the transformation matrix is calculated beforehand
+    #
+    def setReadOnly(self):
+        self.getSVGMatrix()
+        self.readOnly = True
+
+    #
+    # Parse the transform functions and calculate their matrix at once,
+    # see parseTransformFunctions()
+    #
     def parseFromString(self, s):
         self.clear()
-        # Use regular expression to separate individual transformations.
-        # Transformations are separated by whitespace and/or comma.
-        # Keep illegal lists/arguments.
-        mTransform = rTransform.findall(s)
-        if self.debug:
-            print("Parsed transformations: {:s}".format(str(mTransform)))
-        mOps = rOps.findall(s)
-        if self.debug:
-            print("Validating operations: {:s}".format(str(mOps)))
-        assert len(mOps) == len(mTransform)
-        mArgs = rArgs.findall(s)
+        (self.functions, components) = parseTransformFunctions(s)
+        self.matrix = SVGMatrix(*components, debug=self.debug)
         if self.debug:
-            print("Validating arguments: {:s}".format(str(mArgs)))
-        assert len(mArgs) == len(mTransform)
-
-        # Validate syntax
-        for i in range(len(mTransform)):
-            assert mOps[i] == mTransform[i][0]
-            assert mArgs[i] == mTransform[i][1]
-
-        # Parse
-        for i in range(len(mTransform)):
-            # Fallback
-            t = "{:s}({:s})".format(mOps[i], mArgs[i])
-            if mOps[i] == "rotate":
-                t = SVGTransformRotate(mTransform[i], debug=self.debug)
-            elif mOps[i] == "translate":
-                t = SVGTransformTranslate(mTransform[i], debug=self.debug)
-            elif mOps[i] == "matrix":
-                t = SVGTransformMatrix(mTransform[i], debug=self.debug)
-            self.transformations += [t]
+            print("Parsed transformations: {:s}".format(str(self.functions)))
+            print("Yielded transformation matrix:\n{:s}".format(str(self.matrix)))
 
     #
     # Return the effective cumulative transformation
@@ -174,26 +412,10 @@ class SVGTransformList():
     # of all transformations in this list
     #
     def calculateTransformationMatrix(self):
-        if len(self) == 0:
-            # Identity matrix
-            self.matrix = SVGMatrix()
-            return
-        self.matrix = self.getTransformation(0).getMatrix()
-        if len(self) > 1:
-            if self.debug:
-                print("Calculating transformation matrix beginning with:")
-                print(str(self.transformations[0])+"=")
-                print(str(self.matrix))
-            for t in self.getTransformations()[1:]:
-                individualTransformMatrix = t.getMatrix()
-                if self.debug:
-                    print("Apply:")
-                    print(str(t)+"=")
-                    print(str(individualTransformMatrix))
-                self.matrix = individualTransformMatrix.applyToMatrix(self.matrix)
-                if self.debug:
-                    print("Result:")
-                    print(str(self.matrix))
+        # Identity matrix
+        self.matrix = SVGMatrix(debug=self.debug)
+        for t in self.getTransformations():
+            self.matrix = self.matrix.multiply(t.getMatrix())
 
     # Export to string
     def __str__(self):
@@ -204,109 +426,90 @@ class SVGTransformList():
 
 
 #
-# Implement matrix, translate and rotate first
+# The individual transform functions
 #
 # Read more: https://www.w3.org/TR/SVG11/coords.html#TransformAttribute
 #
 class SVGTransformCommand:
-    def getMatrix(self):
-        return self.matrix
-
-
-class SVGTransformRotate(SVGTransformCommand):
     #
-    # m is a regular expression match:
-    #  first element = operation, in this case: "rotate"
-    #  second element = argument, in this case: rotation angle in degrees
+    # m is a tuple:
+    #  first element = the function's name, e.g. "rotate"
+    #  second element = the argument string, e.g. "45, 10, 20"
     #
     def __init__(self, m, debug=False):
-        assert len(m) == 2
-        arg = m[1]
-        assert arg != ""
+        self.name = m[0]
         if debug:
-            print("Parsing rotation: \"{:s}\"".format(arg))
-        f = rFloat.findall(arg)
-        # rotate(angle [x y])
-        assert len(f) in [1, 3]
+            print("Parsing {:s} arguments: \"{:s}\"".format(m[0], m[1]))
+        self.args = [float(x) for x in parseNumbers(m[1])]
+        self.matrix = SVGMatrix(*transformFunctionComponents(self.name, self.args), debug=debug)
+        if debug:
+            print("Yielded transformation matrix:\n{:s}".format(str(self.matrix)))
 
-        # Rotate by angle in degrees
-        self.angle = float(f[0]) * pi / 180.0
+    def getMatrix(self):
+        return self.matrix
 
-        # Rotate around (alternate) origin
-        self.altOrigin = (len(f) == 3)
-        self.x = float(f[1]) if self.altOrigin else 0.0
-        self.y = float(f[2]) if self.altOrigin else 0.0
+    def __str__(self):
+        return "{:s}({:s})".format(self.name, ", ".join(["{:.3f}".format(x) for x in self.args]))
 
-        self.matrix = SVGMatrix(
-            a=cos(self.angle), c=-sin(self.angle), e=self.x,
-            b=sin(self.angle), d= cos(self.angle), f=self.y
-            )
 
-        if debug:
-            print("Parsed rotation around ({:.2f}, {:.2f}) by {:.2f} degrees.".format(self.x, self.y, self.angle))
-            print("Yielded transformation matrix:\n{:s}".format(str(self.matrix)))
+class SVGTransformRotate(SVGTransformCommand):
+    def __init__(self, m, debug=False):
+        SVGTransformCommand.__init__(self, m, debug=debug)
+        # Rotate by angle in degrees
+        self.angle = self.args[0]
+        # Rotate around (alternate) origin
+        self.altOrigin = (len(self.args) == 3)
+        self.x = self.args[1] if self.altOrigin else 0.0
+        self.y = self.args[2] if self.altOrigin else 0.0
 
     def __str__(self):
         return "rotate({:.3f} {:.3f} {:.3f})".format(self.angle, self.x, self.y) if self.altOrigin else "rotate({:.3f})".format(self.angle)
 
 
 class SVGTransformTranslate(SVGTransformCommand):
-    #
-    # m is a regular expression match:
-    #  first element = operation, in this case: "translate"
-    #  second element = arguments, in this case: one or two translation parameters
-    #   tx and, optionally, ty
-    #
     def __init__(self, m, debug=False):
-        arg = m[1]
-        if debug:
-            print("Parsing translation parameters: \"{:s}\"".format(arg))
-        f = rFloat.findall(arg)
-        assert len(f) > 1
-        assert len(f) < 3
-        self.tx = float(f[0])
-        self.ty = 0.0
-        if len(f) == 2:
-            self.ty = float(f[1])
-
-        self.matrix = SVGMatrix(
-            a=1, c=0, e=self.tx,
-            b=0, d=1, f=self.ty
-            )
-
-        if debug:
-            print("Parsed translation vector is ({:.2f}, {:.2f}).".format(self.tx, self.ty))
-            print("Yielded transformation matrix:\n{:s}".format(str(self.matrix)))
+        SVGTransformCommand.__init__(self, m, debug=debug)
+        self.tx = self.args[0]
+        self.ty = self.args[1] if (len(self.args) == 2) else 0.0
 
     def __str__(self):
         return "translate({:.3f}, {:.3f})".format(self.tx, self.ty)
 
 
-class SVGTransformMatrix(SVGTransformCommand):
-    #
-    # m is a regular expression match:
-    #  first element = operation, in this case: "matrix"
-    #  second element = arguments, in this case: six matrix components a-f
-    #
+class SVGTransformScale(SVGTransformCommand):
     def __init__(self, m, debug=False):
-        arg = m[1]
-        if debug:
-            print("Parsing matrix components: \"{:s}\"".format(arg))
-        f = rFloat.findall(arg)
-        assert len(f) == 6
-        self.f = []
-        for i in range(6):
-            self.f += [float(f[i])]
-
-        self.matrix = SVGMatrix(
-            a=self.f[0], c=self.f[1], e=self.f[2],
-            b=self.f[3], d=self.f[4], f=self.f[5]
-            )
-
-        if debug:
-            print("Parsed matrix is [[{:.2f}, {:.2f}, {:.2f}], [{:.2f}, {:.2f}, {:.2f}], [0, 0, 1]]."
-                .format(self.f[0], self.f[1], self.f[2], self.f[3], self.f[4], self.f[5]))
-            print("Yielded transformation matrix:\n{:s}".format(str(self.matrix)))
+        SVGTransformCommand.__init__(self, m, debug=debug)
+        self.sx = self.args[0]
+        self.sy = self.args[1] if (len(self.args) == 2) else self.sx
 
     def __str__(self):
-        return "matrix({:s})".format(", ".join(["{:.3f}".format(x) for x in self.f]))
+        return "scale({:.3f}, {:.3f})".format(self.sx, self.sy)
+
+
+class SVGTransformSkewX(SVGTransformCommand):
+    def __init__(self, m, debug=False):
+        SVGTransformCommand.__init__(self, m, debug=debug)
+        self.angle = self.args[0]
+
+
+class SVGTransformSkewY(SVGTransformCommand):
+    def __init__(self, m, debug=False):
+        SVGTransformCommand.__init__(self, m, debug=debug)
+        self.angle = self.args[0]
+
+
+class SVGTransformMatrix(SVGTransformCommand):
+    def __init__(self, m, debug=False):
+        SVGTransformCommand.__init__(self, m, debug=debug)
+        self.f = self.args
+
+
+# The class of every transform function
+svgTransformCommands = {
+    "matrix": SVGTransformMatrix,
+    "translate": SVGTransformTranslate,
+    "scale": SVGTransformScale,
+    "rotate": SVGTransformRotate,
+    "skewX": SVGTransformSkewX,
+    "skewY": SVGTransformSkewY
+    }
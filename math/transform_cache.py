@@ -0,0 +1,98 @@
+#!/usr/bin/python3
+#
+# Cache for parsed transformation lists
+#
+# Generated SVGs often repeat identical transform attributes.
+# Each string is only parsed once; all elements with the same string
+# share the same read-only transformation list and matrix.
+#
+
+from collections import OrderedDict
+
+from .transform import SVGTransformList
+
+
+#
+# Least recently used cache of parsed transformation lists
+# keyed by the transform attribute's string
+#
+# Transformation lists are small, so the cache is only bounded by the number of entries.
+# With maxEntries=0 nothing is cached.
+#
+# More distinct strings than entries would make every lookup miss and evict an entry.
+# After more misses in a row than there are entries, only every admitEvery-th miss is cached,
+# until the next hit; the other strings are parsed without touching the entries.
+#
+class SVGTransformListCache:
+    def __init__(self, maxEntries=4096, admitEvery=16, debug=False):
+        self.maxEntries = maxEntries
+        self.admitEvery = admitEvery
+        self.debug = debug
+        self.clear()
+
+    #
+    # Remove all entries and reset the statistics
+    #
+    def clear(self):
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bypasses = 0
+        self.missesInRow = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, s):
+        return s in self.entries
+
+    #
+    # Return the read-only transformation list parsed from the given string
+    #
+    def get(self, s, debug=False):
+        transform = self.entries.get(s)
+        if not (transform is None):
+            self.hits += 1
+            self.missesInRow = 0
+            self.entries.move_to_end(s)
+            return transform
+
+        self.misses += 1
+        self.missesInRow += 1
+        transform = SVGTransformList(parseFromString=s, debug=debug)
+        transform.setReadOnly()
+        if self.maxEntries <= 0:
+            return transform
+        if (self.missesInRow > self.maxEntries) and (self.missesInRow % self.admitEvery != 0):
+            self.bypasses += 1
+            return transform
+        self.entries[s] = transform
+        self.evict()
+        return transform
+
+    #
+    # Remove the least recently used entries,
+    # until the number of entries is within the bound
+    #
+    def evict(self):
+        while len(self.entries) > self.maxEntries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    #
+    # Return the number of hits, misses, evictions and misses not cached
+    # as well as the current number of entries
+    #
+    def getStatistics(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "bypasses": self.bypasses,
+            "entries": len(self.entries)
+            }
+
+
+# The cache shared by all elements of all documents
+svgTransformListCache = SVGTransformListCache()
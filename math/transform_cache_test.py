@@ -0,0 +1,56 @@
+#!/usr/bin/python3
+
+import numpy as np
+
+from .transform_cache import SVGTransformListCache
+from ..dom.element import SVGElement
+
+
+def testSharing():
+    cache = SVGTransformListCache()
+    a = cache.get("translate(1, 2)")
+    b = cache.get("translate(1, 2)")
+    assert(a is b)
+    assert(cache.getStatistics() == {"hits": 1, "misses": 1, "evictions": 0, "bypasses": 0, "entries": 1})
+    assert(np.allclose(a.getMatrix(), [[1, 0, 1], [0, 1, 2], [0, 0, 1]]))
+
+    # Shared lists must not be modified
+    try:
+        a.parseFromString("rotate(90)")
+        assert(False)
+    except ValueError:
+        pass
+    assert(len(cache.get("translate(1, 2)")) == 1)
+
+    # Elements share lists across documents
+    e = SVGElement(attributes={"transform": "translate(3, 4)"})
+    f = SVGElement(attributes={"transform": "translate(3, 4)"})
+    assert(e.getTransform() is f.getTransform())
+    assert(SVGElement().getTransform() is SVGElement().getTransform())
+
+
+def testEviction():
+    cache = SVGTransformListCache(maxEntries=2)
+    for s in ["rotate(1)", "rotate(2)", "rotate(1)", "rotate(3)"]:
+        cache.get(s)
+    assert(len(cache) == 2)
+    assert("rotate(1)" in cache)
+    assert(not ("rotate(2)" in cache))
+    assert(cache.getStatistics()["evictions"] == 1)
+
+    # Thrashing: after more misses in a row than entries, only every admitEvery-th miss is cached
+    cache = SVGTransformListCache(maxEntries=2, admitEvery=4)
+    for i in range(10):
+        cache.get("rotate({:d})".format(i))
+    assert(cache.getStatistics() == {"hits": 0, "misses": 10, "evictions": 2, "bypasses": 6, "entries": 2})
+    assert(("rotate(3)" in cache) and ("rotate(7)" in cache))
+    assert(cache.get("rotate(3)") is cache.get("rotate(3)"))
+    cache.get("rotate(10)")
+    assert("rotate(10)" in cache)
+
+    cache = SVGTransformListCache(maxEntries=0)
+    assert(cache.get("rotate(1)") is not cache.get("rotate(1)"))
+    assert(cache.getStatistics()["misses"] == 2)
+
+    cache.clear()
+    assert(cache.getStatistics()["misses"] == 0)
@@ -2,7 +2,8 @@
 
 import numpy as np
 
-from .transform import SVGTransformList, SVGTransformTranslate, SVGTransformRotate, SVGTransformMatrix
+from .transform import SVGTransformList, SVGTransformTranslate, SVGTransformRotate, SVGTransformMatrix, SVGMatrix, \
+    classifyMatrices, applyMatricesToPoints, svgMatrixIdentity, svgMatrixTranslate, svgMatrixScale, svgMatrixScaleTranslate, svgMatrixGeneral
 
 
 def assertTransformation(transform, numTransformations, expectedMatrix):
@@ -40,8 +41,9 @@ def testParseRotate():
 
 
 def testParseMatrix():
+    # matrix(a, b, c, d, e, f) is [[a, c, e], [b, d, f], [0, 0, 1]]
     transform = "matrix(1, 2, 3, 4, 5, 6)"
-    matrix = np.array([[1, 2, 3], [4, 5, 6], [0, 0, 1]])
+    matrix = np.array([[1, 3, 5], [2, 4, 6], [0, 0, 1]])
     assertTransformation(transform, 1, matrix)
 
 
@@ -154,3 +156,114 @@ def testApplySequenceToMatrix():
 
 # def testGroupApplyTransform():
 #     raise
+
+
+def testApplyToPoints():
+    m = SVGTransformList(parseFromString="translate(10, 20) rotate(90)").getSVGMatrix()
+    points = np.array([[1.0, 0.0], [0.0, 1.0], [2.0, 3.0]])
+    expected = np.array([m.applyToPoint(p) for p in points])
+    assert(np.allclose(m.applyToPoints(points), expected))
+    assert(np.allclose(m.applyToPoints(points, translate=False), expected - [10, 20]))
+    assert(points.tolist() == [[1, 0], [0, 1], [2, 3]])
+
+    # Transform the x and y columns of a larger buffer in place
+    buffer = np.zeros((3, 4))
+    buffer[:, 1:3] = points
+    result = m.applyToPoints(buffer[:, 1:3], inplace=True)
+    assert(np.allclose(buffer[:, 1:3], expected))
+    assert(buffer[:, [0, 3]].tolist() == [[0, 0]] * 3)
+    assert(np.shares_memory(result, buffer))
+    try:
+        m.applyToPoints([[1, 2]], inplace=True)
+        assert(False)
+    except TypeError:
+        pass
+
+
+def testCompose():
+    m = SVGTransformList(parseFromString="translate(10, 20) rotate(30)").getSVGMatrix()
+    n = SVGTransformList(parseFromString="matrix(2, 0, 1, 3, 4, 5)").getSVGMatrix()
+    assert(np.allclose(m.multiply(n).getMatrix(), np.matmul(m.getMatrix(), n.getMatrix())))
+    assert(np.allclose(n.applyToMatrix(m).getMatrix(), np.matmul(m.getMatrix(), n.getMatrix())))
+    assert(np.allclose(n.applyToMatrix(m.getMatrix()).getMatrix(), np.matmul(m.getMatrix(), n.getMatrix())))
+    assert(np.allclose(m.multiply(m.inverse()).getMatrix(), np.identity(3)))
+    assert(np.allclose(n.inverse().getMatrix(), np.linalg.inv(n.getMatrix())))
+    assert(SVGMatrix(1, 2, 3, 4, 5, 6).getComponents() == (1, 2, 3, 4, 5, 6))
+    try:
+        SVGMatrix(a=1, b=2, c=2, d=4).inverse()
+        assert(False)
+    except ValueError:
+        pass
+
+
+def testKinds():
+    transforms = ["", "translate(3 4)", "scale(2)", "scale(-1 1) translate(5)", "rotate(30)", "skewX(10) translate(1)"]
+    kinds = [svgMatrixIdentity, svgMatrixTranslate, svgMatrixScale, svgMatrixScaleTranslate, svgMatrixGeneral, svgMatrixGeneral]
+    matrices = [SVGTransformList(parseFromString=transform).getSVGMatrix() for transform in transforms]
+    assert([m.getKind() for m in matrices] == kinds)
+    assert(classifyMatrices([m.getComponents() for m in matrices]).tolist() == kinds)
+    assert(matrices[0].isIdentity() and matrices[3].isAxisAligned() and not matrices[4].isAxisAligned())
+
+    # Every specialized branch equals the general matrix product
+    points = np.array([[1.0, 2.0], [-3.0, 0.5]])
+    for m in matrices:
+        for n in matrices:
+            product = m.multiply(n)
+            assert(np.allclose(product.getMatrix(), np.matmul(m.getMatrix(), n.getMatrix())))
+            assert(product.getKind() == SVGMatrix(*product.getComponents()).getKind())
+        expected = np.matmul(m.getMatrix(), np.vstack([points.T, np.ones(2)]))[:2].T
+        assert(np.allclose(m.applyToPoints(points), expected))
+        assert(np.allclose(m.applyToPoints(points, translate=False), expected - m.getComponents()[4:]))
+        assert(np.allclose(m.applyToPoint(points[0]), expected[0]))
+        if m.isAxisAligned():
+            assert(np.allclose(m.applyToBounds([-3, 0.5, 1, 2]), np.concatenate([expected.min(axis=0), expected.max(axis=0)])))
+    assert(matrices[1].multiply(matrices[0]) is matrices[1])
+    assert(np.allclose(matrices[4].applyToBounds([0, 0, 1, 1]), [-0.5, 0, np.cos(np.pi / 6), 0.5 + np.cos(np.pi / 6)]))
+
+
+def testApplyMatricesToPoints():
+    matrices = [SVGTransformList(parseFromString=transform).getSVGMatrix()
+        for transform in ["rotate(30) translate(1 2)", "", "scale(2 3)", "skewX(20) scale(-1)"]]
+    rng = np.random.default_rng(3)
+    points = rng.normal(size=(10, 2))
+    offsets = [0, 4, 4, 5, 10]
+    components = [m.getComponents() for m in matrices]
+    expected = np.vstack([m.applyToPoints(points[offsets[k]:offsets[k+1]]) for (k, m) in enumerate(matrices)])
+    assert(np.allclose(applyMatricesToPoints(components, points, offsets), expected))
+    expected = np.vstack([m.applyToPoints(points[offsets[k]:offsets[k+1]], translate=False) for (k, m) in enumerate(matrices)])
+    result = applyMatricesToPoints(components, points, offsets, inplace=True, translate=False)
+    assert(result is points)
+    assert(np.allclose(points, expected))
+    assert(applyMatricesToPoints(np.empty((0, 6)), np.empty((0, 2)), [0]).shape == (0, 2))
+    try:
+        applyMatricesToPoints(components, points, [0, 4, 10])
+        assert(False)
+    except ValueError:
+        pass
+
+
+def testParseAllFunctions():
+    assertTransformation("translate(4)", 1, np.array([[1, 0, 4], [0, 1, 0], [0, 0, 1]]))
+    assertTransformation("scale(2)", 1, np.array([[2, 0, 0], [0, 2, 0], [0, 0, 1]]))
+    assertTransformation("scale(2 -3)", 1, np.array([[2, 0, 0], [0, -3, 0], [0, 0, 1]]))
+    assertTransformation("skewX(45)", 1, np.array([[1, 1, 0], [0, 1, 0], [0, 0, 1]]))
+    assertTransformation("skewY(-45)", 1, np.array([[1, 0, 0], [-1, 1, 0], [0, 0, 1]]))
+    # Rotation around a center: translate(10, 20) rotate(90) translate(-10, -20)
+    assertTransformation("rotate(90, 10, 20)", 1, np.array([[0, -1, 30], [1, 0, 10], [0, 0, 1]]))
+    assertTransformation("\ttranslate(1-2)scale(.5,.5e1)\n", 2, np.array([[0.5, 0, 1], [0, 5, -2], [0, 0, 1]]))
+
+    # The composed matrix equals the product of the individual matrices
+    t = SVGTransformList(parseFromString="rotate(30 5 5) skewX(10) scale(2, 3) skewY(-20) matrix(1 2 3 4 5 6)")
+    m = np.identity(3)
+    for transformation in t.getTransformations():
+        m = np.matmul(m, transformation.getMatrix().getMatrix())
+    assert(np.allclose(t.getMatrix(), m))
+    assert(str(t.getTransformation(0)) == "rotate(30.000 5.000 5.000)")
+    assert(str(t.getTransformation(2)) == "scale(2.000, 3.000)")
+
+    for transform in ["rotate(1, 2)", "translate()", "scale(1 2 3)", "shift(1)", "rotate(1", "translate(1 x)", "skewX(nan)"]:
+        try:
+            SVGTransformList(parseFromString=transform)
+            assert(False)
+        except SyntaxError:
+            pass
@@ -4,25 +4,14 @@ from ..dom.element import SVGElement
 
 
 #
-# The smallest rectangular box encapsulating a target element
+# Methods to test whether other elements are touched or contained
+# by the smallest rectangular box encapsulating an element
 #
-# Implements methods to test whether other elements are touched or contained.
+# Elements inherit these methods without storing a box,
+# they either set minX, minY, maxX and maxY or overload the getters.
 #
-class SVGBoundingBox():
-    def __init__(self, fromElement=None, minX=None, minY=None, maxX=None, maxY=None):
-        if not (fromElement is None):
-            self.minX = fromElement.getMinX()
-            self.maxX = fromElement.getMaxX()
-            self.minY = fromElement.getMinY()
-            self.maxY = fromElement.getMaxY()
-        if not (minX is None):
-            self.minX = minX
-        if not (minY is None):
-            self.minY = minY
-        if not (maxX is None):
-            self.maxX = maxX
-        if not (maxY is None):
-            self.maxY = maxY
+class SVGBoundingBoxMixin():
+    __slots__ = ()
 
     def getMinX(self):
         return self.minX
@@ -87,3 +76,25 @@ class SVGBoundingBox():
         if self.containsPoint(element.getMaxX(), element.getMinY()):
             return True
         return False
+
+
+#
+# The smallest rectangular box encapsulating a target element
+#
+class SVGBoundingBox(SVGBoundingBoxMixin):
+    __slots__ = ("minX", "minY", "maxX", "maxY")
+
+    def __init__(self, fromElement=None, minX=None, minY=None, maxX=None, maxY=None):
+        if not (fromElement is None):
+            self.minX = fromElement.getMinX()
+            self.maxX = fromElement.getMaxX()
+            self.minY = fromElement.getMinY()
+            self.maxY = fromElement.getMaxY()
+        if not (minX is None):
+            self.minX = minX
+        if not (minY is None):
+            self.minY = minY
+        if not (maxX is None):
+            self.maxX = maxX
+        if not (maxY is None):
+            self.maxY = maxY
@@ -1,23 +1,49 @@
 #!/usr/bin/python3
 
+import numpy as np
+
 from ..io.svgreader import SVGReader
+from ..dom.path import SVGPath
 from ..dom.rect import SVGRect
+from ..math.polygon import ringBounds, selectRings, clipPolygons
+from ..math.transform import applyMatricesToPoints
 from ..selecting.bbox import SVGBoundingBox
 
 
 #
 # Handle the results yielded from a selector match
 #
+#
+# When clipping, the match also holds the clipped geometry in document coordinates:
+# the vertices and offsets of the clipped rings (see math/polygon.py)
+# and the index of the element every ring belongs to.
+#
 class SVGTemplateMatch:
-    def __init__(self, svg, template, selectorElement, elements=[]):
+    def __init__(self, svg, template, selectorElement, elements=None):
         self.svg = svg
         self.template = template
         self.selectorElement = selectorElement
-        self.elements = elements
+        self.elements = [] if (elements is None) else elements
+        self.vertices = None
+        self.offsets = None
+        self.ringElements = None
 
     def append(self, element):
         self.elements.append(element)
 
+    def setGeometry(self, vertices, offsets, ringElements):
+        self.vertices = vertices
+        self.offsets = offsets
+        self.ringElements = ringElements
+
+    #
+    # Return the clipped rings of the given matched element
+    # as list of arrays of vertices
+    #
+    def getClippedRings(self, index):
+        rings = np.flatnonzero(self.ringElements == index)
+        return [self.vertices[self.offsets[k]:self.offsets[k+1]] for k in rings]
+
     def __len__(self):
         return len(self.elements)
 
@@ -38,7 +64,7 @@ class SVGTemplateMatch:
 #
 class SVGTemplate(SVGReader):
     def __init__(self, filename=None, debug=False):
-        SVGReader.__init__(self, filename, False)
+        SVGReader.__init__(self, filename=filename, debug=False)
         self.debug = debug
         self.selectorElements = None
 
@@ -69,12 +95,17 @@ class SVGTemplate(SVGReader):
     #
     # @param targetSVG: The document to analyze as SVGReader or SVGElement object
     #
-    def apply(self, targetSVG):
+    # @param clip: Clip the paths to the selectors instead of selecting the elements contained,
+    #   see clip()
+    #
+    def apply(self, targetSVG, clip=False, tolerance=0.1):
         tp = type(targetSVG)
         if (tp != SVGReader):
         # if (tp != SVGElement) and (tp != SVGReader):
-            print("Error: Illegal argument type: {:s}".format(type(tp)))
+            print("Error: Illegal argument type: {:s}".format(str(tp)))
             return None
+        if clip:
+            return self.clip(targetSVG, tolerance)
 
         results = {}
         selectors = self.getSelectorElements()
@@ -91,5 +122,80 @@ class SVGTemplate(SVGReader):
                 except:
                     continue
                 if c:
-                    results[q].append(result)
+                    results[q].append(e)
+        return results
+
+    #
+    # Return the region covered by a selector element in document coordinates
+    # as array of the vertices of a convex polygon
+    #
+    # Selectors are rectangles or paths consisting of a single closed convex subpath.
+    #
+    def getRegion(self, selector, tolerance=0.1):
+        if isinstance(selector, SVGRect):
+            return selector.getCTM().applyToPoints(selector.getCorners(), inplace=True)
+        (vertices, offsets) = selector.getD().flatten(tolerance)
+        if len(offsets) != 2:
+            raise ValueError("Selector path must consist of a single subpath")
+        return selector.getCTM().applyToPoints(vertices)
+
+    #
+    # Clip the paths of a target SVG to every selector element
+    #
+    # The paths are flattened within the given tolerance and transformed into document coordinates.
+    # Their subpaths are clipped as filled polygons to every selector at once,
+    # skipping the subpaths whose bounding box does not overlap the selector's.
+    # Returns a dictionary of matches holding the paths overlapping every selector
+    # and their clipped geometry.
+    #
+    # @param selectors: Dictionary of selector elements by label, defaults to getSelectorElements()
+    #
+    def clip(self, targetSVG, tolerance=0.1, selectors=None):
+        (elements, ctms) = targetSVG.calculateCTMs()
+        indices = [i for (i, e) in enumerate(elements) if isinstance(e, SVGPath) and not (e.getD() is None)]
+        paths = [elements[i] for i in indices]
+        vertices = [np.zeros((0, 2))]
+        numRings = []
+        offsets = [np.zeros(1, dtype=np.intp)]
+        pathOffsets = [0]
+        numVertices = 0
+        for path in paths:
+            (v, o) = path.getD().flatten(tolerance)
+            vertices.append(v)
+            offsets.append(o[1:] + numVertices)
+            numVertices += len(v)
+            numRings.append(len(o) - 1)
+            pathOffsets.append(numVertices)
+        vertices = np.vstack(vertices)
+        offsets = np.concatenate(offsets)
+        # Transform all paths into document coordinates at once
+        applyMatricesToPoints(ctms[indices], vertices, pathOffsets, inplace=True)
+        ringPaths = np.repeat(np.arange(len(paths)), numRings)
+        bounds = ringBounds(vertices, offsets)
+
+        results = {}
+        if selectors is None:
+            selectors = self.getSelectorElements()
+        for q in selectors.keys():
+            selector = selectors[q]
+            region = self.getRegion(selector, tolerance)
+            (low, high) = (region.min(axis=0), region.max(axis=0))
+            overlapping = np.flatnonzero((bounds[:, 0] <= high[0]) & (bounds[:, 2] >= low[0])
+                & (bounds[:, 1] <= high[1]) & (bounds[:, 3] >= low[1]))
+
+            # Clip the overlapping rings only
+            (clipped, clippedOffsets) = clipPolygons(*selectRings(vertices, offsets, overlapping), region)
+
+            # Keep the non-empty rings and their paths
+            nonEmpty = np.flatnonzero(clippedOffsets[1:] > clippedOffsets[:-1])
+            (clipped, clippedOffsets) = selectRings(clipped, clippedOffsets, nonEmpty)
+            (elements, ringElements) = np.unique(ringPaths[overlapping[nonEmpty]], return_inverse=True)
+
+            results[q] = SVGTemplateMatch(
+                            svg=targetSVG,
+                            template=self,
+                            selectorElement=selector,
+                            elements=[paths[i] for i in elements]
+                            )
+            results[q].setGeometry(clipped, clippedOffsets, ringElements)
         return results
@@ -4,6 +4,7 @@
 #
 
 import os
+import numpy as np
 
 from .template import SVGTemplate
 from ..io.svgreader import SVGReader
@@ -60,3 +61,17 @@ def test_template_application():
     for key in results.keys():
         print("Key: {:s}".format(key))
         assert(len(results[key]) == 1)
+
+
+def test_template_clipping():
+    template = SVGTemplate()
+    template.fromString("<svg><rect id=\"region\" x=\"0\" y=\"0\" width=\"10\" height=\"10\"/></svg>")
+    target = SVGReader(fromString="<svg><path id=\"a\" d=\"M 5 5 h 10 v 2 h -10 z\"/>"
+        + "<path id=\"b\" d=\"M 20 20 h 1 v 1 z\"/><g><path id=\"c\" d=\"M 1 1 h 1 v 1 h -1 z M 12 1 h 1 v 1 z\"/></g></svg>")
+    results = template.apply(target, clip=True)
+    match = results["region"]
+    assert([e.getId() for e in match.elements] == ["a", "c"])
+    assert(match.ringElements.tolist() == [0, 1])
+    (ring,) = match.getClippedRings(0)
+    assert(np.unique(ring, axis=0).tolist() == [[5, 5], [5, 7], [10, 5], [10, 7]])
+    assert(len(match.getClippedRings(1)) == 1)
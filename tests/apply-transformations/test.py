@@ -1,58 +1,36 @@
 #!/usr/bin/python3
+#
+# Import an SVG with transformed groups and paths,
+# flatten all transformations and verify, that the coordinates
+# equal the ones transformed by the elements' CTMs
+#
 
-import sys, os
-sys.path.append(os.path.join("..", ".."))
-from svg import SVGParser
-
-sp = SVGParser(filename="test.svg", debug=True)
-
-sr = sp.getSVG().getChildren()[0]
-ch = sr.getChildren()
-print([e.getTag() for e in ch])
-
-g = ch[3]
-print(g.getTag())
-
-print("transform =")
-t = g.getTransform()
-print(str(t))
-matrixG = t.getSVGMatrix()
-print(str(matrixG))
-
-path = g.getChildren()[0]
-print(path.getTag())
-
-print("transform =")
-t = path.getTransform()
-print(str(t))
-matrixPath = t.getSVGMatrix()
-print(str(matrixPath))
-
-ctm = path.getCTM()
-print("<path>: ctm = ")
-print(str(ctm))
-
-print("Path points:")
-points = path.getPoints()
-print(points)
-
-print("Transformed with path matrix:")
-points2 = []
-for p in points:
-    pt = matrixPath.applyToPoint(p, debug=False)
-    points2.append(pt)
-print(points2)
-
-print("Further transformed with group matrix:")
-points3 = []
-for p in points2:
-    pt = matrixG.applyToPoint(p, debug=False)
-    points3.append(pt)
-print(points3)
-
-print("In comparison to being transformed with the path's CTM matrix:")
-points4 = []
-for p in points:
-    pt = ctm.applyToPoint(p, debug=False)
-    points4.append(pt)
-print(points4)
+import os, sys, importlib
+import numpy as np
+
+# Import the library by the name of the folder it is located in
+pathFile = os.path.dirname(os.path.realpath(__file__))
+pathLib = os.path.realpath(os.path.join(pathFile, "..", ".."))
+sys.path.append(os.path.dirname(pathLib))
+SVGReader = importlib.import_module(os.path.basename(pathLib) + ".io.svgreader").SVGReader
+
+filename = os.path.join(pathFile, "test.svg")
+
+svg = SVGReader()
+svg.fromFile(filename)
+paths = svg.find("path")
+
+print("Path points transformed with the paths' CTMs:")
+expected = [path.getCTM().applyToPoints(path.getPoints()) for path in paths]
+print(expected)
+
+svg.flattenTransforms()
+print("Path points after flattening:")
+print([path.getPoints() for path in paths])
+
+for (path, points) in zip(paths, expected):
+    assert(np.allclose(path.getPoints(), points))
+for e in svg.getElementList():
+    assert(e.getAttribute("transform") is None)
+
+svg.toFile(os.path.join(pathFile, "result.svg"))
@@ -1,23 +1,36 @@
 #!/usr/bin/python3
-
-filename = "combined_paths.svg"
-
 #
-# TODO:
-# * Import SVG
-# * Print number of path elements (should be 1)
-# * Find/select first path and break apart
-# * Print number of path elements (should be 2)
+# Import an SVG with one path consisting of two circles,
+# break the path apart and verify, that there are two paths afterwards
 #
 
-f = SVG(filename)
+import os, sys, importlib
+
+# Import the library by the name of the folder it is located in
+pathFile = os.path.dirname(os.path.realpath(__file__))
+pathLib = os.path.realpath(os.path.join(pathFile, "..", ".."))
+sys.path.append(os.path.dirname(pathLib))
+SVGReader = importlib.import_module(os.path.basename(pathLib) + ".io.svgreader").SVGReader
+
+filename = os.path.join(pathFile, "combined_paths.svg")
+
+f = SVGReader()
+f.fromFile(filename)
 paths = f.find("path")
-...len(paths)
-...should be 1
+print("Number of paths: {:d}".format(len(paths)))
+assert(len(paths) == 1)
 
 path = paths[0]
 path.breakApart()
 
-paths2 = f.find("path")
-...len(paths)
-...should be 2
+paths = f.find("path")
+print("Number of paths: {:d}".format(len(paths)))
+assert(len(paths) == 2)
+for p in paths:
+    print(str(p))
+    # The circles' arcs are regenerated with valid flags
+    tokens = str(p.getD()).split(" ")
+    arcs = [i for (i, token) in enumerate(tokens) if token in ["A", "a"]]
+    assert(len(arcs) == 4)
+    for i in arcs:
+        assert((tokens[i+4] in ["0", "1"]) and (tokens[i+5] in ["0", "1"]))